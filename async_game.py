@@ -0,0 +1,125 @@
+"""
+Asyncio Game Engine for Hangman
+Author: CDU Software Engineering Student
+
+Async versions of the game and timer so lots of games can share one
+event loop. Guess deadlines are loop.call_at handles instead of
+threads, and everything runs on the loop thread so no locks are needed:
+AsyncHangmanGame swaps the game lock for a shared no-op context and
+applies guesses directly.
+"""
+
+import asyncio
+import contextlib
+import metrics
+from game import GameLevel, HangmanGame
+
+# Stands in for every async game's lock - nothing runs off the loop
+_NO_LOCK = contextlib.nullcontext()
+
+
+class AsyncGameTimer:
+    """GameTimer replacement that schedules deadlines on an event loop."""
+    __slots__ = ("timeout_callback", "loop", "_handle", "start_time", "duration",
+                 "active")
+    def __init__(self, timeout_function=None, loop=None):
+        """
+        Set up the timer.
+        loop defaults to the running loop when the timer is started.
+        """
+        self.timeout_callback = timeout_function
+        self.loop = loop
+        self._handle = None
+        self.start_time = 0.0
+        self.duration = 0
+        self.active = False
+    def _get_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        return self.loop
+    def start_timer(self, seconds=15):
+        """Start countdown for given number of seconds."""
+        if seconds <= 0:
+            return
+        loop = self._get_loop()
+        self._stop_current_timer()
+        self.duration = seconds
+        self.start_time = loop.time()
+        self.active = True
+        self._handle = loop.call_at(self.start_time + seconds, self._time_up)
+    def stop_timer(self):
+        """Stop the current timer."""
+        self._stop_current_timer()
+    def _stop_current_timer(self):
+        """Internal method to clean up timer."""
+        self.active = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self.start_time = 0.0
+        self.duration = 0
+    def _time_up(self):
+        """Called on the loop when the deadline expires."""
+        if metrics.enabled:
+            metrics.observe("timer_fire_lag_seconds", max(
+                0.0, self.loop.time() - self.start_time - self.duration))
+            metrics.inc("timer_fires_total")
+        self._handle = None
+        self.active = False
+        if self.timeout_callback:
+            self.timeout_callback()
+    def get_time_left(self):
+        """Get seconds remaining."""
+        return int(self.get_seconds_left())
+    def get_seconds_left(self):
+        """Exact seconds remaining as a float (0 when not running)."""
+        if not self.active:
+            return 0.0
+        elapsed = self.loop.time() - self.start_time
+        return max(0.0, self.duration - elapsed)
+    def is_running(self):
+        """Check if timer is currently active."""
+        return self.active
+    def get_progress_percent(self):
+        """Get how much of the timer has elapsed (0-100%)."""
+        if not self.active or self.duration == 0:
+            return 100.0
+        elapsed = self.loop.time() - self.start_time
+        progress = (elapsed / self.duration) * 100.0
+        return min(100.0, max(0.0, progress))
+
+
+class AsyncHangmanGame(HangmanGame):
+    """
+    HangmanGame whose guess timer runs on an asyncio event loop.
+    Same make_guess/_on_timeout rules, but it must only be used from
+    the loop's thread.
+    """
+    __slots__ = ("loop", "_changed")
+    def __init__(self, level=GameLevel.BASIC, loop=None):
+        self.loop = loop
+        super().__init__(level)
+        self._changed = None
+    def _create_lock(self):
+        return _NO_LOCK
+    def _create_timer(self):
+        return AsyncGameTimer(self._on_timeout, self.loop)
+    def _process_guess(self, letter):
+        return self._apply_guess(letter)
+    def _notify(self):
+        """Wake up anyone waiting in wait_for_change()."""
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+    def _on_timeout(self):
+        super()._on_timeout()
+        self._notify()
+    def make_guess(self, letter):
+        result = super().make_guess(letter)
+        self._notify()
+        return result
+    async def wait_for_change(self):
+        """Wait until the next guess or timeout changes the game."""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        await self._changed.wait()
@@ -0,0 +1,186 @@
+"""
+Streaming Batch Mode for Hangman Game
+Author: CDU Software Engineering Student
+
+Replays game scripts as a pipeline stage. Each input line is a JSON
+object with an answer (or just a level) and the guesses to make:
+
+    {"id": "g1", "answer": "PYTHON", "guesses": ["E", "O", "P"]}
+    {"id": "g2", "level": "intermediate", "guesses": "ETAOINS"}
+
+and each finished game comes out as one JSON line on stdout. Input is
+read lazily and only a fixed number of chunks are in flight at once,
+so memory stays flat however long the stream is. With --workers,
+chunks are played on a process pool and results are written in the
+order chunks finish; every result carries its input line number.
+The workers share one copy of the dictionary through shared memory
+(see shared_dictionary.py).
+Guess timers are never started in this mode.
+
+To run: python batch.py --workers 4 < scripts.jsonl > results.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from deck import WordSelector
+from game import GameLevel, GameState, HangmanGame
+from shared_dictionary import SharedDictionary, attach_worker
+
+CHUNK_SIZE = 200
+
+# One reusable game per level in each process, all dealing their
+# answers from one selector (made after the worker attaches)
+_games = {}
+_selector = None
+
+
+def _get_game(level):
+    global _selector  # pylint: disable=global-statement
+    game = _games.get(level)
+    if game is None:
+        if _selector is None:
+            _selector = WordSelector()
+        game = _games[level] = HangmanGame(level, selector=_selector)
+    return game
+
+
+def play_script(script, line=None):
+    """Play one game script (a dict) and return its result dict."""
+    result = {"line": line}
+    if "id" in script:
+        result["id"] = script["id"]
+    try:
+        level = GameLevel(script.get("level", GameLevel.BASIC.value))
+    except ValueError:
+        result["error"] = f"Unknown level: {script.get('level')!r}"
+        return result
+    answer = script.get("answer")
+    if answer is not None and (not isinstance(answer, str) or not answer.strip()):
+        result["error"] = "answer must be a non-empty string"
+        return result
+    guesses = script.get("guesses", [])
+    if not isinstance(guesses, (str, list)):
+        result["error"] = "guesses must be a string or a list"
+        return result
+    game = _get_game(level)
+    # Guesses are matched in upper case, so answers are too
+    game.new_game(answer=answer.upper() if answer else None)
+    made = rejected = 0
+    for guess in guesses:
+        if game.get_game_state() != GameState.PLAYING:
+            break
+        if not isinstance(guess, str):
+            rejected += 1
+            continue
+        before = len(game.get_guessed_letters())
+        game.make_guess(guess)
+        if len(game.get_guessed_letters()) > before:
+            made += 1
+        else:
+            rejected += 1
+    result.update({
+        "level": level.value,
+        "answer": game.get_answer(),
+        "state": game.get_game_state().value,
+        "lives": game.get_lives(),
+        "guesses": made,
+        "rejected": rejected,
+        "wrong": "".join(game.get_wrong_guesses()),
+        "display": game.get_display_word(),
+    })
+    return result
+
+
+def play_line(text, line=None):
+    """Parse one JSONL line and play it."""
+    try:
+        script = json.loads(text)
+    except ValueError as e:
+        return {"line": line, "error": f"Bad JSON: {e}"}
+    if not isinstance(script, dict):
+        return {"line": line, "error": "Each line must be a JSON object"}
+    return play_script(script, line)
+
+
+def run_chunk(lines):
+    """Play a chunk of (line number, text) pairs. Returns encoded results."""
+    return "".join(json.dumps(play_line(text, number)) + "\n"
+                   for number, text in lines)
+
+
+def _numbered_lines(source):
+    """Non-blank input lines with their 1-based line numbers."""
+    for number, text in enumerate(source, 1):
+        if text.strip():
+            yield number, text
+
+
+def _chunks(source, size):
+    lines = _numbered_lines(source)
+    while True:
+        chunk = list(itertools.islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(source, output, workers=1, chunk_size=CHUNK_SIZE, max_pending=None):
+    """
+    Stream scripts from source (an iterable of lines) to output.
+    Each result is written (and flushed) as soon as its game finishes
+    - or, with workers > 1, as soon as its chunk does. At most
+    max_pending chunks (default 2 per worker) are held in memory.
+    Returns the number of games played.
+    """
+    played = 0
+    if workers <= 1:
+        for number, text in _numbered_lines(source):
+            output.write(json.dumps(play_line(text, number)) + "\n")
+            output.flush()
+            played += 1
+        return played
+    max_pending = max_pending or workers * 2
+    pending = {}
+    shared = SharedDictionary()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_worker,
+                                 initargs=(shared.name,)) as pool:
+            for chunk in _chunks(source, chunk_size):
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    played += _write_done(done, pending, output)
+                pending[pool.submit(run_chunk, chunk)] = len(chunk)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                played += _write_done(done, pending, output)
+    finally:
+        shared.close()
+    return played
+
+
+def _write_done(done, pending, output):
+    """Write finished chunks and forget them. Returns games written."""
+    played = 0
+    for future in done:
+        output.write(future.result())
+        played += pending.pop(future)
+    output.flush()
+    return played
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Play JSONL game scripts from stdin, write JSONL results to stdout")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    run_batch(sys.stdin, sys.stdout, args.workers, max(1, args.chunk_size))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
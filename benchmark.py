@@ -0,0 +1,215 @@
+"""
+Benchmark Suite for Hangman Game
+Author: CDU Software Engineering Student
+
+Measures the hot paths of the game core: ops/sec plus memory use per
+operation - the peak traced bytes and the net change in allocated
+blocks (about 0 unless an op keeps memory). CPython doesn't expose a
+running count of allocations, so per-op allocation counts aren't
+reported. Results are written as JSON and can be checked against a
+stored baseline so slowdowns get caught before they ship.
+
+To run:       python benchmark.py --output bench.json
+Compare:      python benchmark.py --baseline bench.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from game import GameLevel, HangmanGame
+from simulate import frequency_strategy, level_entries, play_game
+from timer import GameTimer
+from word_dictionary import get_shared_dictionary
+
+# Every letter appears, so a round always takes 26 guesses to win
+PANGRAM = "THE QUICK BROWN FOX JUMPS OVER A LAZY DOG"
+LETTERS = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+def bench_make_guess():
+    """make_guess on a phrase, restarting every 26 guesses."""
+    game = HangmanGame(GameLevel.INTERMEDIATE)
+    def run(n):
+        for i in range(n):
+            index = i % 26
+            if index == 0:
+                game.new_game(answer=PANGRAM)
+            game.make_guess(LETTERS[index])
+    return run
+
+
+def bench_get_display_word():
+    """Reading the display word between guesses."""
+    game = HangmanGame(GameLevel.INTERMEDIATE)
+    game.new_game(answer=PANGRAM)
+    game.make_guess("E")
+    def run(n):
+        for _ in range(n):
+            game.get_display_word()
+    return run
+
+
+def bench_word_complete():
+    """The win check after a correct guess."""
+    game = HangmanGame(GameLevel.INTERMEDIATE)
+    game.new_game(answer=PANGRAM)
+    for letter in "ETAOIN":
+        game.make_guess(letter)
+    def run(n):
+        for _ in range(n):
+            game._word_complete()  # pylint: disable=protected-access
+    return run
+
+
+def bench_get_random_word():
+    """Picking a random basic word."""
+    dictionary = get_shared_dictionary()
+    def run(n):
+        for _ in range(n):
+            dictionary.get_random_word()
+    return run
+
+
+def bench_is_valid_word():
+    """Validating a mix of words, phrases and misses."""
+    dictionary = get_shared_dictionary()
+    words = ["python", "Version Control", "not a word", "cyber security"]
+    def run(n):
+        for i in range(n):
+            dictionary.is_valid_word(words[i & 3])
+    return run
+
+
+def bench_timer_start_stop():
+    """Starting and stopping a guess timer."""
+    timer = GameTimer()
+    def run(n):
+        for _ in range(n):
+            timer.start_timer(60)
+            timer.stop_timer()
+    return run
+
+
+def _bench_full_game(level):
+    """Whole games played with the frequency strategy."""
+    def setup():
+        game = HangmanGame(level)
+        rng = random.Random(0)
+        entries = level_entries(game.dictionary, level)
+        def run(n):
+            for i in range(n):
+                play_game(game, frequency_strategy, rng, entries[i % len(entries)])
+        return run
+    return setup
+
+
+BENCHMARKS = {
+    "make_guess": (bench_make_guess, 200000),
+    "get_display_word": (bench_get_display_word, 500000),
+    "word_complete": (bench_word_complete, 500000),
+    "get_random_word": (bench_get_random_word, 500000),
+    "is_valid_word": (bench_is_valid_word, 500000),
+    "timer_start_stop": (bench_timer_start_stop, 50000),
+    "full_game_basic": (_bench_full_game(GameLevel.BASIC), 5000),
+    "full_game_intermediate": (_bench_full_game(GameLevel.INTERMEDIATE), 2000),
+}
+
+
+def measure(setup, ops, repeat=3):
+    """
+    Best-of-repeat ops/sec plus memory use per op for one benchmark.
+    net_blocks_per_op is blocks still allocated after the run (and a
+    gc.collect()) minus before it - a leak or cache-growth signal, not
+    a count of allocations made.
+    """
+    run = setup()
+    run(max(1, ops // 10))  # warm up
+    best = 0.0
+    gc.collect()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(ops)
+        elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed if elapsed > 0 else 0.0)
+    # Memory is measured on a separate, smaller run since tracing is slow
+    sample = max(1, ops // 20)
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    run(sample)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    gc.collect()
+    blocks_after = sys.getallocatedblocks()
+    return {
+        "ops": ops,
+        "ops_per_sec": round(best, 1),
+        "peak_bytes_per_op": round((peak - base) / sample, 3),
+        "net_blocks_per_op": round((blocks_after - blocks_before) / sample, 3),
+    }
+
+
+def run_benchmarks(names=None, scale=1.0, repeat=3):
+    """Run the selected benchmarks and return the results document."""
+    results = {}
+    for name, (setup, ops) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        results[name] = measure(setup, max(1, int(ops * scale)), repeat)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.2):
+    """List benchmarks that got more than tolerance slower than baseline."""
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old.get("ops_per_sec"):
+            continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append((name, old["ops_per_sec"], result["ops_per_sec"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the hangman game core")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the op counts (use <1 for a quick run)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("names", nargs="*", help=f"any of: {', '.join(BENCHMARKS)}")
+    args = parser.parse_args(argv)
+    current = run_benchmarks(args.names, args.scale, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as out:
+        json.dump(current, out, indent=2)
+    for name, result in current["results"].items():
+        print(f"{name:24} {result['ops_per_sec']:>14,.0f} ops/s"
+              f" {result['peak_bytes_per_op']:>10.1f} B/op peak")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as source:
+            baseline = json.load(source)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, old, new, ratio in regressions:
+            print(f"REGRESSION {name}: {old:,.0f} -> {new:,.0f} ops/s ({ratio:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Clocks for Hangman Game
+Author: CDU Software Engineering Student
+
+Timers don't read the time or start waits themselves - they ask a
+clock. MonotonicClock is the real thing, backed by the shared
+TimerScheduler and CallbackDispatcher. ManualClock is a virtual clock
+for tests and simulations: time only moves when advance() is called,
+and any deadlines passed on the way fire straight away.
+
+A clock provides:
+    now()                       current time in seconds
+    call_at(deadline, callback) schedule a callback, returns a handle
+    cancel(handle)              stop a scheduled callback
+    dispatch(callback)          run a timeout callback
+"""
+
+import heapq
+import itertools
+import threading
+from scheduler import ScheduledCall, get_default_dispatcher, get_default_scheduler
+
+
+class MonotonicClock:
+    """Real time, using the scheduler thread and dispatcher pool."""
+    def __init__(self, scheduler=None, dispatcher=None):
+        """scheduler and dispatcher default to the process-wide ones."""
+        self.scheduler = scheduler or get_default_scheduler()
+        self.dispatcher = dispatcher or get_default_dispatcher()
+    def now(self):
+        return self.scheduler.now()
+    def call_at(self, deadline, callback):
+        return self.scheduler.call_at(deadline, callback)
+    def cancel(self, handle):
+        self.scheduler.cancel(handle)
+    def dispatch(self, callback):
+        self.dispatcher.submit(callback)
+
+
+class ManualClock:
+    """Virtual clock that only moves when told to."""
+    def __init__(self, start=0.0):
+        self._now = start
+        self._heap = []
+        self._counter = itertools.count()
+        self.lock = threading.Lock()
+    def now(self):
+        return self._now
+    def call_at(self, deadline, callback):
+        entry = ScheduledCall(deadline, next(self._counter), callback)
+        with self.lock:
+            heapq.heappush(self._heap, entry)
+        return entry
+    def call_later(self, delay, callback):
+        return self.call_at(self._now + delay, callback)
+    def cancel(self, handle):
+        handle.cancel()
+    def dispatch(self, callback):
+        # No threads in virtual time - callbacks run inline
+        callback()
+    def pending(self):
+        """How many callbacks are still waiting to fire."""
+        with self.lock:
+            return sum(1 for entry in self._heap if not entry.cancelled)
+    def advance(self, seconds):
+        """Move time forward, firing every deadline passed on the way."""
+        return self.advance_to(self._now + seconds)
+    def advance_to(self, when):
+        """Move time to when. Returns how many callbacks fired."""
+        fired = 0
+        while True:
+            with self.lock:
+                while self._heap and self._heap[0].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap or self._heap[0].deadline > when:
+                    break
+                entry = heapq.heappop(self._heap)
+                self._now = max(self._now, entry.deadline)
+                callback = entry.callback
+                entry.cancel()
+            # Run outside the lock so callbacks can schedule new deadlines
+            callback()
+            fired += 1
+        with self.lock:
+            self._now = max(self._now, when)
+        return fired
+
+
+_default_clock = None
+_default_lock = threading.Lock()
+
+
+def get_default_clock():
+    """Shared real-time clock used when nothing else is given."""
+    global _default_clock  # pylint: disable=global-statement
+    with _default_lock:
+        if _default_clock is None:
+            _default_clock = MonotonicClock()
+        return _default_clock
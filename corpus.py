@@ -0,0 +1,225 @@
+"""
+Compiled Word Corpus for Hangman Game
+Author: CDU Software Engineering Student
+
+Builds big word/phrase lists into one binary file that WordDictionary
+can mmap, so huge corpora load instantly and are never turned into
+Python lists.
+
+File layout (little endian):
+    header    magic b"HMC1", version, section count
+    sections  one record per level (0 = words, 1 = phrases)
+    buckets   per section: (length, first entry, entry count)
+    offsets   per section: count + 1 uint32 offsets into the data
+    data      per section: packed uppercase ASCII bytes
+
+Entries in a section are sorted by length and then alphabetically, so
+each length bucket can be binary searched for is_valid_word().
+build_corpus(..., keep_order=True) instead keeps the entries in the
+order given, so their indexes stay the same as in the source lists;
+those sections have no buckets and are searched linearly, which is
+only meant for small lists (see shared_dictionary.py).
+
+To build: python corpus.py words.txt phrases.txt corpus.hmc
+"""
+
+import mmap
+import struct
+import sys
+
+MAGIC = b"HMC1"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<IIQQQ")
+BUCKET = struct.Struct("<HII")
+OFFSET = struct.Struct("<I")
+
+WORDS = 0
+PHRASES = 1
+
+
+def normalise_entries(entries):
+    """Uppercase, strip and de-duplicate entries, dropping unusable ones."""
+    cleaned = set()
+    for entry in entries:
+        entry = " ".join(entry.split()).upper()
+        if entry and entry.isascii() and len(entry) < 65536:
+            cleaned.add(entry)
+    return sorted(cleaned, key=lambda e: (len(e), e))
+
+
+def build_corpus(words, phrases, keep_order=False):
+    """
+    Compile word and phrase iterables into corpus bytes.
+    With keep_order, entries (already uppercase) keep their positions.
+    """
+    if keep_order:
+        sections = [list(words), list(phrases)]
+    else:
+        sections = [normalise_entries(words), normalise_entries(phrases)]
+    pos = HEADER.size + SECTION.size * len(sections)
+    records = []
+    blobs = []
+    for entries in sections:
+        buckets = []
+        if not keep_order:
+            for index, entry in enumerate(entries):
+                if not buckets or buckets[-1][0] != len(entry):
+                    buckets.append([len(entry), index, 0])
+                buckets[-1][2] += 1
+        bucket_pos = pos
+        pos += BUCKET.size * len(buckets)
+        offset_pos = pos
+        pos += OFFSET.size * (len(entries) + 1)
+        data = "".join(entries).encode("ascii")
+        data_pos = pos
+        pos += len(data)
+        records.append(SECTION.pack(len(entries), len(buckets),
+                                    bucket_pos, offset_pos, data_pos))
+        offsets = [0]
+        for entry in entries:
+            offsets.append(offsets[-1] + len(entry))
+        blobs.append(b"".join(BUCKET.pack(*bucket) for bucket in buckets))
+        blobs.append(struct.pack(f"<{len(offsets)}I", *offsets))
+        blobs.append(data)
+    header = HEADER.pack(MAGIC, VERSION, len(sections))
+    return b"".join([header] + records + blobs)
+
+
+def read_entries(path):
+    """Yield one entry per non-blank line of a text file."""
+    with open(path, encoding="utf-8") as source:
+        for line in source:
+            if line.strip():
+                yield line
+
+
+def compile_corpus(words_path, phrases_path, out_path):
+    """Compile two text files into a corpus file. Returns entry counts."""
+    data = build_corpus(read_entries(words_path), read_entries(phrases_path))
+    with open(out_path, "wb") as out:
+        out.write(data)
+    corpus = CompiledCorpus(data)
+    return len(corpus.words), len(corpus.phrases)
+
+
+class CorpusSection:
+    """Read-only sequence view over one level of a compiled corpus."""
+    def __init__(self, buffer, count, bucket_count, bucket_pos, offset_pos,
+                 data_pos):
+        self._buffer = buffer
+        self._count = count
+        self._offset_pos = offset_pos
+        self._data_pos = data_pos
+        # The bucket table is tiny (one row per distinct length)
+        self.buckets = {}
+        for i in range(bucket_count):
+            length, first, n = BUCKET.unpack_from(buffer, bucket_pos + i * BUCKET.size)
+            self.buckets[length] = (first, n)
+    def __len__(self):
+        return self._count
+    def _entry_bytes(self, index):
+        pos = self._offset_pos + index * OFFSET.size
+        start = OFFSET.unpack_from(self._buffer, pos)[0]
+        end = OFFSET.unpack_from(self._buffer, pos + OFFSET.size)[0]
+        return self._buffer[self._data_pos + start:self._data_pos + end]
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("corpus index out of range")
+        return bytes(self._entry_bytes(index)).decode("ascii")
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+    def index(self, entry):
+        """Position of an uppercase entry (binary search in its length bucket)."""
+        try:
+            target = entry.encode("ascii")
+        except UnicodeEncodeError:
+            raise ValueError(f"{entry!r} is not in corpus") from None
+        if self._count and not self.buckets:
+            # Unsorted (keep_order) section
+            for index in range(self._count):
+                if bytes(self._entry_bytes(index)) == target:
+                    return index
+            raise ValueError(f"{entry!r} is not in corpus")
+        first, n = self.buckets.get(len(target), (0, 0))
+        low, high = first, first + n
+        while low < high:
+            mid = (low + high) // 2
+            if bytes(self._entry_bytes(mid)) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < first + n and bytes(self._entry_bytes(low)) == target:
+            return low
+        raise ValueError(f"{entry!r} is not in corpus")
+    def __contains__(self, entry):
+        try:
+            self.index(entry)
+        except ValueError:
+            return False
+        return True
+    def raw(self):
+        """(offset table, entry data) of this section as memoryviews."""
+        view = memoryview(self._buffer)
+        data_end = self._data_pos + OFFSET.unpack_from(
+            self._buffer, self._offset_pos + self._count * OFFSET.size)[0]
+        return (view[self._offset_pos:self._offset_pos + OFFSET.size * (self._count + 1)],
+                view[self._data_pos:data_end])
+    def length_range(self, length):
+        """(first index, count) of entries with the given length."""
+        return self.buckets.get(length, (0, 0))
+
+
+class CompiledCorpus:
+    """A compiled corpus over any bytes-like buffer (usually an mmap)."""
+    def __init__(self, buffer):
+        self._file = None
+        self._mmap = None
+        self.buffer = buffer
+        magic, version, section_count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compiled hangman corpus")
+        self.sections = []
+        for i in range(section_count):
+            record = SECTION.unpack_from(buffer, HEADER.size + i * SECTION.size)
+            self.sections.append(CorpusSection(buffer, *record))
+        self.words = self.sections[WORDS]
+        self.phrases = self.sections[PHRASES]
+    @classmethod
+    def open(cls, path):
+        """Memory-map a corpus file read-only."""
+        corpus_file = open(path, "rb")  # pylint: disable=consider-using-with
+        try:
+            mapped = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            corpus_file.close()
+            raise
+        corpus = cls(mapped)
+        corpus._file = corpus_file
+        corpus._mmap = mapped
+        return corpus
+    def close(self):
+        """Unmap the file (sections can't be used afterwards)."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
+
+
+def main(argv=None):
+    """Command line entry point for building corpus files."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 3:
+        print("Usage: python corpus.py WORDS.txt PHRASES.txt OUTPUT.hmc")
+        return 1
+    words, phrases = compile_corpus(*args)
+    print(f"Compiled {words} words and {phrases} phrases into {args[2]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
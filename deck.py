@@ -0,0 +1,114 @@
+"""
+Word Decks for Hangman Game
+Author: CDU Software Engineering Student
+
+Picks answers like dealing from a shuffled deck: nothing comes up
+twice until every entry has been dealt, then the deck is reshuffled.
+
+The shuffle is a lazy Fisher-Yates - each draw swaps one random slot
+with the end of the undealt part, but only the slots that have
+actually been swapped are stored (in a dict). A draw is O(1) and a
+million-entry deck costs nothing until cards are dealt from it.
+
+Every WordSelector has its own seeded random.Random, so one player or
+worker process never disturbs another's sequence.
+"""
+
+import random
+import metrics
+from difficulty import get_difficulty
+from word_dictionary import get_shared_dictionary
+
+
+class WordDeck:
+    """Deals the numbers 0..size-1 in random order without repeats."""
+    __slots__ = ("size", "rng", "_swaps", "_remaining", "reshuffles")
+    def __init__(self, size, rng=None):
+        self.size = size
+        self.rng = rng or random.Random()
+        # slot -> value for slots that no longer hold their own number
+        self._swaps = {}
+        self._remaining = size
+        self.reshuffles = 0
+    def __len__(self):
+        """How many cards are left before the next reshuffle."""
+        return self._remaining
+    def draw(self):
+        """Deal the next index (reshuffles once the deck runs out)."""
+        if not self.size:
+            raise IndexError("draw from an empty deck")
+        if not self._remaining:
+            self.reshuffle()
+        last = self._remaining - 1
+        slot = self.rng.randrange(self._remaining)
+        swaps = self._swaps
+        value = swaps.get(slot, slot)
+        # Move the last undealt card into the slot we just dealt from
+        tail = swaps.pop(last, last)
+        if slot != last:
+            swaps[slot] = tail
+        self._remaining = last
+        return value
+    def reshuffle(self):
+        """Put every card back."""
+        self._swaps.clear()
+        self._remaining = self.size
+        self.reshuffles += 1
+
+
+class WordSelector:
+    """
+    Per-player (or per-worker) answer picker.
+    Has the same pick_word()/pick_phrase() interface as WordDictionary
+    but deals from one deck per level, using its own seeded RNG.
+    """
+    def __init__(self, dictionary=None, seed=None):
+        self.dictionary = dictionary or get_shared_dictionary()
+        self.rng = random.Random(seed)
+        self.words = WordDeck(self.dictionary.word_count(), self.rng)
+        self.phrases = WordDeck(self.dictionary.phrase_count(), self.rng)
+        # Difficulty band -> deck over that band's positions
+        self.bands = {}
+    def pick_word(self):
+        """Next basic word from the deck as (index, word)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        if not self.words.size:
+            return -1, "PYTHON"  # same fallback as WordDictionary
+        index = self.words.draw()
+        return index, self.dictionary.get_word(index)
+    def pick_phrase(self):
+        """Next phrase from the deck as (index, phrase)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        if not self.phrases.size:
+            return -1, "UNIT TESTING"
+        index = self.phrases.draw()
+        return index, self.dictionary.get_phrase(index)
+    def pick_in_band(self, band):
+        """Next basic word from a difficulty band as (index, word)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        index = self._draw_band(band)
+        if index < 0:
+            return self.pick_word()
+        return index, self.dictionary.get_word(index)
+    def _draw_band(self, band):
+        difficulty = get_difficulty(self.dictionary)
+        if difficulty is None:
+            return -1
+        deck = self.bands.get(band)
+        if deck is None:
+            deck = self.bands[band] = WordDeck(difficulty.band_size(band), self.rng)
+        if not deck.size:
+            return -1
+        return difficulty.band_entry(band, deck.draw())
+    def pick_index(self, level):
+        """Next answer index for a level."""
+        if level.band is not None:
+            index = self._draw_band(level.band)
+            if index >= 0:
+                return index
+        elif level.uses_phrases:
+            return self.phrases.draw()
+        return self.words.draw()
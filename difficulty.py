@@ -0,0 +1,267 @@
+"""
+Word Difficulty Index for Hangman Game
+Author: CDU Software Engineering Student
+
+Scores every dictionary entry for difficulty once, offline, and stores
+the entries sorted by score and split into equal-sized bands. The
+easy/medium/hard levels then pick a random entry from their band in
+O(1) at game start instead of scoring anything.
+
+An entry's score is how many wrong guesses a frequency guesser makes
+before solving it, plus a small bonus for rare letters (so ties go to
+the entry with common letters). The guesser tries letters in order of
+how many same-length entries contain them, so scoring is one pass to
+build a letter table per length and O(26) per entry - it scales
+linearly to corpora of millions of entries.
+
+Games never build an index: a dictionary either comes with one (see
+WordDictionary) or the banded levels fall back to unbanded picks.
+The header holds a CRC32 of the entries it was built from, so an index
+for a different word list is rejected when it is loaded.
+
+File layout (little endian):
+    header    magic b"HMD2", section count, band count, entry CRC32
+    sections  per section (0 = words, 1 = phrases):
+                entry count
+                band count + 1 uint32 band boundaries
+                entry count uint32 entry indexes, easiest first
+                entry count float32 scores, same order
+
+To build: python difficulty.py words.hmd [--corpus corpus.hmc]
+"""
+
+import argparse
+import mmap
+import random
+import struct
+import sys
+import zlib
+from letter_mask import letter_index
+
+MAGIC = b"HMD2"
+HEADER = struct.Struct("<4sHHI")
+COUNT = struct.Struct("<I")
+INDEX = struct.Struct("<I")
+SCORE = struct.Struct("<f")
+
+WORDS = 0
+PHRASES = 1
+BANDS = 3
+# Weight of the letter rarity term (0-1) next to wrong guesses
+RARITY_WEIGHT = 1.0
+
+
+def _letter_masks(entries):
+    """26-bit letter mask of each entry."""
+    masks = []
+    for entry in entries:
+        mask = 0
+        for char in entry:
+            index = letter_index(char)
+            if index >= 0:
+                mask |= 1 << index
+        masks.append(mask)
+    return masks
+
+
+def _letter_counts(masks):
+    """How many of the masks contain each letter."""
+    seen = [0] * 26
+    for mask in masks:
+        for index in range(26):
+            if mask >> index & 1:
+                seen[index] += 1
+    return seen
+
+
+def _guess_order(masks):
+    """Letter indexes, most entries containing them first."""
+    seen = _letter_counts(masks)
+    return sorted(range(26), key=lambda index: (-seen[index], index))
+
+
+def guesser_misses(order, mask):
+    """Wrong guesses made going through order until every letter in mask is found."""
+    misses = 0
+    for index in order:
+        if not mask:
+            break
+        bit = 1 << index
+        if mask & bit:
+            mask ^= bit
+        else:
+            misses += 1
+    return misses
+
+
+def _section_bytes(entries):
+    """An entry list laid out like a corpus section: (offsets, data)."""
+    raw = getattr(entries, "raw", None)
+    if raw is not None:
+        return raw()  # compiled corpus: already in this layout
+    offsets = [0]
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry))
+    return (struct.pack(f"<{len(offsets)}I", *offsets),
+            "".join(entries).encode("ascii"))
+
+
+def fingerprint(sections):
+    """CRC32 of every section's entries, in order."""
+    crc = 0
+    for entries in sections:
+        for part in _section_bytes(entries):
+            crc = zlib.crc32(part, crc)
+    return crc
+
+
+def score_entries(entries):
+    """Difficulty score for each entry, in the same order."""
+    masks = _letter_masks(entries)
+    # Guess order per entry length, from that length's letter frequencies
+    by_length = {}
+    for position, entry in enumerate(entries):
+        by_length.setdefault(len(entry), []).append(position)
+    orders = {length: _guess_order([masks[i] for i in positions])
+              for length, positions in by_length.items()}
+    # How many entries each letter appears in, over the whole section
+    seen = _letter_counts(masks)
+    total = len(entries) or 1
+    rarity_of = [1 - count / total for count in seen]
+    scores = []
+    for entry, mask in zip(entries, masks):
+        letters = [index for index in range(26) if mask >> index & 1]
+        rarity = 0.0
+        if letters:
+            rarity = sum(rarity_of[index] for index in letters) / len(letters)
+        scores.append(guesser_misses(orders[len(entry)], mask) + RARITY_WEIGHT * rarity)
+    return scores
+
+
+def build_difficulty(sections, bands=BANDS):
+    """Compile per-section entry lists into difficulty index bytes."""
+    parts = [HEADER.pack(MAGIC, len(sections), bands, fingerprint(sections))]
+    for entries in sections:
+        scores = score_entries(entries)
+        order = sorted(range(len(entries)), key=lambda i: (scores[i], i))
+        count = len(order)
+        parts.append(COUNT.pack(count))
+        parts.extend(INDEX.pack(count * band // bands) for band in range(bands + 1))
+        parts.extend(INDEX.pack(index) for index in order)
+        parts.extend(SCORE.pack(scores[index]) for index in order)
+    return b"".join(parts)
+
+
+def build_for_dictionary(dictionary, bands=BANDS):
+    """Difficulty index bytes for a WordDictionary's words and phrases."""
+    return build_difficulty([dictionary.basic_words, dictionary.phrases], bands)
+
+
+class DifficultyIndex:
+    """A compiled difficulty index over any bytes-like buffer."""
+    def __init__(self, buffer):
+        self._file = None
+        self._mmap = None
+        self.buffer = buffer
+        magic, section_count, self.bands, self.fingerprint = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a hangman difficulty index (or built by an "
+                             "older version - rebuild it)")
+        # Per section: (count, band boundaries, index offset, score offset)
+        self.sections = []
+        pos = HEADER.size
+        for _ in range(section_count):
+            count = COUNT.unpack_from(buffer, pos)[0]
+            pos += COUNT.size
+            bounds = tuple(INDEX.unpack_from(buffer, pos + i * INDEX.size)[0]
+                           for i in range(self.bands + 1))
+            pos += INDEX.size * (self.bands + 1)
+            self.sections.append((count, bounds, pos, pos + INDEX.size * count))
+            pos += (INDEX.size + SCORE.size) * count
+    @classmethod
+    def open(cls, path):
+        """Memory-map an index file read-only."""
+        index_file = open(path, "rb")  # pylint: disable=consider-using-with
+        try:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            index_file.close()
+            raise
+        index = cls(mapped)
+        index._file = index_file
+        index._mmap = mapped
+        return index
+    def close(self):
+        """Unmap the file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = None
+            self._file = None
+    def count(self, section=WORDS):
+        """How many entries a section covers."""
+        return self.sections[section][0]
+    def band_range(self, band, section=WORDS):
+        """(start, stop) positions of a band in the sorted order."""
+        bounds = self.sections[section][1]
+        return bounds[band], bounds[band + 1]
+    def band_size(self, band, section=WORDS):
+        start, stop = self.band_range(band, section)
+        return stop - start
+    def entry_at(self, position, section=WORDS):
+        """Dictionary index of the entry at a sorted position."""
+        return INDEX.unpack_from(self.buffer,
+                                 self.sections[section][2] + INDEX.size * position)[0]
+    def score_at(self, position, section=WORDS):
+        """Score of the entry at a sorted position."""
+        return SCORE.unpack_from(self.buffer,
+                                 self.sections[section][3] + SCORE.size * position)[0]
+    def band_entry(self, band, offset, section=WORDS):
+        """Dictionary index of the offset-th entry in a band."""
+        return self.entry_at(self.band_range(band, section)[0] + offset, section)
+    def band_entries(self, band, section=WORDS):
+        """Every dictionary index in a band, easiest first."""
+        start, stop = self.band_range(band, section)
+        return [self.entry_at(position, section) for position in range(start, stop)]
+    def pick(self, band, rng=random, section=WORDS):
+        """Random dictionary index from a band, or -1 if it's empty."""
+        size = self.band_size(band, section)
+        if not size:
+            return -1
+        return self.band_entry(band, rng.randrange(size), section)
+
+
+def get_difficulty(dictionary):
+    """
+    Difficulty index loaded with a dictionary, or None if it has none.
+    Indexes are never built on demand - build them with this module's
+    command line and load them with the dictionary.
+    """
+    return dictionary.difficulty
+
+
+def main(argv=None):
+    """Command line entry point for building difficulty index files."""
+    # Imported here: word_dictionary itself loads indexes from this module
+    from word_dictionary import WordDictionary  # pylint: disable=import-outside-toplevel
+    parser = argparse.ArgumentParser(description="Build a word difficulty index")
+    parser.add_argument("output")
+    parser.add_argument("--corpus", help="compiled corpus to score (default: built-in words)")
+    parser.add_argument("--bands", type=int, default=BANDS,
+                        help=f"games can only load indexes with {BANDS} bands")
+    args = parser.parse_args(argv)
+    dictionary = WordDictionary(corpus_path=args.corpus)
+    data = build_for_dictionary(dictionary, args.bands)
+    with open(args.output, "wb") as out:
+        out.write(data)
+    index = DifficultyIndex(data)
+    for band in range(index.bands):
+        start, stop = index.band_range(band)
+        print(f"band {band}: {stop - start} words"
+              + (f", scores {index.score_at(start):.2f}-{index.score_at(stop - 1):.2f}"
+                 if stop > start else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
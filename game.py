@@ -6,15 +6,36 @@ Main game mechanics and state management.
 This took a while to get right with all the edge cases.
 """
 
+import threading
+import struct
 from enum import Enum
-from word_dictionary import WordDictionary
+from time import perf_counter
+import metrics
+from word_dictionary import get_shared_dictionary
 from timer import GameTimer
+from letter_mask import (answer_layout, count_letters, letter_bit, letter_index,
+                         letters_from_mask, mask_from_letters)
 
 
 class GameLevel(Enum):
-    """Game difficulty levels."""
+    """
+    Game difficulty levels.
+    EASY, MEDIUM and HARD are single words picked from one band of the
+    precomputed difficulty index (see difficulty.py).
+    """
     BASIC = "basic"
     INTERMEDIATE = "intermediate"
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+    @property
+    def uses_phrases(self):
+        """True if answers come from the phrase list."""
+        return self is GameLevel.INTERMEDIATE
+    @property
+    def band(self):
+        """Difficulty band for banded levels, otherwise None."""
+        return DIFFICULTY_BANDS.get(self.value)
 
 
 class GameState(Enum):
@@ -25,109 +46,344 @@ class GameState(Enum):
     QUIT = "quit"
 
 
+MAX_LIVES = 6
+GUESS_SECONDS = 15
+# Banded levels by value -> band in the difficulty index (0 = easiest)
+DIFFICULTY_BANDS = {"easy": 0, "medium": 1, "hard": 2}
+
+# Fixed-size snapshot: level, state, lives, answer index, guess mask and
+# seconds left on the guess timer (0 = not running)
+SNAPSHOT = struct.Struct("<BBBxiIf")
+SNAPSHOT_MAGIC = b"HMS1"
+SNAPSHOT_HEADER = struct.Struct("<4sI")
+# Stable codes for levels and states, shared by snapshots, session
+# dumps and the event journal so none of them depend on enum order
+LEVEL_CODES = {GameLevel.BASIC: 0, GameLevel.INTERMEDIATE: 1, GameLevel.EASY: 2,
+               GameLevel.MEDIUM: 3, GameLevel.HARD: 4}
+LEVELS_BY_CODE = {code: level for level, code in LEVEL_CODES.items()}
+STATE_CODES = {GameState.PLAYING: 0, GameState.WON: 1, GameState.LOST: 2,
+               GameState.QUIT: 3}
+STATES_BY_CODE = {code: state for state, code in STATE_CODES.items()}
+
+
+def parse_guess(letter):
+    """
+    Clean up a raw guess and check it's a single A-Z letter.
+    Returns (letter, bit, error) - error is None for a valid guess.
+    """
+    letter = letter.upper().strip()
+    if not letter:
+        return letter, 0, "Please enter a letter"
+    if len(letter) != 1:
+        return letter, 0, "Please enter just one letter"
+    bit = letter_bit(letter)
+    if not bit:
+        return letter, 0, "Please enter a letter, not a number or symbol"
+    return letter, bit, None
+
+
+def guess_message(letter, correct, state, lives):
+    """Player-facing result message for a processed guess."""
+    if correct:
+        if state == GameState.WON:
+            return f"Correct! '{letter}' is in the word. You won!"
+        return f"Good guess! '{letter}' is in the word."
+    if state == GameState.LOST:
+        return f"Sorry, '{letter}' is not in the word. Game over!"
+    return f"Sorry, '{letter}' is not in the word. {lives} lives left."
+
+
 class HangmanGame:
-    """Main game logic and state management."""
-    def __init__(self, level=GameLevel.BASIC):
-        """Set up a new game."""
-        self.dictionary = WordDictionary()
+    """
+    Main game logic and state management.
+    Uses __slots__ and keeps only per-game state: the dictionary, the
+    answer's layout (see letter_mask.answer_layout) and the enum states
+    are shared, so an idle game is a few hundred bytes plus its timer.
+    """
+    __slots__ = ("selector", "dictionary", "level", "_layout", "answer_index",
+                 "_guess_mask", "_display", "_display_text", "lives", "state",
+                 "lock", "clock", "journal", "game_id", "timer")
+    def __init__(self, level=GameLevel.BASIC, clock=None, journal=None,
+                 selector=None):
+        """
+        Set up a new game.
+        clock is passed to the guess timer (see clock.py).
+        journal, if given, records every state change (see journal.py).
+        selector, if given, deals the answers (see deck.py) so a player
+        doesn't see repeats; otherwise they are picked at random.
+        """
+        self._init_fields(level, clock, journal, selector)
+        self._start_new_round()
+    def _init_fields(self, level, clock, journal, selector):
+        """Everything but the round itself (shared with restore())."""
+        self.selector = selector
+        self.dictionary = selector.dictionary if selector else get_shared_dictionary()
         self.level = level
-        self.answer = ""
-        self.guessed_letters = set()
-        self.wrong_guesses = set()
-        self.lives = 6
+        # Guesses are kept as 26-bit letter masks (bit 0 = 'A');
+        # setting the answer (done by the round) also resets the
+        # guesses and display
+        self.lives = MAX_LIVES
         self.state = GameState.PLAYING
-        self.timer = GameTimer(self._on_timeout)
-        self._start_new_round()
-    def _start_new_round(self):
+        # Timeouts arrive on a dispatcher thread, guesses on the caller's
+        self.lock = self._create_lock()
+        self.clock = clock
+        self.journal = journal
+        self.game_id = journal.new_game_id() if journal else 0
+        self.timer = self._create_timer()
+    def _create_lock(self):
+        """Lock guarding guesses against timeouts (subclasses can drop it)."""
+        return threading.Lock()
+    def _create_timer(self):
+        """Build the guess timer (subclasses can swap the implementation)."""
+        return GameTimer(self._on_timeout, clock=self.clock)
+    def _start_new_round(self, answer=None):
         """Initialize for a new game round."""
-        if self.level == GameLevel.BASIC:
-            self.answer = self.dictionary.get_random_word()
+        if metrics.enabled:
+            start = perf_counter()
+            self._setup_round(answer)
+            metrics.observe("round_setup_seconds", perf_counter() - start)
+            metrics.inc("rounds_total")
         else:
-            self.answer = self.dictionary.get_random_phrase()
-        self.guessed_letters.clear()
-        self.wrong_guesses.clear()
-        self.lives = 6
+            self._setup_round(answer)
+    def _setup_round(self, answer):
+        """Pick the answer and reset lives and state."""
+        if answer is not None:
+            self.answer = answer
+        else:
+            picker = self.selector or self.dictionary
+            if self.level.band is not None:
+                index, answer = picker.pick_in_band(self.level.band)
+            elif self.level.uses_phrases:
+                index, answer = picker.pick_phrase()
+            else:
+                index, answer = picker.pick_word()
+            self.answer = answer
+            self.answer_index = index
+        self.lives = MAX_LIVES
         self.state = GameState.PLAYING
+        if self.journal:
+            self.journal.round_start(self.game_id, self.level,
+                                     self.answer_index, self.answer)
     def _on_timeout(self):
         """Handle when timer runs out."""
-        if self.state == GameState.PLAYING:
+        with self.lock:
+            if self.state != GameState.PLAYING:
+                return
             self.lives -= 1
             if self.lives <= 0:
                 self.state = GameState.LOST
+            if self.journal:
+                self.journal.timeout(self.game_id, self.lives)
+                self._journal_result()
+        if metrics.enabled:
+            metrics.inc("timeouts_total")
+            if self.state == GameState.LOST:
+                metrics.inc("losses_total")
+    @property
+    def answer(self):
+        """The hidden word or phrase."""
+        return self._layout.answer
+    @answer.setter
+    def answer(self, value):
+        """Set the answer, sharing its precomputed layout with other games."""
+        self._layout = answer_layout(value)
+        # -1 means a custom answer that isn't looked up in the dictionary
+        self.answer_index = -1
+        self._guess_mask = 0
+        self._rebuild_display()
+    @property
+    def guessed_letters(self):
+        """Set of every letter guessed so far."""
+        return set(letters_from_mask(self._guess_mask))
+    @guessed_letters.setter
+    def guessed_letters(self, letters):
+        self._guess_mask = mask_from_letters(letters)
+        self._rebuild_display()
+    @property
+    def wrong_guesses(self):
+        """Set of guessed letters that are not in the answer."""
+        return set(letters_from_mask(self._guess_mask & ~self._layout.mask))
+    @wrong_guesses.setter
+    def wrong_guesses(self, letters):
+        # Keep the correct guesses, replace the wrong ones
+        self._guess_mask = ((self._guess_mask & self._layout.mask)
+                            | mask_from_letters(letters))
+    def _rebuild_display(self):
+        """Redraw the whole display buffer from the current guesses."""
+        layout = self._layout
+        if not self._guess_mask & layout.mask:
+            # Nothing revealed yet: share the layout's blank display
+            self._display = None
+            self._display_text = layout.blank
+            return
+        # spaces and punctuation are always shown
+        self._display = [
+            char if not letter_bit(char) or self._guess_mask & letter_bit(char)
+            else "_"
+            for char in layout.answer
+        ]
+        self._display_text = None
+    def _reveal(self, letter):
+        """Write a correctly guessed letter into the display buffer."""
+        if self._display is None:
+            # First correct guess: this game needs its own buffer now
+            self._display = list(self._layout.blank)
+        for pos in self._layout.positions[letter_index(letter)]:
+            self._display[pos] = letter
+        self._display_text = None
     def get_display_word(self):
         """Show current progress with underscores for missing letters."""
-        display = ""
-        for char in self.answer:
-            if char.isalpha():
-                if char in self.guessed_letters:
-                    display += char
-                else:
-                    display += "_"
-            else:
-                display += char  # spaces and punctuation shown
-        return display
+        if self._display_text is None:
+            self._display_text = "".join(self._display)
+        return self._display_text
     def make_guess(self, letter):
         """Process a player's guess. Returns (success, message)."""
+        if not metrics.enabled:
+            return self._process_guess(letter)
+        start = perf_counter()
+        was_playing = self.state == GameState.PLAYING
+        result = self._process_guess(letter)
+        metrics.observe("make_guess_seconds", perf_counter() - start)
+        metrics.inc("guesses_total")
+        if was_playing and self.state == GameState.WON:
+            metrics.inc("wins_total")
+        elif was_playing and self.state == GameState.LOST:
+            metrics.inc("losses_total")
+        return result
+    def _process_guess(self, letter):
+        """The actual guess handling behind make_guess."""
+        with self.lock:
+            return self._apply_guess(letter)
+    def _apply_guess(self, letter):
+        """Validate and apply a guess (caller holds self.lock)."""
         if self.state != GameState.PLAYING:
             return False, "Game is not active"
         # Stop timer when guess is made
         self.timer.stop_timer()
-        letter = letter.upper().strip()
         # Check if input is valid
-        if not letter:
-            return False, "Please enter a letter"
-        if len(letter) != 1:
-            return False, "Please enter just one letter"
-        if not letter.isalpha():
-            return False, "Please enter a letter, not a number or symbol"
-        if letter in self.guessed_letters:
+        letter, bit, error = parse_guess(letter)
+        if error:
+            return False, error
+        if self._guess_mask & bit:
             return False, "You already guessed that letter"
         # Process the guess
-        self.guessed_letters.add(letter)
-        if letter in self.answer:
-            # Correct guess
+        self._guess_mask |= bit
+        correct = bool(self._layout.mask & bit)
+        if correct:
+            self._reveal(letter)
             if self._word_complete():
                 self.state = GameState.WON
-                return True, f"Correct! '{letter}' is in the word. You won!"
-            return True, f"Good guess! '{letter}' is in the word."
         else:
-            # Wrong guess
-            self.wrong_guesses.add(letter)
             self.lives -= 1
             if self.lives <= 0:
                 self.state = GameState.LOST
-                return False, f"Sorry, '{letter}' is not in the word. Game over!"
-            return False, f"Sorry, '{letter}' is not in the word. {self.lives} lives left."
+        if self.journal:
+            self.journal.guess(self.game_id, letter, correct, self.lives)
+            self._journal_result()
+        return correct, guess_message(letter, correct, self.state, self.lives)
+    def _journal_result(self):
+        """Record the outcome once the game has finished."""
+        if self.state != GameState.PLAYING:
+            self.journal.result(self.game_id, self.state, self.lives,
+                                count_letters(self._guess_mask))
     def _word_complete(self):
         """Check if all letters have been guessed."""
-        for char in self.answer:
-            if char.isalpha() and char not in self.guessed_letters:
-                return False
-        return True
+        return self._guess_mask & self._layout.mask == self._layout.mask
     def start_guess_timer(self):
         """Start the 15-second timer for current guess."""
         if self.state == GameState.PLAYING:
-            self.timer.start_timer(15)
+            self.timer.start_timer(GUESS_SECONDS)
     # Getter methods
     def get_game_state(self):
         return self.state
     def get_lives(self):
         return self.lives
     def get_guessed_letters(self):
-        return sorted(list(self.guessed_letters))
+        return letters_from_mask(self._guess_mask)
     def get_wrong_guesses(self):
-        return sorted(list(self.wrong_guesses))
+        return letters_from_mask(self._guess_mask & ~self._layout.mask)
     def get_answer(self):
         return self.answer
     def get_timer_remaining(self):
         return self.timer.get_time_left()
+    def snapshot(self):
+        """Pack the game into SNAPSHOT.size bytes."""
+        if self.answer_index < 0:
+            raise ValueError("Games with a custom answer can't be snapshotted")
+        with self.lock:
+            return SNAPSHOT.pack(LEVEL_CODES[self.level], STATE_CODES[self.state],
+                                 self.lives, self.answer_index, self._guess_mask,
+                                 self.timer.get_seconds_left())
+    def load_snapshot(self, data):
+        """Replace this game's state with a packed snapshot."""
+        self.timer.stop_timer()
+        with self.lock:
+            seconds_left = self._apply_snapshot(data)
+        if seconds_left > 0 and self.state == GameState.PLAYING:
+            self.timer.start_timer(seconds_left)
+    def _apply_snapshot(self, data):
+        """Set the round from a packed snapshot. Returns its seconds left."""
+        level, state, lives, index, mask, seconds_left = SNAPSHOT.unpack(data)
+        self.level = LEVELS_BY_CODE[level]
+        if self.level.uses_phrases:
+            self.answer = self.dictionary.get_phrase(index)
+        else:
+            self.answer = self.dictionary.get_word(index)
+        self.answer_index = index
+        self._guess_mask = mask
+        self._rebuild_display()
+        self.lives = lives
+        self.state = STATES_BY_CODE[state]
+        return seconds_left
+    @classmethod
+    def restore(cls, data, clock=None, journal=None, selector=None):
+        """
+        Build a new game from a packed snapshot.
+        Goes straight to the snapshot's round instead of picking one
+        first. A journal records the round from here on (as a fresh
+        round start, without the guesses made before the snapshot).
+        """
+        game = cls.__new__(cls)
+        game._init_fields(GameLevel.BASIC, clock, journal, selector)
+        seconds_left = game._apply_snapshot(data)
+        if journal:
+            journal.round_start(game.game_id, game.level, game.answer_index, game.answer)
+        if seconds_left > 0 and game.state == GameState.PLAYING:
+            game.timer.start_timer(seconds_left)
+        return game
     def quit_game(self):
         """End the current game."""
         self.timer.stop_timer()
+        if self.journal and self.state == GameState.PLAYING:
+            self.journal.quit(self.game_id)
         self.state = GameState.QUIT
-    def new_game(self, level=None):
-        """Start a fresh game."""
+    def new_game(self, level=None, answer=None):
+        """Start a fresh game (optionally with a chosen answer)."""
         self.timer.stop_timer()
         if level:
             self.level = level
-        self._start_new_round()
+        self._start_new_round(answer)
+
+
+def dump_games(games):
+    """Pack many games into one contiguous buffer."""
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(games))]
+    parts.extend(game.snapshot() for game in games)
+    return b"".join(parts)
+
+
+def iter_snapshots(buffer):
+    """Yield each packed snapshot in a dump_games() buffer."""
+    magic, count = SNAPSHOT_HEADER.unpack_from(buffer)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a hangman snapshot buffer")
+    view = memoryview(buffer)
+    pos = SNAPSHOT_HEADER.size
+    for _ in range(count):
+        yield view[pos:pos + SNAPSHOT.size]
+        pos += SNAPSHOT.size
+
+
+def load_games(buffer, clock=None, journal=None):
+    """Rebuild every game from a dump_games() buffer."""
+    return [HangmanGame.restore(data, clock, journal) for data in iter_snapshots(buffer)]
@@ -12,9 +12,13 @@ Main entry point for the hangman game.
 Developed using TDD methodology for unit testing coursework.
 
 To run: python hangman.py
+Scripted/no-pause play: python hangman.py --fast [--script FILE]
+Headless batch games: python hangman.py simulate --help
+Replay JSONL game scripts: python hangman.py batch < scripts.jsonl
 Requirements: Python 3.7+ (no external dependencies)
 """
 
+import argparse
 import sys
 import os
 
@@ -23,6 +27,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from ui import HangmanUI
+    from simulate import main as simulate_main
+    from batch import main as batch_main
+    from stats_store import StatsStore
 except ImportError as e:
     print("Error: Can't find required game modules.")
     print(f"Details: {e}")
@@ -31,7 +38,14 @@ except ImportError as e:
     print("  - game.py")
     print("  - ui.py")
     print("  - timer.py")
+    print("  - scheduler.py")
+    print("  - clock.py")
+    print("  - letter_mask.py")
+    print("  - async_game.py")
     print("  - word_dictionary.py")
+    print("  - corpus.py")
+    print("  - difficulty.py")
+    print("  - metrics.py")
     sys.exit(1)
 
 
@@ -47,7 +61,8 @@ def check_python_version():
 
 def check_modules():
     """Check that all required modules can be imported."""
-    required = ["game", "ui", "timer", "word_dictionary"]
+    required = ["game", "ui", "timer", "scheduler", "clock", "letter_mask",
+                "async_game", "word_dictionary", "corpus", "difficulty", "metrics"]
     missing = []
     for module_name in required:
         try:
@@ -75,8 +90,37 @@ def show_welcome():
     print()
 
 
-def main():
+def parse_args(argv=None):
+    """Read the command line options for interactive play."""
+    parser = argparse.ArgumentParser(description="Play hangman in the console.")
+    parser.add_argument("--fast", action="store_true",
+                        help="no pauses between screens, one write per frame")
+    parser.add_argument("--script", metavar="FILE",
+                        type=argparse.FileType("r", encoding="utf-8"),
+                        help="read replies to the prompts from FILE, one per line"
+                             " ('-' for stdin); implies --fast")
+    parser.add_argument("--stats", metavar="DB",
+                        help="record finished games to this SQLite database")
+    parser.add_argument("--player", default="player",
+                        help="name to record games under (with --stats)")
+    return parser.parse_args(argv)
+
+
+def create_ui(args):
+    """Build the UI the options ask for."""
+    stats = StatsStore(args.stats) if args.stats else None
+    if args.script is None:
+        if args.fast:
+            return HangmanUI(fast=True, output_stream=sys.stdout,
+                             stats=stats, player=args.player)
+        return HangmanUI(stats=stats, player=args.player)
+    return HangmanUI(fast=True, input_stream=args.script, output_stream=sys.stdout,
+                     stats=stats, player=args.player)
+
+
+def main(argv=None):
     """Main program entry point."""
+    args = parse_args(argv)
     try:
         show_welcome()
         print("Checking system requirements...")
@@ -88,8 +132,14 @@ def main():
         print()
         # Start the game
         print("Starting Hangman Game...")
-        ui = HangmanUI()
-        ui.run_game()
+        ui = create_ui(args)
+        try:
+            ui.run_game()
+        finally:
+            if ui.stats is not None:
+                ui.stats.close()
+            if args.script is not None and args.script is not sys.stdin:
+                args.script.close()
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Thanks for playing!")
         sys.exit(0)
@@ -103,5 +153,19 @@ def main():
         sys.exit(1)
 
 
+def simulate(argv=None):
+    """Entry point for headless batch simulations."""
+    return simulate_main(argv)
+
+
+def batch(argv=None):
+    """Entry point for streaming JSONL game scripts."""
+    return batch_main(argv)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        sys.exit(simulate(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(batch(sys.argv[2:]))
     main()
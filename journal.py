@@ -0,0 +1,240 @@
+"""
+Event Journal for Hangman Game
+Author: CDU Software Engineering Student
+
+Append-only binary log of every game state change, plus tools to
+replay it. Records are buffered in memory and written in batches; a
+background thread fsyncs the file every fsync_interval seconds, so a
+guess never waits on the disk.
+
+Record layout (little endian):
+    header   event type, payload length, game id, timestamp
+    payload  depends on the event type (see the *_PAYLOAD structs)
+
+To replay: python journal.py stats games.journal
+"""
+
+import itertools
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from game import LEVEL_CODES, LEVELS_BY_CODE, MAX_LIVES, STATE_CODES, STATES_BY_CODE
+
+MAGIC = b"HMJ1"
+RECORD = struct.Struct("<BxHQd")
+
+OPEN = 0
+ROUND_START = 1
+GUESS = 2
+TIMEOUT = 3
+QUIT = 4
+RESULT = 5
+
+EVENT_NAMES = {OPEN: "open", ROUND_START: "round_start", GUESS: "guess",
+               TIMEOUT: "timeout", QUIT: "quit", RESULT: "result"}
+
+# level (see game.LEVEL_CODES), answer index; custom answers follow as text
+ROUND_PAYLOAD = struct.Struct("<Bi")
+# letter, correct flag, lives left
+GUESS_PAYLOAD = struct.Struct("<cBB")
+# lives left
+TIMEOUT_PAYLOAD = struct.Struct("<B")
+# final state code, lives left, guesses made
+RESULT_PAYLOAD = struct.Struct("<BBB")
+
+Event = namedtuple("Event", "type game_id timestamp data")
+
+
+class EventJournal:
+    """Buffered, append-only writer for game events."""
+    def __init__(self, path, flush_bytes=65536, fsync_interval=1.0):
+        """
+        Open (or create) a journal file for appending.
+        Buffered records are written once flush_bytes pile up and
+        fsynced at least every fsync_interval seconds.
+        """
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.fsync_interval = fsync_interval
+        self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._buffer = bytearray()
+        self.lock = threading.Lock()
+        self._closed = threading.Event()
+        # Game ids are unique across reopenings: random run id + counter
+        self.run_id = random.getrandbits(32)
+        self._ids = itertools.count(1)
+        self._append(OPEN, 0, struct.pack("<I", self.run_id))
+        self._syncer = threading.Thread(target=self._sync_loop, name="hangman-journal")
+        self._syncer.daemon = True
+        self._syncer.start()
+    def new_game_id(self):
+        """Id to tag one game's events with."""
+        return self.run_id << 32 | next(self._ids)
+    def _append(self, event_type, game_id, payload=b""):
+        record = RECORD.pack(event_type, len(payload), game_id, time.time()) + payload
+        with self.lock:
+            self._buffer += record
+            if len(self._buffer) >= self.flush_bytes:
+                self._write_buffer()
+    def _write_buffer(self):
+        """Write buffered records to the file (caller holds the lock)."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+    def round_start(self, game_id, level, answer_index, answer=""):
+        payload = ROUND_PAYLOAD.pack(LEVEL_CODES[level], answer_index)
+        if answer_index < 0:
+            payload += answer.encode("utf-8")
+        self._append(ROUND_START, game_id, payload)
+    def guess(self, game_id, letter, correct, lives):
+        self._append(GUESS, game_id,
+                     GUESS_PAYLOAD.pack(letter.encode("ascii"), correct, lives))
+    def timeout(self, game_id, lives):
+        self._append(TIMEOUT, game_id, TIMEOUT_PAYLOAD.pack(lives))
+    def quit(self, game_id):
+        self._append(QUIT, game_id)
+    def result(self, game_id, state, lives, guesses):
+        self._append(RESULT, game_id, RESULT_PAYLOAD.pack(
+            STATE_CODES[state], lives, min(guesses, 255)))
+    def flush(self, fsync=True):
+        """Write everything buffered so far (and fsync it by default)."""
+        with self.lock:
+            if self._file.closed:
+                return
+            self._write_buffer()
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+    def _sync_loop(self):
+        """Background thread: batch the fsyncs."""
+        while not self._closed.wait(self.fsync_interval):
+            self.flush()
+    def close(self):
+        """Flush, fsync and close the file."""
+        self._closed.set()
+        self.flush()
+        with self.lock:
+            self._file.close()
+
+
+def read_events(path, chunk_size=1 << 20):
+    """Yield every Event in a journal file, reading it in big chunks."""
+    unpack = RECORD.unpack_from
+    with open(path, "rb") as source:
+        if source.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a hangman journal")
+        data = b""
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break  # anything left over is a torn write at the end
+            data = data + chunk if data else chunk
+            view = memoryview(data)
+            pos = 0
+            end = len(data)
+            while pos + RECORD.size <= end:
+                event_type, length, game_id, timestamp = unpack(view, pos)
+                if pos + RECORD.size + length > end:
+                    break
+                start = pos + RECORD.size
+                pos = start + length
+                yield Event(event_type, game_id, timestamp,
+                            _decode(event_type, view[start:pos]))
+            data = data[pos:]
+
+
+def _decode(event_type, payload):
+    """Turn a record payload into a tuple of plain values."""
+    if event_type == ROUND_START:
+        level, index = ROUND_PAYLOAD.unpack_from(payload)
+        answer = bytes(payload[ROUND_PAYLOAD.size:]).decode("utf-8")
+        return LEVELS_BY_CODE[level].value, index, answer
+    if event_type == GUESS:
+        letter, correct, lives = GUESS_PAYLOAD.unpack_from(payload)
+        return letter.decode("ascii"), bool(correct), lives
+    if event_type == TIMEOUT:
+        return TIMEOUT_PAYLOAD.unpack_from(payload)
+    if event_type == RESULT:
+        state, lives, guesses = RESULT_PAYLOAD.unpack_from(payload)
+        return STATES_BY_CODE[state].value, lives, guesses
+    if event_type == OPEN:
+        return struct.unpack_from("<I", payload)
+    return ()
+
+
+def rebuild_games(path):
+    """Replay a journal into the latest state of every game by id."""
+    games = {}
+    for event in read_events(path):
+        if event.type == ROUND_START:
+            level, index, answer = event.data
+            games[event.game_id] = {"level": level, "answer_index": index,
+                                    "answer": answer, "guessed": "",
+                                    "lives": MAX_LIVES, "state": "playing",
+                                    "started": event.timestamp,
+                                    "finished": None}
+            continue
+        game = games.get(event.game_id)
+        if game is None:
+            continue
+        if event.type == GUESS:
+            game["guessed"] += event.data[0]
+            game["lives"] = event.data[2]
+        elif event.type == TIMEOUT:
+            game["lives"] = event.data[0]
+        elif event.type == QUIT:
+            game["state"] = "quit"
+            game["finished"] = event.timestamp
+        elif event.type == RESULT:
+            game["state"], game["lives"], _ = event.data
+            game["finished"] = event.timestamp
+    return games
+
+
+def replay_stats(path):
+    """Aggregate statistics straight from a journal."""
+    counts = Counter()
+    results = Counter()
+    levels = Counter()
+    for event in read_events(path):
+        counts[EVENT_NAMES.get(event.type, "unknown")] += 1
+        if event.type == ROUND_START:
+            levels[event.data[0]] += 1
+        elif event.type == RESULT:
+            results[event.data[0]] += 1
+    finished = results["won"] + results["lost"]
+    return {
+        "games": counts["round_start"],
+        "guesses": counts["guess"],
+        "timeouts": counts["timeout"],
+        "quits": counts["quit"],
+        "results": dict(results),
+        "levels": dict(levels),
+        "win_rate": results["won"] / finished if finished else 0.0,
+    }
+
+
+def main(argv=None):
+    """Command line entry point."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2 or args[0] not in ("stats", "games"):
+        print("Usage: python journal.py stats|games JOURNAL")
+        return 1
+    if args[0] == "stats":
+        for key, value in replay_stats(args[1]).items():
+            print(f"{key}: {value}")
+    else:
+        for game_id, game in rebuild_games(args[1]).items():
+            print(f"{game_id:x} {game['level']} {game['state']} "
+                  f"lives={game['lives']} guessed={game['guessed']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
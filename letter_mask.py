@@ -0,0 +1,79 @@
+"""
+Letter Mask Helpers for Hangman Game
+Author: CDU Software Engineering Student
+
+Small helpers for storing sets of A-Z letters as 26-bit integers.
+Bit 0 is 'A', bit 25 is 'Z'.
+"""
+
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALL_LETTERS = (1 << 26) - 1
+# Answers whose layouts are kept; dictionaries reuse a few thousand at most
+LAYOUT_CACHE_SIZE = 4096
+
+AnswerLayout = namedtuple("AnswerLayout", "answer mask positions blank")
+
+
+def letter_index(char):
+    """Position of an uppercase A-Z letter (0-25), or -1 for anything else."""
+    code = ord(char) - 65
+    if 0 <= code < 26 and len(char) == 1:
+        return code
+    return -1
+
+
+def letter_bit(char):
+    """Mask bit for a single letter (0 if it isn't A-Z)."""
+    index = letter_index(char)
+    return 1 << index if index >= 0 else 0
+
+
+def mask_from_letters(letters):
+    """Build a mask from any iterable of letters (case insensitive)."""
+    mask = 0
+    for char in letters:
+        mask |= letter_bit(char.upper())
+    return mask
+
+
+def letters_from_mask(mask):
+    """Sorted list of the letters set in a mask."""
+    return [ALPHABET[i] for i in range(26) if mask >> i & 1]
+
+
+def count_letters(mask):
+    """How many letters are set in a mask."""
+    return bin(mask).count("1")
+
+
+def build_answer_index(answer):
+    """
+    Work out the letters needed to win and where each one appears.
+    Returns (required_mask, positions) where positions[i] is a tuple
+    of the indexes in answer holding letter i.
+    """
+    required = 0
+    positions = [()] * 26
+    for pos, char in enumerate(answer):
+        index = letter_index(char)
+        if index >= 0:
+            required |= 1 << index
+            positions[index] += (pos,)
+    return required, tuple(positions)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def answer_layout(answer):
+    """
+    Everything about an answer that never changes during a game, built
+    once and shared by every game with that answer: the interned answer
+    string, its required letter mask, the positions of each letter (see
+    build_answer_index) and the display before any letter is guessed.
+    """
+    mask, positions = build_answer_index(answer)
+    blank = "".join("_" if letter_index(char) >= 0 else char for char in answer)
+    return AnswerLayout(sys.intern(answer), mask, positions, blank)
@@ -0,0 +1,136 @@
+"""
+Load Generator for the Hangman Server
+Author: CDU Software Engineering Student
+
+Opens lots of connections to a server.py instance and has each one
+play games as fast as it can, guessing letters in frequency order.
+Guesses are pipelined: each connection sends --depth guesses before
+reading the replies. Reports requests and games per second and
+request latency percentiles.
+
+To run:
+    python loadgen.py --connections 1000 --games 20
+    python loadgen.py --spawn-server --connections 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from metrics import Histogram
+from server import HangmanServer
+from simulate import FREQUENCY_ORDER
+
+
+class LoadStats:
+    """Totals shared by every simulated player."""
+    def __init__(self):
+        self.requests = 0
+        self.games = 0
+        self.wins = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+
+async def _send(reader, writer, requests, stats):
+    """Pipeline requests on one connection and return their replies."""
+    started = time.perf_counter()
+    writer.write(b"".join(json.dumps(request).encode("utf-8") + b"\n"
+                          for request in requests))
+    await writer.drain()
+    replies = []
+    for _ in requests:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        replies.append(json.loads(line))
+        # Each reply's latency runs from when its batch was sent
+        stats.latency.observe(time.perf_counter() - started)
+    stats.requests += len(requests)
+    stats.errors += sum(1 for reply in replies if not reply.get("ok"))
+    return replies
+
+
+async def play(host, port, games, level, depth, stats):
+    """One simulated player: a connection playing games back to back."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            reply = (await _send(reader, writer, [{"op": "new", "level": level}], stats))[0]
+            session = reply["session"]
+            letters = iter(FREQUENCY_ORDER)
+            while reply.get("state") == "playing":
+                batch = []
+                for letter in letters:
+                    batch.append({"op": "guess", "session": session, "letter": letter})
+                    if len(batch) == depth:
+                        break
+                if not batch:
+                    break
+                # Guesses sent after the game ends just come back "not active"
+                reply = (await _send(reader, writer, batch, stats))[-1]
+            stats.games += 1
+            stats.wins += reply.get("state") == "won"
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections=100, games=10, level="basic", depth=4):
+    """Run the load test and return a summary dict."""
+    stats = LoadStats()
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(play(host, port, games, level, depth, stats) for _ in range(connections)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results if isinstance(result, Exception)]
+    return {
+        "connections": connections,
+        "failed_connections": len(failed),
+        "seconds": elapsed,
+        "requests": stats.requests,
+        "requests_per_second": stats.requests / elapsed if elapsed else 0.0,
+        "games": stats.games,
+        "games_per_second": stats.games / elapsed if elapsed else 0.0,
+        "wins": stats.wins,
+        "errors": stats.errors,
+        "latency_p50": stats.latency.quantile(0.5),
+        "latency_p95": stats.latency.quantile(0.95),
+        "latency_p99": stats.latency.quantile(0.99),
+    }
+
+
+async def _run_with_server(args):
+    server = HangmanServer(guess_seconds=0)
+    host, port = await server.start("127.0.0.1", 0)
+    try:
+        return await run_load(host, port, args.connections, args.games,
+                              args.level, args.depth)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load test a hangman server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--games", type=int, default=10, help="games per connection")
+    parser.add_argument("--level", default="basic")
+    parser.add_argument("--depth", type=int, default=4, help="guesses pipelined per batch")
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="run a server in this process on a free port")
+    args = parser.parse_args(argv)
+    if args.spawn_server:
+        summary = asyncio.run(_run_with_server(args))
+    else:
+        summary = asyncio.run(run_load(args.host, args.port, args.connections,
+                                       args.games, args.level, max(1, args.depth)))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+"""
+Load Test Harness for Hangman Game
+Author: CDU Software Engineering Student
+
+Drives lots of simulated players at once against one of the game
+engines and reports how it holds up:
+
+    sync      a HangmanGame per player (GameTimer on the shared scheduler)
+    async     an AsyncHangmanGame per player on one event loop
+    sessions  one SessionManager for every player
+
+Each player guesses random unguessed letters. Before a move it either
+"thinks" for a random time (mean --think seconds) and guesses, or,
+with probability --timeout-rate, lets the guess timer run out. The
+sync and sessions engines are driven from a small pool of threads
+(--threads), each juggling many players, so the thread count measured
+is the engine's, not one per player.
+
+Reported: guesses and games per second, make_guess latency
+percentiles, timeout-fire lag percentiles (from the engines' own
+timer_fire_lag_seconds metric), lost timeouts (never fired within
+LOST_TIMEOUT_MARGIN of their deadline), peak thread count and peak RSS.
+Percentiles are histogram bucket upper bounds (see metrics.py).
+
+To run: python loadtest.py --players 5000 --engine sync --think 0.05
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import metrics
+from async_game import AsyncHangmanGame
+from game import GameLevel, GameState, HangmanGame
+from letter_mask import ALPHABET
+from metrics import Histogram
+from session_manager import SessionManager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # pylint: disable=invalid-name
+
+ENGINES = ("sync", "async", "sessions")
+# How often a player still waiting on a timeout looks again
+POLL_SECONDS = 0.005
+# A timeout this long past its deadline is counted as lost and the
+# player moves on, so one missing callback can't hang the run
+LOST_TIMEOUT_MARGIN = 1.0
+
+
+def merge_histograms(histograms):
+    """One Histogram holding every observation in histograms."""
+    merged = Histogram()
+    for histogram in histograms:
+        merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+        merged.count += histogram.count
+        merged.total += histogram.total
+    return merged
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ThreadSampler:
+    """Background thread that records the peak thread count."""
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="hangman-loadtest-sampler")
+        self._thread.daemon = True
+    def start(self):
+        self._thread.start()
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, threading.active_count())
+        return self.peak
+
+
+def pick_letter(rng, guess_mask):
+    """Random letter not in guess_mask, or None if all are taken."""
+    remaining = [letter for index, letter in enumerate(ALPHABET)
+                 if not guess_mask >> index & 1]
+    return rng.choice(remaining) if remaining else None
+
+
+class _GamePlayer:
+    """One player on the sync engine."""
+    def __init__(self, level, guess_seconds):
+        self.game = HangmanGame(level)
+        self.guess_seconds = guess_seconds
+        self._lives = 0
+    def new_game(self):
+        self.game.new_game()
+    def playing(self):
+        return self.game.state == GameState.PLAYING
+    def guess_mask(self):
+        return self.game._guess_mask  # pylint: disable=protected-access
+    def guess(self, letter):
+        self.game.make_guess(letter)
+    def start_timer(self):
+        if self.game.state == GameState.PLAYING:
+            self._lives = self.game.lives
+            self.game.timer.start_timer(self.guess_seconds)
+    def timer_pending(self):
+        # The timer goes idle just before the timeout callback runs on a
+        # dispatcher thread, so wait for the lost life instead
+        return self.game.state == GameState.PLAYING and self.game.lives == self._lives
+    def close(self):
+        self.game.quit_game()
+
+
+class _SessionPlayer:
+    """One player on the sessions engine."""
+    def __init__(self, manager, level):
+        self.manager = manager
+        self.level = level
+        self.session_id = None
+    def new_game(self):
+        if self.session_id is not None:
+            self.manager.expire(self.session_id)
+        self.session_id = self.manager.create_session(self.level)
+    def _session(self):
+        return self.manager.get_session(self.session_id)
+    def playing(self):
+        return self._session().state == GameState.PLAYING
+    def guess_mask(self):
+        return self._session().guess_mask
+    def guess(self, letter):
+        self.manager.make_guess(self.session_id, letter)
+    def start_timer(self):
+        self.manager.start_guess_timer(self.session_id)
+    def timer_pending(self):
+        return self._session().deadline != 0.0
+    def close(self):
+        self.manager.expire(self.session_id)
+
+
+class _Driver:
+    """Thread that plays many players, always serving whoever is due next."""
+    def __init__(self, players, games, think, timeout_rate, seed, wait_limit):
+        self.players = players
+        self.games = games
+        self.think = think
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        # Longest a "wait" move waits for its timeout before giving up
+        self.wait_limit = wait_limit
+        self._give_up = {}
+        self.latency = Histogram()
+        self.guesses = 0
+        self.finished = 0
+        self.lost_timeouts = 0
+        self.thread = threading.Thread(target=self.run, name="hangman-loadtest-driver")
+        self.thread.daemon = True
+    def _think_time(self):
+        return self.rng.uniform(0, 2 * self.think)
+    def _next_move(self, player, now):
+        """Start the player's guess timer and decide what they do next."""
+        player.start_timer()
+        if self.rng.random() < self.timeout_rate:
+            self._give_up[id(player)] = now + self.wait_limit
+            return now + POLL_SECONDS, "wait"
+        return now + self._think_time(), "guess"
+    def run(self):
+        counter = itertools.count()
+        heap = []
+        games_left = {}
+        now = time.monotonic()
+        for player in self.players:
+            player.new_game()
+            games_left[id(player)] = self.games
+            due, action = self._next_move(player, now)
+            heap.append((due, next(counter), action, player))
+        heapq.heapify(heap)
+        while heap:
+            due, _, action, player = heapq.heappop(heap)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            now = time.monotonic()
+            if action == "wait" and player.timer_pending():
+                if now < self._give_up[id(player)]:
+                    heapq.heappush(heap, (now + POLL_SECONDS, next(counter), "wait", player))
+                    continue
+                self.lost_timeouts += 1
+            if action == "guess" and player.playing():
+                letter = pick_letter(self.rng, player.guess_mask())
+                if letter is not None:
+                    start = time.perf_counter()
+                    player.guess(letter)
+                    self.latency.observe(time.perf_counter() - start)
+                    self.guesses += 1
+            if not player.playing():
+                self.finished += 1
+                games_left[id(player)] -= 1
+                if not games_left[id(player)]:
+                    player.close()
+                    continue
+                player.new_game()
+            due, action = self._next_move(player, now)
+            heapq.heappush(heap, (due, next(counter), action, player))
+
+
+def _run_threaded(players, games, think, timeout_rate, guess_seconds, threads, seed):
+    """Split players over driver threads and run them to the end."""
+    drivers = [_Driver(players[i::threads], games, think, timeout_rate, seed * 7919 + i,
+                       guess_seconds + LOST_TIMEOUT_MARGIN)
+               for i in range(min(threads, len(players)))]
+    for driver in drivers:
+        driver.thread.start()
+    for driver in drivers:
+        driver.thread.join()
+    return (merge_histograms(driver.latency for driver in drivers),
+            sum(driver.guesses for driver in drivers),
+            sum(driver.finished for driver in drivers),
+            sum(driver.lost_timeouts for driver in drivers))
+
+
+async def _async_player(level, games, think, timeout_rate, guess_seconds, rng, stats):
+    """One player on the async engine."""
+    game = AsyncHangmanGame(level)
+    for number in range(games):
+        if number:
+            game.new_game()
+        while game.get_game_state() == GameState.PLAYING:
+            game.timer.start_timer(guess_seconds)
+            if rng.random() < timeout_rate:
+                try:
+                    await asyncio.wait_for(game.wait_for_change(),
+                                           guess_seconds + LOST_TIMEOUT_MARGIN)
+                except asyncio.TimeoutError:
+                    stats[3] += 1
+                continue
+            await asyncio.sleep(rng.uniform(0, 2 * think))
+            letter = pick_letter(rng, game._guess_mask)  # pylint: disable=protected-access
+            if letter is None:
+                break
+            start = time.perf_counter()
+            game.make_guess(letter)
+            stats[0].observe(time.perf_counter() - start)
+            stats[1] += 1
+        stats[2] += 1
+    game.quit_game()
+
+
+async def _run_async(players, level, games, think, timeout_rate, guess_seconds, seed):
+    """Play every player as a task on one event loop."""
+    # latency, guesses, finished games, lost timeouts
+    stats = [Histogram(), 0, 0, 0]
+    rng = random.Random(seed)
+    await asyncio.gather(*(
+        _async_player(level, games, think, timeout_rate, guess_seconds,
+                      random.Random(rng.getrandbits(64)), stats)
+        for _ in range(players)))
+    return tuple(stats)
+
+
+def run_load_test(engine="sync", players=100, games=3, level=GameLevel.BASIC,
+                  think=0.01, timeout_rate=0.05, guess_seconds=0.2, threads=8, seed=0):
+    """Run one load test and return a summary dict."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine!r}")
+    was_enabled = metrics.enabled
+    metrics.reset()
+    metrics.enable()
+    sampler = ThreadSampler()
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        if engine == "async":
+            latency, guesses, finished, lost = asyncio.run(_run_async(
+                players, level, games, think, timeout_rate, guess_seconds, seed))
+        else:
+            if engine == "sync":
+                everyone = [_GamePlayer(level, guess_seconds) for _ in range(players)]
+            else:
+                manager = SessionManager(guess_seconds=guess_seconds)
+                everyone = [_SessionPlayer(manager, level) for _ in range(players)]
+            latency, guesses, finished, lost = _run_threaded(
+                everyone, games, think, timeout_rate, guess_seconds, threads, seed)
+    finally:
+        elapsed = time.perf_counter() - started
+        peak_threads = sampler.stop()
+        if not was_enabled:
+            metrics.disable()
+    with metrics.REGISTRY.lock:
+        fire_lag = metrics.REGISTRY.histograms.get("timer_fire_lag_seconds", Histogram())
+        timeouts = metrics.REGISTRY.counters.get("timer_fires_total", 0)
+    return {
+        "engine": engine,
+        "players": players,
+        "seconds": elapsed,
+        "guesses": guesses,
+        "guesses_per_second": guesses / elapsed if elapsed else 0.0,
+        "games": finished,
+        "games_per_second": finished / elapsed if elapsed else 0.0,
+        "make_guess_p50": latency.quantile(0.5),
+        "make_guess_p95": latency.quantile(0.95),
+        "make_guess_p99": latency.quantile(0.99),
+        "timeouts": timeouts,
+        "lost_timeouts": lost,
+        "timeout_lag_p50": fire_lag.quantile(0.5),
+        "timeout_lag_p95": fire_lag.quantile(0.95),
+        "timeout_lag_p99": fire_lag.quantile(0.99),
+        "peak_threads": peak_threads,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Load test the hangman engines")
+    parser.add_argument("--engine", choices=ENGINES, default="sync")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=3, help="games per player")
+    parser.add_argument("--level", choices=[level.value for level in GameLevel],
+                        default=GameLevel.BASIC.value)
+    parser.add_argument("--think", type=float, default=0.05,
+                        help="mean think time before a guess (seconds)")
+    parser.add_argument("--timeout-rate", type=float, default=0.05,
+                        help="chance a move is left to time out")
+    parser.add_argument("--guess-seconds", type=float, default=0.5)
+    parser.add_argument("--threads", type=int, default=8,
+                        help="driver threads (sync and sessions engines)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    summary = run_load_test(args.engine, args.players, args.games, GameLevel(args.level),
+                            args.think, args.timeout_rate, args.guess_seconds,
+                            max(1, args.threads), args.seed)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Memory Profiler for Hangman Game
+Author: CDU Software Engineering Student
+
+Uses tracemalloc to work out how many bytes each live HangmanGame
+costs and where they go. Every allocation is charged to the innermost
+game module on its traceback:
+
+    game object     the HangmanGame instance (allocated by the caller)
+    game state      its lock, display buffer and timer callback
+    timer           the GameTimer and its lock
+    scheduler       pending deadlines on the shared scheduler thread
+    answer layouts  shared per-answer masks, positions and strings
+    dictionary      word lists, corpus and difficulty index
+    selector        per-player decks (deck.py)
+
+One-off costs (loading the dictionary, starting the scheduler thread)
+are measured separately from the per-game cost by building one game
+before the measured batch.
+
+To run: python memprofile.py --games 10000 --timers
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from game import GUESS_SECONDS, GameLevel, HangmanGame
+
+# Module file -> component it's charged to
+COMPONENTS = {
+    "game.py": "game state",
+    "async_game.py": "game state",
+    "timer.py": "timer",
+    "clock.py": "scheduler",
+    "scheduler.py": "scheduler",
+    "letter_mask.py": "answer layouts",
+    "word_dictionary.py": "dictionary",
+    "corpus.py": "dictionary",
+    "difficulty.py": "dictionary",
+    "deck.py": "selector",
+    # Instances are allocated at the factory() call site
+    "memprofile.py": "game object",
+}
+
+
+def component_for(traceback):
+    """Component of the innermost game module on an allocation traceback."""
+    # tracemalloc lists frames from the oldest to the most recent
+    for frame in reversed(traceback):
+        component = COMPONENTS.get(os.path.basename(frame.filename))
+        if component is not None:
+            return component
+    return "other"
+
+
+def _by_component(before, after):
+    """Bytes allocated between two snapshots, by component."""
+    totals = {}
+    for stat in after.compare_to(before, "traceback"):
+        if stat.size_diff:
+            component = component_for(stat.traceback)
+            totals[component] = totals.get(component, 0) + stat.size_diff
+    return totals
+
+
+def _snapshot():
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def measure(factory, count, depth=25):
+    """
+    Call factory() count times, keeping every result alive, and return
+    {"count", "bytes_per_item", "components", "one_off"}. components is
+    bytes per item; one_off is what the first (unmeasured) call cost.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(depth)
+    try:
+        items = [None] * count
+        base = _snapshot()
+        first = factory()
+        warm = _snapshot()
+        for index in range(count):
+            items[index] = factory()
+        done = _snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    items.append(first)
+    per_item = {name: size / count for name, size in _by_component(warm, done).items()}
+    return {
+        "count": count,
+        "bytes_per_item": sum(per_item.values()),
+        "components": per_item,
+        "one_off": _by_component(base, warm),
+        "items": items,
+    }
+
+
+def profile_games(count=10000, level=GameLevel.BASIC, timers=False, depth=25):
+    """
+    Profile count idle games at a level (each with a running guess
+    timer if timers is set). Returns measure()'s summary without the
+    games themselves.
+    """
+    def new_game():
+        game = HangmanGame(level)
+        if timers:
+            game.timer.start_timer(GUESS_SECONDS)
+        return game
+    result = measure(new_game, count, depth)
+    games = result.pop("items")
+    result.update(level=level.value, timers=timers,
+                  game_object_bytes=sys.getsizeof(games[0]),
+                  timer_object_bytes=sys.getsizeof(games[0].timer))
+    for game in games:
+        game.quit_game()
+    return result
+
+
+def format_report(result):
+    """Human-readable version of a profile_games() result."""
+    lines = [f"{result['count']} idle {result['level']} games"
+             f"{' with running timers' if result['timers'] else ''}: "
+             f"{result['bytes_per_item']:.0f} bytes per game",
+             f"(HangmanGame object {result['game_object_bytes']} bytes, "
+             f"GameTimer {result['timer_object_bytes']} bytes)",
+             ""]
+    for name, size in sorted(result["components"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<16}{size:>10.1f}")
+    lines.append("")
+    lines.append("One-off (shared by every game):")
+    for name, size in sorted(result["one_off"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<16}{size:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Measure memory per hangman game")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--level", choices=[level.value for level in GameLevel],
+                        default=GameLevel.BASIC.value)
+    parser.add_argument("--timers", action="store_true",
+                        help="start a guess timer on every game")
+    parser.add_argument("--depth", type=int, default=25,
+                        help="traceback frames kept per allocation")
+    parser.add_argument("--json", action="store_true", help="print JSON instead")
+    args = parser.parse_args(argv)
+    result = profile_games(max(1, args.games), GameLevel(args.level), args.timers,
+                           args.depth)
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Metrics for Hangman Game
+Author: CDU Software Engineering Student
+
+Opt-in counters and latency histograms for the game, timer and
+dictionary. Everything is off by default - instrumented code checks
+metrics.enabled first, so the only cost when disabled is that check.
+
+    import metrics
+    metrics.enable()
+    ...
+    metrics.snapshot()
+    metrics.write_prometheus("hangman.prom")
+"""
+
+import os
+import threading
+from bisect import bisect_left
+
+enabled = False  # pylint: disable=invalid-name
+
+# Latency bucket upper bounds in seconds: 1us doubling up to ~8s
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** i for i in range(24))
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+    __slots__ = ("counts", "count", "total")
+    def __init__(self):
+        # One extra bucket for anything above the last bound
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (0-1)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                if index < len(BUCKET_BOUNDS):
+                    return BUCKET_BOUNDS[index]
+                return float("inf")
+        return float("inf")
+    def to_dict(self):
+        cumulative = []
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.counts):
+            seen += count
+            cumulative.append((bound, seen))
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "buckets": cumulative,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Holds named counters and histograms."""
+    def __init__(self, prefix="hangman"):
+        self.prefix = prefix
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+    def inc(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+    def snapshot(self):
+        """Plain-dict copy of every metric."""
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict()
+                               for name, histogram in self.histograms.items()},
+            }
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        data = self.snapshot()
+        lines = []
+        for name, value in sorted(data["counters"].items()):
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full} counter")
+            lines.append(f"{full} {value}")
+        for name, histogram in sorted(data["histograms"].items()):
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {full} histogram")
+            for bound, count in histogram["buckets"]:
+                lines.append(f'{full}_bucket{{le="{bound:g}"}} {count}')
+            lines.append(f'{full}_bucket{{le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{full}_sum {histogram['sum']:.9f}")
+            lines.append(f"{full}_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
+    def write_prometheus(self, path):
+        """Write the text dump to a file."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as out:
+            out.write(self.to_prometheus())
+        # os.replace keeps scrapers from reading a half-written file
+        os.replace(temp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable():
+    """Start collecting metrics."""
+    global enabled  # pylint: disable=global-statement,invalid-name
+    enabled = True
+
+
+def disable():
+    """Stop collecting metrics (existing values are kept)."""
+    global enabled  # pylint: disable=global-statement,invalid-name
+    enabled = False
+
+
+def inc(name, amount=1):
+    """Add to a counter in the default registry."""
+    REGISTRY.inc(name, amount)
+
+
+def observe(name, seconds):
+    """Record a latency in the default registry."""
+    REGISTRY.observe(name, seconds)
+
+
+def snapshot():
+    """Copy of the default registry's metrics."""
+    return REGISTRY.snapshot()
+
+
+def reset():
+    """Clear the default registry."""
+    REGISTRY.reset()
+
+
+def write_prometheus(path):
+    """Write the default registry in Prometheus text format."""
+    REGISTRY.write_prometheus(path)
@@ -0,0 +1,202 @@
+"""
+Timer Scheduler for Hangman Game
+Author: CDU Software Engineering Student
+
+One background thread that fires every game's guess deadline.
+Deadlines sit in a heap, so adding one is O(log n) and cancelling
+one just flags it (O(1)) until it reaches the top and gets dropped.
+
+Timeout callbacks themselves run on a small CallbackDispatcher pool
+so a slow callback can't hold up everyone else's deadlines. If the
+pool's queue is full the scheduler thread runs the callback itself,
+so a burst of timeouts slows down instead of losing any.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+import metrics
+
+
+class ScheduledCall:
+    """Handle for a callback waiting in the scheduler."""
+    __slots__ = ("deadline", "seq", "callback", "cancelled")
+    def __init__(self, deadline, seq, callback):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.cancelled = False
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+    def cancel(self):
+        """Stop this callback from firing. Safe to call more than once."""
+        self.cancelled = True
+        self.callback = None
+
+
+class TimerScheduler:
+    """Runs callbacks at monotonic deadlines from a single thread."""
+    def __init__(self, name="hangman-timers"):
+        self.name = name
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._thread = None
+    def now(self):
+        """Current scheduler time in seconds."""
+        return time.monotonic()
+    def call_later(self, delay, callback):
+        """Run callback after delay seconds. Returns a ScheduledCall."""
+        return self.call_at(self.now() + delay, callback)
+    def call_at(self, deadline, callback):
+        """Run callback once now() reaches deadline. Returns a ScheduledCall."""
+        entry = ScheduledCall(deadline, next(self._counter), callback)
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+            elif self._heap[0] is entry:
+                # New earliest deadline - wake the thread up early
+                self._condition.notify()
+        return entry
+    def cancel(self, entry):
+        """Cancel a scheduled call (O(1), cleaned up lazily)."""
+        with self._condition:
+            if not entry.cancelled:
+                entry.cancel()
+                self._cancelled += 1
+                # Don't let dead entries pile up when lots get cancelled
+                if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                    self._heap = [e for e in self._heap if not e.cancelled]
+                    heapq.heapify(self._heap)
+                    self._cancelled = 0
+    def pending(self):
+        """How many callbacks are still waiting to fire."""
+        with self._condition:
+            return len(self._heap) - self._cancelled
+    def _pop_due(self):
+        """Wait for the next live deadline and pop it (runs under the lock)."""
+        while True:
+            while self._heap and self._heap[0].cancelled:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+            if not self._heap:
+                self._condition.wait()
+                continue
+            delay = self._heap[0].deadline - self.now()
+            if delay > 0:
+                self._condition.wait(delay)
+                continue
+            return heapq.heappop(self._heap)
+    def _run(self):
+        """Scheduler thread main loop."""
+        while True:
+            with self._condition:
+                entry = self._pop_due()
+                callback = entry.callback
+                entry.cancel()
+            if callback is not None:
+                try:
+                    callback()
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # One bad callback shouldn't kill every game's timer
+                    pass
+
+
+class CallbackDispatcher:
+    """Fixed pool of worker threads fed from a bounded queue."""
+    def __init__(self, workers=4, max_queue=10000, name="hangman-callbacks"):
+        """
+        Set up the pool (threads start on first submit).
+        When the queue is full, submit() runs the callback itself and
+        counts it in overflows rather than block or drop it.
+        """
+        self.workers = workers
+        self.name = name
+        self._queue = queue.Queue(max_queue)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.dispatched = 0
+        self.overflows = 0
+        self.max_delay = 0.0
+    def submit(self, callback):
+        """
+        Queue a callback to run on one of the workers.
+        Returns False if the queue was full and the callback ran on the
+        calling thread instead (a timeout must never be lost).
+        """
+        if len(self._threads) < self.workers:
+            self._start_workers()
+        try:
+            self._queue.put_nowait((time.monotonic(), callback))
+        except queue.Full:
+            with self._stats_lock:
+                self.overflows += 1
+            if metrics.enabled:
+                metrics.inc("callback_overflows_total")
+            try:
+                callback()
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            return False
+        return True
+    def _start_workers(self):
+        with self._start_lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.name}-{len(self._threads)}")
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+    def queue_size(self):
+        """Callbacks waiting for a worker."""
+        return self._queue.qsize()
+    def wait_idle(self):
+        """Block until every queued callback has run."""
+        self._queue.join()
+    def _work(self):
+        """Worker thread main loop."""
+        while True:
+            queued_at, callback = self._queue.get()
+            delay = time.monotonic() - queued_at
+            with self._stats_lock:
+                self.dispatched += 1
+                if delay > self.max_delay:
+                    self.max_delay = delay
+            if metrics.enabled:
+                metrics.observe("callback_queue_delay_seconds", delay)
+            try:
+                callback()
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+            finally:
+                self._queue.task_done()
+
+
+_default_scheduler = None
+_default_dispatcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """The process-wide scheduler shared by every GameTimer."""
+    global _default_scheduler  # pylint: disable=global-statement
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = TimerScheduler()
+        return _default_scheduler
+
+
+def get_default_dispatcher():
+    """The process-wide pool that runs timeout callbacks."""
+    global _default_dispatcher  # pylint: disable=global-statement
+    with _default_lock:
+        if _default_dispatcher is None:
+            _default_dispatcher = CallbackDispatcher()
+        return _default_dispatcher
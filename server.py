@@ -0,0 +1,212 @@
+"""
+Network Server for Hangman Game
+Author: CDU Software Engineering Student
+
+Serves hangman games over TCP from one asyncio event loop, so lots of
+players can play at once without a thread each. Games live in a
+SessionManager (compact per-session records, one timer wakeup for
+every guess deadline).
+
+Protocol: newline-delimited JSON. Each request is one JSON object on
+one line and gets exactly one JSON line back, in order. Connections
+stay open for as many requests as the client likes, and clients may
+send many requests without waiting for replies (pipelining).
+
+    {"op": "new", "level": "basic"}           -> {"ok": true, "session": 1, ...}
+    {"op": "guess", "session": 1, "letter": "E"}
+    {"op": "state", "session": 1}
+    {"op": "quit", "session": 1}
+
+Any "id" field in a request is echoed back. Failed requests get
+{"ok": false, "error": "..."}.
+
+Backpressure: requests are read in chunks, all complete lines in a
+chunk are answered with one write, and the server waits for the
+socket to drain before reading more. A client that stops reading
+stops being served instead of filling the server's memory.
+
+To run: python server.py --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from game import GUESS_SECONDS, GameLevel
+from session_manager import SessionManager
+
+READ_SIZE = 65536
+MAX_LINE = 65536
+
+
+class HangmanServer:
+    """JSON-lines game server on top of a SessionManager."""
+    def __init__(self, manager=None, guess_seconds=GUESS_SECONDS, gc_interval=60):
+        """
+        Set up the server.
+        guess_seconds starts a guess timer after every move (0 turns
+        timers off). Idle sessions are collected every gc_interval
+        seconds.
+        """
+        if manager is None:
+            manager = SessionManager(guess_seconds=guess_seconds or GUESS_SECONDS)
+        self.manager = manager
+        self.timed = guess_seconds > 0
+        self.gc_interval = gc_interval
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+        self._gc_task = None
+        self.handlers = {
+            "new": self._new_game,
+            "guess": self._guess,
+            "state": self._state,
+            "quit": self._quit,
+        }
+    def handle_request(self, request):
+        """Answer one decoded request with a response dict."""
+        self.requests += 1
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+        handler = self.handlers.get(request.get("op"))
+        if handler is None:
+            response = {"ok": False, "error": f"Unknown op: {request.get('op')!r}"}
+        else:
+            try:
+                response = handler(request)
+            except KeyError:
+                response = {"ok": False,
+                            "error": f"Unknown session: {request.get('session')!r}"}
+            except (TypeError, ValueError) as e:
+                response = {"ok": False, "error": str(e)}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+    def _new_game(self, request):
+        level = GameLevel(request.get("level", GameLevel.BASIC.value))
+        session_id = self.manager.create_session(level, player=request.get("player"))
+        if self.timed:
+            self.manager.start_guess_timer(session_id)
+        response = {"ok": True, "session": session_id}
+        response.update(self._describe(session_id))
+        return response
+    def _guess(self, request):
+        session_id = request["session"]
+        letter = request.get("letter")
+        if not isinstance(letter, str):
+            raise TypeError("letter must be a string")
+        correct, message = self.manager.make_guess(session_id, letter)
+        if self.timed:
+            self.manager.start_guess_timer(session_id)
+        response = {"ok": True, "correct": correct, "message": message}
+        response.update(self._describe(session_id))
+        return response
+    def _state(self, request):
+        response = {"ok": True}
+        response.update(self._describe(request["session"]))
+        return response
+    def _quit(self, request):
+        session_id = request["session"]
+        self.manager.quit_session(session_id)
+        response = {"ok": True}
+        response.update(self._describe(session_id))
+        return response
+    def _describe(self, session_id):
+        """JSON-friendly version of SessionManager.get_state()."""
+        state = self.manager.get_state(session_id)
+        return {
+            "display": state["display"],
+            "lives": state["lives"],
+            "state": state["state"].value,
+            "guessed": "".join(state["guessed"]),
+            "wrong": "".join(state["wrong"]),
+            "time_left": state["time_left"],
+            "answer": state["answer"],
+        }
+    def handle_line(self, line):
+        """Answer one raw request line with an encoded response line."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = {"ok": False, "error": "Bad JSON"}
+        else:
+            response = self.handle_request(request)
+        return json.dumps(response).encode("utf-8") + b"\n"
+    async def handle_connection(self, reader, writer):
+        """Serve one client until it disconnects."""
+        self.connections += 1
+        buffered = b""
+        try:
+            while True:
+                chunk = await reader.read(READ_SIZE)
+                if not chunk:
+                    break
+                buffered += chunk
+                lines = buffered.split(b"\n")
+                buffered = lines.pop()
+                if len(buffered) > MAX_LINE:
+                    writer.write(b'{"ok": false, "error": "Request too long"}\n')
+                    break
+                replies = [self.handle_line(line) for line in lines if line.strip()]
+                if replies:
+                    writer.write(b"".join(replies))
+                    # Don't read more until the client has taken these
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+    async def _collect_garbage(self):
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            self.manager.collect_garbage()
+    async def start(self, host="127.0.0.1", port=8765, backlog=4096):
+        """Start listening. Returns the bound (host, port)."""
+        self._server = await asyncio.start_server(
+            self.handle_connection, host, port, backlog=backlog)
+        self._gc_task = asyncio.ensure_future(self._collect_garbage())
+        return self._server.sockets[0].getsockname()[:2]
+    async def serve_forever(self):
+        """Keep serving until cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+    async def close(self):
+        """Stop listening and stop the garbage collector."""
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            self._gc_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(host, port, guess_seconds):
+    """Run a server until cancelled."""
+    server = HangmanServer(guess_seconds=guess_seconds)
+    bound = await server.start(host, port)
+    print(f"Hangman server listening on {bound[0]}:{bound[1]}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Serve hangman games over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--guess-seconds", type=float, default=GUESS_SECONDS,
+                        help="guess timer length (0 = no timers)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.guess_seconds))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Session Manager for Hangman Game
+Author: CDU Software Engineering Student
+
+Runs lots of headless games at once without a HangmanGame object per
+player. Each session is a small __slots__ record and every session
+shares one WordDictionary and one clock (and so one scheduler).
+"""
+
+import heapq
+import itertools
+import struct
+import threading
+import metrics
+from game import (GUESS_SECONDS, LEVEL_CODES, LEVELS_BY_CODE, MAX_LIVES,
+                  SNAPSHOT, SNAPSHOT_HEADER, STATE_CODES, STATES_BY_CODE,
+                  GameLevel, GameState, guess_message, parse_guess)
+from letter_mask import answer_layout, letter_bit, letters_from_mask
+from clock import get_default_clock
+from deck import WordSelector
+from word_dictionary import get_shared_dictionary
+
+
+# Bulk dumps store each session as a uint64 id followed by a SNAPSHOT
+SESSION_MAGIC = b"HMSS"
+SESSION_ID = struct.Struct("<Q")
+
+
+class Session:
+    """Compact state for one game. The answer is stored by index."""
+    __slots__ = ("level", "answer_index", "guess_mask", "lives", "state",
+                 "deadline", "last_active")
+    def __init__(self, level, answer_index, now):
+        self.level = level
+        self.answer_index = answer_index
+        self.guess_mask = 0
+        self.lives = MAX_LIVES
+        self.state = GameState.PLAYING
+        self.deadline = 0.0  # 0 means no guess timer running
+        self.last_active = now
+
+
+class SessionManager:
+    """Creates, looks up, times out and cleans up game sessions."""
+    def __init__(self, dictionary=None, clock=None, idle_timeout=600,
+                 guess_seconds=GUESS_SECONDS, seed=None):
+        """
+        Set up the manager.
+        Sessions untouched for idle_timeout seconds get removed by
+        collect_garbage(). Answers are dealt from decks (see deck.py)
+        seeded from seed.
+        """
+        self.dictionary = dictionary or get_shared_dictionary()
+        self.selector = WordSelector(self.dictionary, seed)
+        # Players who asked for their own deck get one each
+        self._selectors = {}
+        self.clock = clock or get_default_clock()
+        self.idle_timeout = idle_timeout
+        self.guess_seconds = guess_seconds
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        # (deadline, session_id) pairs - only one clock callback is ever
+        # pending, for whichever deadline is earliest
+        self._deadlines = []
+        self._wakeup = None
+        self._wakeup_at = 0.0
+        self.lock = threading.Lock()
+    def __len__(self):
+        return len(self.sessions)
+    def __contains__(self, session_id):
+        return session_id in self.sessions
+    def _answer(self, session):
+        if session.level.uses_phrases:
+            return self.dictionary.get_phrase(session.answer_index)
+        return self.dictionary.get_word(session.answer_index)
+    def _answer_mask(self, session):
+        # Shared with every game and session that has the same answer
+        return answer_layout(self._answer(session)).mask
+    def create_session(self, level=GameLevel.BASIC, session_id=None, player=None):
+        """
+        Start a new game and return its session id.
+        With a player key, the answer comes from that player's own deck
+        so they see no repeats until they have had every entry.
+        """
+        with self.lock:
+            if session_id is None:
+                session_id = next(self._ids)
+            elif session_id in self.sessions:
+                raise KeyError(f"Session {session_id!r} already exists")
+            index = self._selector_for(player).pick_index(level)
+            self.sessions[session_id] = Session(level, index, self.clock.now())
+        return session_id
+    def _selector_for(self, player):
+        """The deck owner for a player (caller holds the lock)."""
+        if player is None:
+            return self.selector
+        selector = self._selectors.get(player)
+        if selector is None:
+            # Seeded from the manager's RNG so runs are reproducible
+            selector = WordSelector(self.dictionary, self.selector.rng.getrandbits(64))
+            self._selectors[player] = selector
+        return selector
+    def forget_player(self, player):
+        """Drop a player's deck (their next game starts a fresh one)."""
+        with self.lock:
+            self._selectors.pop(player, None)
+    def get_session(self, session_id):
+        """Raw session record (raises KeyError for unknown ids)."""
+        return self.sessions[session_id]
+    def get_state(self, session_id):
+        """Snapshot of a session in the same terms as HangmanGame's getters."""
+        with self.lock:
+            session = self.sessions[session_id]
+            answer = self._answer(session)
+            mask = session.guess_mask
+            wrong = mask & ~self._answer_mask(session)
+            time_left = 0
+            if session.deadline:
+                time_left = int(max(0, session.deadline - self.clock.now()))
+            finished = session.state != GameState.PLAYING
+            return {
+                "display": "".join(
+                    char if not letter_bit(char) or mask & letter_bit(char)
+                    else "_" for char in answer),
+                "lives": session.lives,
+                "state": session.state,
+                "guessed": letters_from_mask(mask),
+                "wrong": letters_from_mask(wrong),
+                "time_left": time_left,
+                "answer": answer if finished else None,
+            }
+    def make_guess(self, session_id, letter):
+        """Process a guess for a session. Returns (success, message)."""
+        with self.lock:
+            session = self.sessions[session_id]
+            session.last_active = self.clock.now()
+            if session.state != GameState.PLAYING:
+                return False, "Game is not active"
+            session.deadline = 0.0
+            letter, bit, error = parse_guess(letter)
+            if error:
+                return False, error
+            if session.guess_mask & bit:
+                return False, "You already guessed that letter"
+            session.guess_mask |= bit
+            answer_mask = self._answer_mask(session)
+            correct = bool(answer_mask & bit)
+            if correct:
+                if session.guess_mask & answer_mask == answer_mask:
+                    session.state = GameState.WON
+            else:
+                session.lives -= 1
+                if session.lives <= 0:
+                    session.state = GameState.LOST
+            return correct, guess_message(letter, correct, session.state,
+                                          session.lives)
+    def start_guess_timer(self, session_id):
+        """Give the session guess_seconds to make its next guess."""
+        with self.lock:
+            session = self.sessions[session_id]
+            if session.state != GameState.PLAYING:
+                return
+            now = self.clock.now()
+            session.last_active = now
+            session.deadline = now + self.guess_seconds
+            heapq.heappush(self._deadlines, (session.deadline, session_id))
+            self._schedule_wakeup()
+    def _schedule_wakeup(self):
+        """Make sure the clock calls us for the earliest deadline."""
+        if not self._deadlines:
+            return
+        earliest = self._deadlines[0][0]
+        if self._wakeup is not None and self._wakeup_at <= earliest:
+            return
+        if self._wakeup is not None:
+            self.clock.cancel(self._wakeup)
+        self._wakeup_at = earliest
+        self._wakeup = self.clock.call_at(earliest, self._fire_deadlines)
+    def _fire_deadlines(self):
+        """Clock callback: apply every timeout that is now due."""
+        with self.lock:
+            self._wakeup = None
+            now = self.clock.now()
+            while self._deadlines and self._deadlines[0][0] <= now:
+                deadline, session_id = heapq.heappop(self._deadlines)
+                session = self.sessions.get(session_id)
+                # Skip deadlines that were cleared or replaced
+                if session is None or session.deadline != deadline:
+                    continue
+                session.deadline = 0.0
+                if metrics.enabled:
+                    metrics.observe("timer_fire_lag_seconds", max(0.0, now - deadline))
+                    metrics.inc("timer_fires_total")
+                if session.state == GameState.PLAYING:
+                    session.lives -= 1
+                    if session.lives <= 0:
+                        session.state = GameState.LOST
+            self._schedule_wakeup()
+    def quit_session(self, session_id):
+        """End a session's game but keep it around until collected."""
+        with self.lock:
+            session = self.sessions[session_id]
+            session.deadline = 0.0
+            session.state = GameState.QUIT
+    def expire(self, session_id):
+        """Remove a session straight away. Returns True if it existed."""
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
+    def collect_garbage(self, now=None):
+        """Drop sessions idle for longer than idle_timeout. Returns count."""
+        if now is None:
+            now = self.clock.now()
+        cutoff = now - self.idle_timeout
+        with self.lock:
+            stale = [sid for sid, session in self.sessions.items()
+                     if session.last_active < cutoff and not session.deadline]
+            for session_id in stale:
+                del self.sessions[session_id]
+            if not self.sessions:
+                self._deadlines = []
+        return len(stale)
+    def dump_sessions(self):
+        """Pack every session into one buffer (session ids must be ints)."""
+        record_size = SESSION_ID.size + SNAPSHOT.size
+        with self.lock:
+            now = self.clock.now()
+            buffer = bytearray(SNAPSHOT_HEADER.size + record_size * len(self.sessions))
+            SNAPSHOT_HEADER.pack_into(buffer, 0, SESSION_MAGIC, len(self.sessions))
+            pos = SNAPSHOT_HEADER.size
+            for session_id, session in self.sessions.items():
+                if not isinstance(session_id, int) or session_id < 0:
+                    raise ValueError(f"Can't pack session id {session_id!r}")
+                seconds_left = max(0.0, session.deadline - now) if session.deadline else 0.0
+                SESSION_ID.pack_into(buffer, pos, session_id)
+                SNAPSHOT.pack_into(buffer, pos + SESSION_ID.size,
+                                   LEVEL_CODES[session.level],
+                                   STATE_CODES[session.state], session.lives,
+                                   session.answer_index, session.guess_mask,
+                                   seconds_left)
+                pos += record_size
+        return bytes(buffer)
+    def load_sessions(self, buffer):
+        """Add every session from a dump_sessions() buffer. Returns count."""
+        magic, count = SNAPSHOT_HEADER.unpack_from(buffer)
+        if magic != SESSION_MAGIC:
+            raise ValueError("Not a hangman session dump")
+        record_size = SESSION_ID.size + SNAPSHOT.size
+        with self.lock:
+            now = self.clock.now()
+            pos = SNAPSHOT_HEADER.size
+            for _ in range(count):
+                session_id = SESSION_ID.unpack_from(buffer, pos)[0]
+                level, state, lives, index, mask, seconds_left = \
+                    SNAPSHOT.unpack_from(buffer, pos + SESSION_ID.size)
+                pos += record_size
+                session = Session(LEVELS_BY_CODE[level], index, now)
+                session.state = STATES_BY_CODE[state]
+                session.lives = lives
+                session.guess_mask = mask
+                if seconds_left > 0 and session.state == GameState.PLAYING:
+                    session.deadline = now + seconds_left
+                    heapq.heappush(self._deadlines, (session.deadline, session_id))
+                self.sessions[session_id] = session
+            # Don't hand out ids that were just loaded
+            self._ids = itertools.count(max(
+                [sid for sid in self.sessions if isinstance(sid, int)] + [0]) + 1)
+            self._schedule_wakeup()
+        return count
@@ -0,0 +1,150 @@
+"""
+Shared-Memory Dictionary for Hangman Game
+Author: CDU Software Engineering Student
+
+Lets a pool of worker processes use one copy of the dictionary instead
+of each building its own. The parent puts its compiled corpus (see
+corpus.py) and difficulty index (see difficulty.py) into one block of
+shared memory, byte for byte; workers attach to it by name and read it
+in place - nothing is copied or unpacked into Python lists, and
+get_random_word(), get_random_phrase() and is_valid_word() work
+straight off the shared buffer.
+
+Every entry keeps the index it has in the parent, so answer indexes
+in snapshots, session dumps and journals mean the same answer on both
+sides. A dictionary using the built-in lists is compiled in its list
+order (corpus.build_corpus with keep_order) rather than sorted.
+
+    shared = SharedDictionary()
+    pool = ProcessPoolExecutor(initializer=attach_worker,
+                               initargs=(shared.name,))
+    ...
+    shared.close()
+
+multiprocessing.shared_memory needs Python 3.8+. On 3.7 the block is
+written to a temporary file instead and workers mmap it, which shares
+the same pages through the OS page cache.
+
+Block layout (little endian):
+    header      magic b"HMSD", corpus size, difficulty index size
+    corpus      compiled corpus bytes
+    difficulty  difficulty index bytes (size 0 if the parent has none)
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from corpus import CompiledCorpus, build_corpus
+from difficulty import DifficultyIndex
+from word_dictionary import WordDictionary, get_shared_dictionary, use_shared_dictionary
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7
+    shared_memory = None  # pylint: disable=invalid-name
+
+MAGIC = b"HMSD"
+HEADER = struct.Struct("<4sQQ")
+
+
+def pack_dictionary(dictionary):
+    """Put a dictionary's corpus and difficulty index into one block."""
+    if dictionary.corpus is not None:
+        # Already compiled: share it unchanged
+        corpus_data = bytes(dictionary.corpus.buffer)
+    else:
+        corpus_data = build_corpus(dictionary.basic_words, dictionary.phrases,
+                                   keep_order=True)
+    difficulty = dictionary.difficulty
+    difficulty_data = bytes(difficulty.buffer) if difficulty is not None else b""
+    return b"".join([HEADER.pack(MAGIC, len(corpus_data), len(difficulty_data)),
+                     corpus_data, difficulty_data])
+
+
+class SharedDictionary:
+    """Parent side: publishes a dictionary for workers to attach to."""
+    def __init__(self, dictionary=None, name=None):
+        """
+        Publish dictionary (default: the process-wide one).
+        name picks the shared memory name; by default one is generated.
+        """
+        data = pack_dictionary(dictionary or get_shared_dictionary())
+        self.size = len(data)
+        self._shm = None
+        if shared_memory is not None:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=self.size)
+            self._shm.buf[:self.size] = data
+            self.name = self._shm.name
+        else:
+            handle, self.name = tempfile.mkstemp(prefix="hangman-", suffix=".hmsd")
+            with os.fdopen(handle, "wb") as out:
+                out.write(data)
+    def close(self):
+        """Remove the block (attached workers keep their mapping)."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        elif self.name and os.path.exists(self.name):
+            os.remove(self.name)
+
+
+class AttachedDictionary:
+    """Worker side: a read-only WordDictionary over a published block."""
+    def __init__(self, name):
+        self.name = name
+        self._shm = None
+        self._mmap = None
+        if shared_memory is not None:
+            self._shm = _attach_shared_memory(name)
+            buffer = self._shm.buf
+        else:
+            with open(name, "rb") as source:
+                self._mmap = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = self._mmap
+        magic, corpus_size, difficulty_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a shared hangman dictionary")
+        start = HEADER.size
+        middle = start + corpus_size
+        # Zero-copy views into the block; kept so close() can release them
+        self._views = [memoryview(buffer)[start:middle],
+                       memoryview(buffer)[middle:middle + difficulty_size]]
+        difficulty = DifficultyIndex(self._views[1]) if difficulty_size else None
+        self.dictionary = WordDictionary(corpus=CompiledCorpus(self._views[0]),
+                                         difficulty=difficulty)
+    def close(self):
+        """Detach (the dictionary can't be used afterwards)."""
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def _attach_shared_memory(name):
+    """Open an existing block without taking over its cleanup."""
+    try:
+        # Python 3.13+: don't let this process's resource tracker
+        # unlink the parent's block when the worker exits
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+_attached = None
+
+
+def attach_worker(name):
+    """
+    Process pool initializer: attach to a published dictionary and make
+    it the one every game in this process uses.
+    """
+    global _attached  # pylint: disable=global-statement
+    _attached = AttachedDictionary(name)
+    use_shared_dictionary(_attached.dictionary)
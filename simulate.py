@@ -0,0 +1,155 @@
+"""
+Batch Simulation Runner for Hangman Game
+Author: CDU Software Engineering Student
+
+Plays lots of headless games with a guessing strategy and reports
+win rate, average guesses and how many lives were left. Games are
+split into fixed-size chunks, each with its own seeded RNG, and the
+chunks are spread over a process pool. Guess timers are never
+started in this mode, so no game can time out.
+
+To run: python simulate.py -n 100000 --strategy solver --workers 4
+"""
+
+import argparse
+import json
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from difficulty import get_difficulty
+from game import GameLevel, GameState, HangmanGame
+from letter_mask import ALPHABET
+from solver import get_solver
+
+CHUNK_SIZE = 1000
+# Rough English letter frequency order
+FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+def frequency_strategy(game, rng):  # pylint: disable=unused-argument
+    """Guess the most common English letter not tried yet."""
+    guessed = set(game.get_guessed_letters())
+    for letter in FREQUENCY_ORDER:
+        if letter not in guessed:
+            return letter
+    return None
+
+
+def random_strategy(game, rng):
+    """Guess any letter not tried yet."""
+    guessed = set(game.get_guessed_letters())
+    remaining = [letter for letter in ALPHABET if letter not in guessed]
+    return rng.choice(remaining) if remaining else None
+
+
+def solver_strategy(game, rng):
+    """Guess the letter the candidate solver likes best."""
+    solver = get_solver(game.dictionary, game.level)
+    letter = solver.best_letter(game.get_display_word(), game.get_wrong_guesses())
+    return letter or frequency_strategy(game, rng)
+
+
+STRATEGIES = {
+    "frequency": frequency_strategy,
+    "random": random_strategy,
+    "solver": solver_strategy,
+}
+
+
+def play_game(game, strategy, rng, answer):
+    """Play one game to the end. Returns (won, guesses made, lives left)."""
+    game.new_game(answer=answer)
+    guesses = 0
+    while game.get_game_state() == GameState.PLAYING:
+        letter = strategy(game, rng)
+        if letter is None:
+            break
+        game.make_guess(letter)
+        guesses += 1
+    return game.get_game_state() == GameState.WON, guesses, game.get_lives()
+
+
+def level_entries(dictionary, level):
+    """Every answer a level can pick."""
+    difficulty = get_difficulty(dictionary)
+    if level.band is not None and difficulty is not None:
+        band = difficulty.band_entries(level.band)
+        return [dictionary.basic_words[index] for index in band]
+    if level.uses_phrases:
+        return dictionary.phrases
+    return dictionary.basic_words
+
+
+def run_chunk(level, strategy, seed, count):
+    """Play count games in this process and return partial totals."""
+    if isinstance(strategy, str):
+        strategy = STRATEGIES[strategy]
+    rng = random.Random(seed)
+    game = HangmanGame(level)
+    entries = level_entries(game.dictionary, level)
+    wins = 0
+    total_guesses = 0
+    lives_left = Counter()
+    for _ in range(count):
+        answer = entries[rng.randrange(len(entries))]
+        won, guesses, lives = play_game(game, strategy, rng, answer)
+        wins += won
+        total_guesses += guesses
+        lives_left[lives] += 1
+    return count, wins, total_guesses, lives_left
+
+
+def simulate(games, level=GameLevel.BASIC, strategy="frequency", workers=1,
+             seed=0):
+    """
+    Play games headless games and return aggregate statistics.
+    strategy is a name from STRATEGIES or a picklable function taking
+    (game, rng) and returning the next letter. Results only depend on
+    seed, not on the number of workers.
+    """
+    chunks = []
+    remaining = games
+    while remaining > 0:
+        count = min(CHUNK_SIZE, remaining)
+        chunks.append((level, strategy, seed * 1000003 + len(chunks), count))
+        remaining -= count
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_chunk, *zip(*chunks)))
+    else:
+        results = [run_chunk(*chunk) for chunk in chunks]
+    played = wins = total_guesses = 0
+    lives_left = Counter()
+    for count, chunk_wins, chunk_guesses, chunk_lives in results:
+        played += count
+        wins += chunk_wins
+        total_guesses += chunk_guesses
+        lives_left.update(chunk_lives)
+    return {
+        "games": played,
+        "wins": wins,
+        "win_rate": wins / played if played else 0.0,
+        "average_guesses": total_guesses / played if played else 0.0,
+        "lives_left": dict(sorted(lives_left.items())),
+    }
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Simulate hangman games")
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("--level", choices=[level.value for level in GameLevel],
+                        default=GameLevel.BASIC.value)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="frequency")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    results = simulate(args.games, GameLevel(args.level), args.strategy,
+                       args.workers, args.seed)
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Candidate Solver for Hangman Game
+Author: CDU Software Engineering Student
+
+Works out which dictionary entries still fit a display pattern and
+which letter is the best next guess. Used for hints and bot players.
+
+Entries are indexed once by length, then by letter-at-position and by
+letter presence. Each index value is a bitset (a Python int with one
+bit per entry in the length bucket), so filtering is just ANDing ints.
+"""
+
+import weakref
+from letter_mask import ALPHABET, count_letters, letter_index
+
+
+def _bitset(members, size):
+    """Int with a bit set for each entry number in members."""
+    # Setting bits one at a time in a growing int is quadratic, so set
+    # them in a byte buffer and convert once
+    buffer = bytearray((size + 7) // 8)
+    for member in members:
+        buffer[member >> 3] |= 1 << (member & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class _LengthBucket:
+    """Bitset indexes for all entries of one length."""
+    __slots__ = ("entries", "everything", "at", "has")
+    def __init__(self, entries):
+        self.entries = entries
+        size = len(entries)
+        self.everything = (1 << size) - 1
+        length = len(entries[0])
+        # Collect the entry numbers for each key first
+        at_members = [{} for _ in range(length)]
+        has_members = [[] for _ in range(26)]
+        for bit_pos, entry in enumerate(entries):
+            for pos, char in enumerate(entry):
+                members = at_members[pos].get(char)
+                if members is None:
+                    members = at_members[pos][char] = []
+                members.append(bit_pos)
+            for char in set(entry):
+                index = letter_index(char)
+                if index >= 0:
+                    has_members[index].append(bit_pos)
+        # at[pos][char] -> bitset of entries with char at pos
+        self.at = [{char: _bitset(members, size) for char, members in column.items()}
+                   for column in at_members]
+        # has[i] -> bitset of entries containing letter i anywhere
+        self.has = [_bitset(members, size) for members in has_members]
+    def matching(self, bits):
+        """Entries whose bit is set in bits."""
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.entries[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+
+class CandidateSolver:
+    """Filters a fixed list of uppercase entries against hangman patterns."""
+    def __init__(self, entries):
+        """Build the indexes (entries should be uppercase)."""
+        grouped = {}
+        for entry in entries:
+            grouped.setdefault(len(entry), []).append(entry)
+        self._buckets = {length: _LengthBucket(tuple(group))
+                         for length, group in grouped.items()}
+    def _filter(self, pattern, wrong_guesses):
+        """Return (bucket, candidate bitset, guessed letter mask)."""
+        bucket = self._buckets.get(len(pattern))
+        if bucket is None:
+            return None, 0, 0
+        bits = bucket.everything
+        guessed = 0
+        blanks = []
+        for pos, char in enumerate(pattern):
+            if char == "_":
+                blanks.append(pos)
+                continue
+            bits &= bucket.at[pos].get(char, 0)
+            index = letter_index(char)
+            if index >= 0:
+                guessed |= 1 << index
+        for letter in wrong_guesses:
+            index = letter_index(letter.upper())
+            if index >= 0:
+                guessed |= 1 << index
+                bits &= ~bucket.has[index]
+        # Blanks hide unguessed letters only - revealed letters show
+        # every position they appear in, and punctuation is never hidden
+        for pos in blanks:
+            if not bits:
+                break
+            for char, char_bits in bucket.at[pos].items():
+                index = letter_index(char)
+                if index < 0 or guessed >> index & 1:
+                    bits &= ~char_bits
+        return bucket, bits, guessed
+    def candidates(self, pattern, wrong_guesses=()):
+        """Entries that still fit the display pattern and wrong guesses."""
+        bucket, bits, _ = self._filter(pattern, wrong_guesses)
+        if bucket is None:
+            return []
+        return bucket.matching(bits)
+    def count_candidates(self, pattern, wrong_guesses=()):
+        """How many entries still fit, without building the list."""
+        return count_letters(self._filter(pattern, wrong_guesses)[1])
+    def letter_counts(self, pattern, wrong_guesses=()):
+        """For each unguessed letter, how many candidates contain it."""
+        bucket, bits, guessed = self._filter(pattern, wrong_guesses)
+        counts = {}
+        if bucket is None or not bits:
+            return counts
+        for index in range(26):
+            if not guessed >> index & 1:
+                hits = count_letters(bits & bucket.has[index])
+                if hits:
+                    counts[ALPHABET[index]] = hits
+        return counts
+    def best_letter(self, pattern, wrong_guesses=()):
+        """
+        Unguessed letter found in the most candidates, or None if no
+        candidate fits. Ties go to the earlier letter.
+        """
+        counts = self.letter_counts(pattern, wrong_guesses)
+        if not counts:
+            return None
+        return max(sorted(counts), key=counts.get)
+
+
+_solvers = weakref.WeakKeyDictionary()
+
+
+def get_solver(dictionary, level=None):
+    """
+    Solver for a dictionary level (None for basic words), built once
+    and reused. Every single-word level shares the word solver.
+    """
+    phrases = level is not None and level.uses_phrases
+    per_list = _solvers.setdefault(dictionary, {})
+    solver = per_list.get(phrases)
+    if solver is None:
+        if phrases:
+            solver = CandidateSolver(dictionary.phrases)
+        else:
+            solver = CandidateSolver(dictionary.basic_words)
+        per_list[phrases] = solver
+    return solver
+
+
+def suggest_letter(game):
+    """Best next guess for a running HangmanGame."""
+    solver = get_solver(game.dictionary, game.level)
+    return solver.best_letter(game.get_display_word(), game.get_wrong_guesses())
@@ -0,0 +1,289 @@
+"""
+Statistics Store for Hangman Game
+Author: CDU Software Engineering Student
+
+Keeps a record of every finished game in a local SQLite database and
+answers leaderboard questions from it. record() only appends a row to
+an in-memory list; a background thread writes the rows in batches
+(one executemany per transaction), so finishing a game never waits
+on the disk.
+
+Leaderboards don't scan the game history. Each batch also updates
+per-(level, player) and per-(level, answer) totals in the same
+transaction, and those tables are indexed in leaderboard order, so
+top-N queries just read the first N index entries. Totals over every
+level are kept under the level "*".
+
+    store = StatsStore("hangman_stats.db")
+    store.record("ann", "basic", "PYTHON", 8, 21.5, "won")
+    store.top_players(10)
+    store.word_win_rates()
+    store.close()
+
+To see the leaderboard: python stats_store.py top hangman_stats.db
+"""
+
+import logging
+import sqlite3
+import sys
+import threading
+import time
+
+_log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    level TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    guesses INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    result TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_player ON games (player, level, result);
+CREATE TABLE IF NOT EXISTS player_totals (
+    level TEXT NOT NULL,
+    player TEXT NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    games INTEGER NOT NULL DEFAULT 0,
+    guesses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (level, player)
+);
+CREATE INDEX IF NOT EXISTS player_rank ON player_totals (level, wins DESC, games, player);
+CREATE TABLE IF NOT EXISTS answer_totals (
+    level TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    games INTEGER NOT NULL DEFAULT 0,
+    guesses INTEGER NOT NULL DEFAULT 0,
+    win_rate REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (level, answer)
+);
+CREATE INDEX IF NOT EXISTS answer_rank ON answer_totals (level, wins DESC, games);
+CREATE INDEX IF NOT EXISTS answer_difficulty ON answer_totals (level, win_rate, answer);
+"""
+
+# Level key for totals over every level
+ALL_LEVELS = "*"
+
+INSERT = ("INSERT INTO games (player, level, answer, guesses, seconds, result, finished)"
+          " VALUES (?, ?, ?, ?, ?, ?, ?)")
+ADD_PLAYER = "INSERT OR IGNORE INTO player_totals (level, player) VALUES (?, ?)"
+UPDATE_PLAYER = ("UPDATE player_totals SET wins = wins + ?, games = games + ?,"
+                 " guesses = guesses + ? WHERE level = ? AND player = ?")
+ADD_ANSWER = "INSERT OR IGNORE INTO answer_totals (level, answer) VALUES (?, ?)"
+UPDATE_ANSWER = ("UPDATE answer_totals SET wins = wins + ?, games = games + ?,"
+                 " guesses = guesses + ?, win_rate = 1.0 * (wins + ?) / (games + ?)"
+                 " WHERE level = ? AND answer = ?")
+# Fills the totals from the game history of a database made before
+# the totals tables existed
+REBUILD_TOTALS = """
+INSERT INTO player_totals (level, player, wins, games, guesses)
+    SELECT level, player, SUM(result = 'won'), COUNT(*), SUM(guesses)
+    FROM games GROUP BY level, player;
+INSERT INTO player_totals (level, player, wins, games, guesses)
+    SELECT '*', player, SUM(result = 'won'), COUNT(*), SUM(guesses)
+    FROM games GROUP BY player;
+INSERT INTO answer_totals (level, answer, wins, games, guesses, win_rate)
+    SELECT level, answer, SUM(result = 'won'), COUNT(*), SUM(guesses),
+           1.0 * SUM(result = 'won') / COUNT(*)
+    FROM games GROUP BY level, answer;
+INSERT INTO answer_totals (level, answer, wins, games, guesses, win_rate)
+    SELECT '*', answer, SUM(result = 'won'), COUNT(*), SUM(guesses),
+           1.0 * SUM(result = 'won') / COUNT(*)
+    FROM games GROUP BY answer;
+"""
+
+
+class StatsStore:
+    """SQLite game history with batched background writes."""
+    def __init__(self, path="hangman_stats.db", flush_rows=1000, flush_interval=0.5):
+        """
+        Open (or create) the database.
+        Queued rows are written once flush_rows pile up, and at least
+        every flush_interval seconds.
+        """
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        # One connection shared by the writer thread and queries
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._rebuild_totals()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self.written = 0
+        self.write_errors = 0
+        self._writer = threading.Thread(target=self._write_loop, name="hangman-stats")
+        self._writer.daemon = True
+        self._writer.start()
+    def _rebuild_totals(self):
+        """Backfill empty totals tables from existing game history."""
+        has_totals = self._db.execute("SELECT 1 FROM player_totals LIMIT 1").fetchone()
+        has_games = self._db.execute("SELECT 1 FROM games LIMIT 1").fetchone()
+        if has_games and not has_totals:
+            with self._db:
+                for statement in REBUILD_TOTALS.split(";"):
+                    if statement.strip():
+                        self._db.execute(statement)
+    def record(self, player, level, answer, guesses, seconds, result, finished=None):
+        """Queue one finished game (returns straight away)."""
+        row = (player, level, answer, guesses, seconds, result,
+               time.time() if finished is None else finished)
+        with self._pending_lock:
+            self._pending.append(row)
+            full = len(self._pending) >= self.flush_rows
+        if full:
+            self._wake.set()
+    def record_game(self, game, player, seconds):
+        """Queue a finished HangmanGame."""
+        self.record(player, game.level.value, game.get_answer(),
+                    len(game.get_guessed_letters()), seconds,
+                    game.get_game_state().value)
+    def pending(self):
+        """Rows queued but not written yet."""
+        with self._pending_lock:
+            return len(self._pending)
+    def flush(self):
+        """
+        Write every queued row now in a single transaction.
+        If the write fails (e.g. another process holds the database
+        locked) the rows go back on the queue and the error is raised.
+        """
+        with self._pending_lock:
+            rows = self._pending
+            self._pending = []
+        if not rows:
+            return
+        try:
+            self._write(rows)
+        except sqlite3.Error:
+            with self._pending_lock:
+                self._pending[:0] = rows
+            raise
+    def _write(self, rows):
+        """Write one batch and its totals in one transaction."""
+        players, answers = _totals(rows)
+        with self.lock:
+            with self._db:
+                self._db.executemany(INSERT, rows)
+                self._db.executemany(ADD_PLAYER, list(players))
+                self._db.executemany(UPDATE_PLAYER, [
+                    (wins, games, guesses, level, player)
+                    for (level, player), (wins, games, guesses) in players.items()])
+                self._db.executemany(ADD_ANSWER, list(answers))
+                self._db.executemany(UPDATE_ANSWER, [
+                    (wins, games, guesses, wins, games, level, answer)
+                    for (level, answer), (wins, games, guesses) in answers.items()])
+            self.written += len(rows)
+    def _write_loop(self):
+        """Background thread: write batches."""
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as error:
+                # Rows are still queued - try again next time round
+                self.write_errors += 1
+                _log.warning("stats write failed, will retry: %s", error)
+    def _query(self, sql, params=()):
+        # Queued rows count too, so results are never stale
+        self.flush()
+        with self.lock:
+            return self._db.execute(sql, params).fetchall()
+    def top_players(self, limit=10, level=None):
+        """Leaderboard: players with the most wins, fewest games first on ties."""
+        rows = self._query(
+            "SELECT player, wins, games, guesses FROM player_totals WHERE level = ?"
+            " ORDER BY wins DESC, games, player LIMIT ?", (_level_key(level), limit))
+        return [{"player": player, "wins": wins, "games": games,
+                 "win_rate": wins / games, "average_guesses": guesses / games}
+                for player, wins, games, guesses in rows]
+    def word_win_rates(self, level=None, min_games=1, limit=None):
+        """Win rate for every answer played, hardest first."""
+        sql = ("SELECT answer, wins, games FROM answer_totals"
+               " WHERE level = ? AND games >= ? ORDER BY win_rate, answer")
+        params = (_level_key(level), min_games)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return [{"answer": answer, "wins": wins, "games": games,
+                 "win_rate": wins / games}
+                for answer, wins, games in self._query(sql, params)]
+    def player_stats(self, player):
+        """Totals for one player."""
+        games, wins, seconds = self._query(
+            "SELECT COUNT(*), SUM(result = 'won'), AVG(seconds) FROM games"
+            " WHERE player = ?", (player,))[0]
+        return {"player": player, "games": games, "wins": wins or 0,
+                "win_rate": (wins or 0) / games if games else 0.0,
+                "average_seconds": seconds or 0.0}
+    def close(self):
+        """Write whatever is queued and close the database."""
+        self._closed.set()
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        with self.lock:
+            self._db.close()
+
+
+def _level_key(level):
+    """Totals key for an optional level (value or GameLevel)."""
+    if level is None:
+        return ALL_LEVELS
+    return getattr(level, "value", level)
+
+
+def _totals(rows):
+    """
+    Sum a batch of game rows into {(level, player): [wins, games, guesses]}
+    and the same keyed by (level, answer), including the "*" level.
+    """
+    players = {}
+    answers = {}
+    for player, level, answer, guesses, _, result, _ in rows:
+        won = result == "won"
+        for totals, key in ((players, (level, player)), (players, (ALL_LEVELS, player)),
+                            (answers, (level, answer)), (answers, (ALL_LEVELS, answer))):
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0, 0, 0]
+            entry[0] += won
+            entry[1] += 1
+            entry[2] += guesses
+    return players, answers
+
+
+def main(argv=None):
+    """Command line entry point."""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2 or args[0] not in ("top", "words"):
+        print("Usage: python stats_store.py top|words DATABASE")
+        return 1
+    store = StatsStore(args[1])
+    try:
+        if args[0] == "top":
+            for rank, row in enumerate(store.top_players(), 1):
+                print(f"{rank:>3}. {row['player']} wins={row['wins']} "
+                      f"games={row['games']} win_rate={row['win_rate']:.1%}")
+        else:
+            for row in store.word_win_rates():
+                print(f"{row['answer']} games={row['games']} "
+                      f"win_rate={row['win_rate']:.1%}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,17 +16,48 @@ import unittest
 import time
 import sys
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 import threading
+import asyncio
+import tempfile
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+import io
+import json
+import random
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from word_dictionary import WordDictionary
+from word_dictionary import WordDictionary, get_shared_dictionary
+from corpus import CompiledCorpus, build_corpus
 
-from timer import GameTimer
-from game import GameLevel, GameState, HangmanGame
+from timer import IDLE_TICK, GameTimer, Tick
+from scheduler import CallbackDispatcher, TimerScheduler
+from clock import ManualClock, MonotonicClock
+from game import (GUESS_SECONDS, MAX_LIVES, GameLevel, GameState, HangmanGame,
+                  SNAPSHOT, dump_games, load_games)
 from ui import HangmanUI
+from async_game import AsyncGameTimer, AsyncHangmanGame
+from session_manager import SessionManager
+from server import HangmanServer
+from loadgen import run_load
+from deck import WordDeck, WordSelector
+from stats_store import StatsStore
+from difficulty import (DifficultyIndex, build_difficulty, build_for_dictionary,
+                        get_difficulty, score_entries)
+from solver import CandidateSolver, get_solver, suggest_letter
+from simulate import simulate
+from batch import play_line, run_batch
+import shared_dictionary
+from shared_dictionary import AttachedDictionary, SharedDictionary
+import benchmark
+import loadtest
+import memprofile
+import metrics
+import journal
+from letter_mask import (ALPHABET, answer_layout, build_answer_index, letter_bit,
+                         letters_from_mask, mask_from_letters)
 
 
 class TestWordDictionary(unittest.TestCase):
@@ -60,6 +91,22 @@ class TestWordDictionary(unittest.TestCase):
     def test_is_valid_word_with_unknown_word(self):
         """Should reject words not in our dictionary."""
         self.assertFalse(self.dictionary.is_valid_word('invalidword123'))
+    def test_is_valid_word_with_phrase(self):
+        """Phrases should validate regardless of case and spacing."""
+        self.assertTrue(self.dictionary.is_valid_word('Version  Control'))
+        self.assertFalse(self.dictionary.is_valid_word('version'))
+    def test_entries_are_immutable(self):
+        """Word lists are tuples so a shared instance can't be changed."""
+        self.assertIsInstance(self.dictionary.basic_words, tuple)
+        self.assertIsInstance(self.dictionary.phrases, tuple)
+    def test_games_share_one_dictionary(self):
+        """Every game should use the process-wide dictionary."""
+        first = HangmanGame(GameLevel.BASIC)
+        second = HangmanGame(GameLevel.INTERMEDIATE)
+        self.assertIs(first.dictionary, second.dictionary)
+        self.assertIs(first.dictionary, get_shared_dictionary())
+        first.quit_game()
+        second.quit_game()
     def test_word_and_phrase_counts(self):
         """Should return correct counts for word lists."""
         word_count = self.dictionary.word_count()
@@ -68,6 +115,139 @@ class TestWordDictionary(unittest.TestCase):
         self.assertGreater(phrase_count, 0)
 
 
+class TestCompiledCorpus(unittest.TestCase):
+    """Tests for compiled, memory-mapped corpus files."""
+    def setUp(self):
+        """Compile a small corpus into a temporary file."""
+        handle, self.path = tempfile.mkstemp(suffix=".hmc")
+        os.close(handle)
+        with open(self.path, "wb") as out:
+            out.write(build_corpus(
+                ["python", "java", "Go", "python", "rust", "kotlin"],
+                ["unit testing", "version  control"]))
+        self.dictionary = WordDictionary(corpus_path=self.path)
+    def tearDown(self):
+        """Unmap and delete the corpus file."""
+        self.dictionary.corpus.close()
+        os.remove(self.path)
+    def test_entries_sorted_by_length_and_deduplicated(self):
+        """Words are uppercase, unique and grouped by length."""
+        words = list(self.dictionary.basic_words)
+        self.assertEqual(words, ["GO", "JAVA", "RUST", "KOTLIN", "PYTHON"])
+        self.assertEqual(self.dictionary.basic_words.length_range(4), (1, 2))
+    def test_random_picks_come_from_corpus(self):
+        """Random words and phrases should be read from the file."""
+        self.assertIn(self.dictionary.get_random_word(), self.dictionary.basic_words)
+        self.assertIn(self.dictionary.get_random_phrase(),
+                      ["UNIT TESTING", "VERSION CONTROL"])
+    def test_is_valid_word_uses_binary_search(self):
+        """Validation should work without loading the lists."""
+        self.assertTrue(self.dictionary.is_valid_word("kotlin"))
+        self.assertTrue(self.dictionary.is_valid_word("Version Control"))
+        self.assertFalse(self.dictionary.is_valid_word("kotlim"))
+        self.assertFalse(self.dictionary.is_valid_word("café"))
+        self.assertEqual(self.dictionary.word_count(), 5)
+        self.assertEqual(self.dictionary.phrase_count(), 2)
+    def test_rejects_other_files(self):
+        """Opening something that isn't a corpus should fail clearly."""
+        with self.assertRaises(ValueError):
+            CompiledCorpus(b"not a corpus at all")
+
+
+def _worker_dictionary_check(word):
+    """Runs in a pool worker: is the dictionary the shared one?"""
+    dictionary = get_shared_dictionary()
+    return dictionary.corpus is not None, dictionary.is_valid_word(word)
+
+
+class TestSharedDictionary(unittest.TestCase):
+    """Tests for publishing the dictionary to worker processes."""
+    def check_attached(self):
+        """Publish, attach and query the built-in lists."""
+        source = WordDictionary()
+        shared = SharedDictionary(source)
+        attached = AttachedDictionary(shared.name)
+        dictionary = attached.dictionary
+        try:
+            self.assertEqual(dictionary.word_count(), source.word_count())
+            # Same entry at every index, so answer ids mean the same thing
+            self.assertEqual(list(dictionary.basic_words), list(source.basic_words))
+            self.assertEqual(list(dictionary.phrases), list(source.phrases))
+            self.assertTrue(dictionary.is_valid_word("python"))
+            self.assertTrue(dictionary.is_valid_word("Cloud  Computing"))
+            self.assertFalse(dictionary.is_valid_word("cobol"))
+            self.assertIn(dictionary.get_random_word(), source.basic_words)
+            self.assertIn(dictionary.get_random_phrase(), source.phrases)
+            self.assertIs(get_difficulty(dictionary), dictionary.difficulty)
+            self.assertEqual(bytes(dictionary.difficulty.buffer),
+                             bytes(source.difficulty.buffer))
+        finally:
+            del dictionary
+            attached.close()
+            shared.close()
+    def test_attach_in_place(self):
+        """An attached dictionary should answer straight from the block."""
+        self.check_attached()
+    def test_file_fallback(self):
+        """Without shared_memory the block should go through a file."""
+        with patch.object(shared_dictionary, "shared_memory", None):
+            self.check_attached()
+    def test_compiled_corpus_shared_unchanged(self):
+        """A compiled corpus should be published byte for byte."""
+        source = WordDictionary()
+        compiled = WordDictionary(corpus=CompiledCorpus(
+            build_corpus(source.basic_words, source.phrases)))
+        shared = SharedDictionary(compiled)
+        attached = AttachedDictionary(shared.name)
+        try:
+            self.assertEqual(list(attached.dictionary.basic_words),
+                             list(compiled.basic_words))
+            self.assertIsNone(attached.dictionary.difficulty)
+        finally:
+            attached.close()
+            shared.close()
+    def test_pool_workers_attach(self):
+        """Pool workers should use the published dictionary."""
+        shared = SharedDictionary()
+        try:
+            with ProcessPoolExecutor(max_workers=2,
+                                     initializer=shared_dictionary.attach_worker,
+                                     initargs=(shared.name,)) as pool:
+                results = list(pool.map(_worker_dictionary_check, ["JAVA", "COBOL"]))
+        finally:
+            shared.close()
+        self.assertEqual(results, [(True, True), (True, False)])
+
+
+class TestLetterMask(unittest.TestCase):
+    """Tests for the letter mask helpers."""
+    def test_letter_bits(self):
+        """A is bit 0 and Z is bit 25, anything else has no bit."""
+        self.assertEqual(letter_bit('A'), 1)
+        self.assertEqual(letter_bit('Z'), 1 << 25)
+        self.assertEqual(letter_bit(' '), 0)
+        self.assertEqual(letter_bit('1'), 0)
+    def test_mask_round_trip(self):
+        """Letters should survive being packed into a mask."""
+        mask = mask_from_letters("hello")
+        self.assertEqual(letters_from_mask(mask), ['E', 'H', 'L', 'O'])
+    def test_answer_index(self):
+        """Should find the required letters and their positions."""
+        required, positions = build_answer_index("AB BA")
+        self.assertEqual(required, mask_from_letters("AB"))
+        self.assertEqual(positions[0], (0, 4))
+        self.assertEqual(positions[1], (1, 3))
+        self.assertEqual(positions[2], ())
+    def test_answer_layout_is_shared(self):
+        """Equal answers should get the very same layout and string."""
+        first = answer_layout("AB BA")
+        second = answer_layout("".join(["AB", " BA"]))
+        self.assertIs(first, second)
+        self.assertIs(first.answer, second.answer)
+        self.assertEqual(first.mask, mask_from_letters("AB"))
+        self.assertEqual(first.blank, "__ __")
+
+
 class TestGameTimer(unittest.TestCase):
     """Tests for the timer module."""
     def setUp(self):
@@ -75,7 +255,9 @@ class TestGameTimer(unittest.TestCase):
         self.callback_triggered = False
         def test_callback():
             self.callback_triggered = True
-        self.timer = GameTimer(test_callback)
+        # Virtual time, so nothing here has to sleep
+        self.clock = ManualClock()
+        self.timer = GameTimer(test_callback, clock=self.clock)
     def tearDown(self):
         """Clean up timer."""
         if self.timer:
@@ -97,27 +279,268 @@ class TestGameTimer(unittest.TestCase):
     def test_timer_callback_on_timeout(self):
         """Callback should be called when timer expires."""
         self.timer.start_timer(0.1)  # Very short timer
-        time.sleep(0.2)  # Wait for it to expire
-        # Give callback thread time to execute
-        time.sleep(0.1)
+        self.clock.advance(0.2)  # Move past the deadline
         self.assertTrue(self.callback_triggered)
+        self.assertFalse(self.timer.is_running())
+    def test_virtual_deadline_fires_exactly_on_time(self):
+        """A 15 second deadline fires as soon as 15 virtual seconds pass."""
+        self.timer.start_timer(15)
+        self.clock.advance(14.9)
+        self.assertFalse(self.callback_triggered)
+        self.clock.advance(0.1)
+        self.assertTrue(self.callback_triggered)
+    def test_real_clock_callback(self):
+        """The real clock should fire through the scheduler and pool."""
+        fired = threading.Event()
+        timer = GameTimer(fired.set)
+        timer.start_timer(0.05)
+        self.assertTrue(fired.wait(2))
     def test_real_time_countdown(self):
-        """Timer should count down in real time."""
+        """Timer should count down as time passes."""
         self.timer.start_timer(3)
         initial_time = self.timer.get_time_left()
-        time.sleep(1)
+        self.clock.advance(1)
         later_time = self.timer.get_time_left()
         # Should have decreased
         self.assertLess(later_time, initial_time)
+    def test_restart_ignores_old_deadline(self):
+        """Restarting should replace the old deadline, not add to it."""
+        self.timer.start_timer(0.05)
+        self.timer.start_timer(5)
+        self.clock.advance(0.15)
+        self.assertFalse(self.callback_triggered)
+        self.assertTrue(self.timer.is_running())
+    def test_stale_deadline_after_restart(self):
+        """A deadline popped before a restart must not end the new timer."""
+        self.timer.start_timer(5)
+        stale = self.timer._generation  # pylint: disable=protected-access
+        self.timer.stop_timer()
+        self.timer.start_timer(5)
+        self.timer._time_up(stale)  # pylint: disable=protected-access
+        self.assertFalse(self.callback_triggered)
+        self.assertTrue(self.timer.is_running())
+    def test_many_timers_share_one_thread(self):
+        """Thread count shouldn't grow with the number of running timers."""
+        first = GameTimer()
+        first.start_timer(5)
+        before = threading.active_count()
+        timers = [GameTimer() for _ in range(200)]
+        for timer in timers:
+            timer.start_timer(5)
+        self.assertEqual(threading.active_count(), before)
+        for timer in timers + [first]:
+            timer.stop_timer()
     def test_progress_percentage(self):
         """Should track progress as percentage."""
         self.timer.start_timer(2)
-        time.sleep(0.1)
+        self.clock.advance(0.1)
         progress = self.timer.get_progress_percent()
         self.assertGreater(progress, 0)
         self.assertLess(progress, 100)
 
 
+class TestTimerTicks(unittest.TestCase):
+    """Tests for the pushed countdown tick stream."""
+    def setUp(self):
+        """Timer on a virtual clock."""
+        self.clock = ManualClock()
+        self.timeouts = []
+        self.timer = GameTimer(lambda: self.timeouts.append(True), clock=self.clock)
+    def test_ticks_once_a_second(self):
+        """Subscribers should get start, per-second and timeout ticks."""
+        ticks = []
+        self.timer.subscribe(ticks.append)
+        self.timer.start_timer(3)
+        self.clock.advance(1)
+        self.assertEqual(self.timer.latest_tick.seconds_left, 2)
+        self.clock.advance(2)
+        self.assertEqual([tick.seconds_left for tick in ticks], [3, 2, 1, 0])
+        self.assertAlmostEqual(ticks[2].progress, 200 / 3)
+        self.assertEqual(ticks[-1], IDLE_TICK)
+        self.assertEqual(self.timeouts, [True])
+    def test_no_ticks_without_subscribers(self):
+        """Per-second ticks should only be scheduled while someone listens."""
+        self.timer.start_timer(5)
+        self.assertEqual(self.clock.pending(), 1)
+        unsubscribe = self.timer.subscribe(lambda tick: None)
+        self.assertEqual(self.clock.pending(), 2)
+        unsubscribe()
+        self.assertEqual(self.clock.pending(), 1)
+        self.assertEqual(self.timer.latest_tick, Tick(5, 0.0, True))
+        self.timer.stop_timer()
+        self.assertEqual(self.timer.latest_tick, IDLE_TICK)
+    def test_bad_subscriber_is_ignored(self):
+        """One failing subscriber shouldn't stop the others."""
+        ticks = []
+        self.timer.subscribe(lambda tick: 1 / 0)
+        self.timer.subscribe(ticks.append)
+        self.timer.start_timer(2)
+        self.clock.advance(2)
+        self.assertEqual(len(ticks), 3)
+    def test_async_tick_stream(self):
+        """ticks() should yield the latest tick after each change."""
+        async def scenario():
+            stream = self.timer.ticks()
+            seen = [await stream.__anext__()]
+            self.timer.start_timer(3)
+            seen.append(await stream.__anext__())
+            self.clock.advance(1)
+            seen.append(await stream.__anext__())
+            self.timer.stop_timer()
+            seen.append(await stream.__anext__())
+            await stream.aclose()
+            return seen
+        seen = asyncio.run(scenario())
+        self.assertEqual([tick.seconds_left for tick in seen], [0, 3, 2, 0])
+        self.assertEqual(self.timer._subscribers, ())
+
+
+class TestTimerScheduler(unittest.TestCase):
+    """Tests for the shared timer scheduler."""
+    def setUp(self):
+        """Use a private scheduler so tests don't interfere."""
+        self.scheduler = TimerScheduler()
+    def test_callbacks_fire_in_deadline_order(self):
+        """Earlier deadlines should fire first."""
+        fired = []
+        done = threading.Event()
+        self.scheduler.call_later(0.1, lambda: (fired.append(2), done.set()))
+        self.scheduler.call_later(0.05, lambda: fired.append(1))
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, [1, 2])
+    def test_cancelled_call_never_fires(self):
+        """Cancelled callbacks should be dropped."""
+        fired = threading.Event()
+        entry = self.scheduler.call_later(0.05, fired.set)
+        self.scheduler.cancel(entry)
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.assertFalse(fired.wait(0.15))
+
+
+class TestCallbackDispatcher(unittest.TestCase):
+    """Tests for the pooled timeout callback dispatch."""
+    def test_burst_of_timeouts_uses_fixed_pool(self):
+        """Many timers expiring together shouldn't start a thread each."""
+        dispatcher = CallbackDispatcher(workers=2)
+        scheduler = TimerScheduler()
+        fired = []
+        lock = threading.Lock()
+        all_fired = threading.Event()
+        def on_timeout():
+            with lock:
+                fired.append(threading.current_thread().name)
+                if len(fired) == 100:
+                    all_fired.set()
+        clock = MonotonicClock(scheduler, dispatcher)
+        timers = [GameTimer(on_timeout, clock) for _ in range(100)]
+        before = threading.active_count()
+        for timer in timers:
+            timer.start_timer(0.05)
+        self.assertTrue(all_fired.wait(5))
+        dispatcher.wait_idle()
+        self.assertEqual(len(fired), 100)
+        # one scheduler thread plus the two workers
+        self.assertLessEqual(threading.active_count(), before + 3)
+        self.assertLessEqual(len(set(fired)), 2)
+        self.assertEqual(dispatcher.dispatched, 100)
+        self.assertGreaterEqual(dispatcher.max_delay, 0.0)
+    def test_timeout_and_guess_are_synchronised(self):
+        """Timeouts racing with wrong guesses never push lives below zero."""
+        game = HangmanGame(GameLevel.BASIC)
+        game.new_game(answer="PYTHON")
+        def time_out():
+            for _ in range(10):
+                game._on_timeout()  # pylint: disable=protected-access
+        racer = threading.Thread(target=time_out)
+        racer.start()
+        for letter in "ABCDEFGIJ":
+            game.make_guess(letter)
+        racer.join()
+        self.assertEqual(game.get_game_state(), GameState.LOST)
+        self.assertEqual(game.get_lives(), 0)
+        game.quit_game()
+    def test_full_queue_runs_callback_instead_of_blocking(self):
+        """A backed-up pool must neither stall the caller nor lose a callback."""
+        dispatcher = CallbackDispatcher(workers=1, max_queue=1)
+        busy = threading.Event()
+        release = threading.Event()
+        def block():
+            busy.set()
+            release.wait()
+        self.assertTrue(dispatcher.submit(block))
+        self.assertTrue(busy.wait(5))
+        self.assertTrue(dispatcher.submit(lambda: None))
+        ran = []
+        self.assertFalse(dispatcher.submit(lambda: ran.append(
+            threading.current_thread())))
+        self.assertEqual(ran, [threading.current_thread()])
+        self.assertEqual(dispatcher.overflows, 1)
+        release.set()
+        dispatcher.wait_idle()
+    def test_overflowing_timeout_still_costs_a_life(self):
+        """A timeout that finds the pool full is applied, not dropped."""
+        dispatcher = CallbackDispatcher(workers=1, max_queue=1)
+        busy = threading.Event()
+        release = threading.Event()
+        def block():
+            busy.set()
+            release.wait()
+        dispatcher.submit(block)
+        self.assertTrue(busy.wait(5))
+        dispatcher.submit(lambda: None)
+        clock = ManualClock()
+        clock.dispatch = dispatcher.submit
+        game = HangmanGame(GameLevel.BASIC, clock=clock)
+        game.new_game(answer="PYTHON")
+        game.start_guess_timer()
+        clock.advance(GUESS_SECONDS)
+        self.assertEqual(game.get_lives(), MAX_LIVES - 1)
+        self.assertEqual(game.get_game_state(), GameState.PLAYING)
+        release.set()
+        dispatcher.wait_idle()
+        game.quit_game()
+    def test_queued_timeout_dropped_after_new_round(self):
+        """A timeout already queued shouldn't cost the next round a life."""
+        queued = []
+        clock = ManualClock()
+        clock.dispatch = queued.append
+        game = HangmanGame(GameLevel.BASIC, clock=clock)
+        game.start_guess_timer()
+        clock.advance(GUESS_SECONDS)
+        self.assertEqual(len(queued), 1)
+        game.new_game(answer="PYTHON")
+        queued[0]()
+        self.assertEqual(game.get_lives(), MAX_LIVES)
+
+
+class TestManualClock(unittest.TestCase):
+    """Tests for the virtual clock."""
+    def test_advance_fires_in_order_at_their_time(self):
+        """Callbacks fire in deadline order with now() at their deadline."""
+        clock = ManualClock()
+        seen = []
+        clock.call_later(15, lambda: seen.append(("b", clock.now())))
+        clock.call_later(5, lambda: seen.append(("a", clock.now())))
+        self.assertEqual(clock.advance(20), 2)
+        self.assertEqual(seen, [("a", 5), ("b", 15)])
+        self.assertEqual(clock.now(), 20)
+    def test_cancelled_calls_skipped(self):
+        """Cancelled handles never fire."""
+        clock = ManualClock()
+        handle = clock.call_later(1, self.fail)
+        clock.cancel(handle)
+        self.assertEqual(clock.pending(), 0)
+        self.assertEqual(clock.advance(2), 0)
+    def test_game_times_out_in_virtual_time(self):
+        """A whole game can be timed out without waiting."""
+        clock = ManualClock()
+        game = HangmanGame(GameLevel.BASIC, clock=clock)
+        for _ in range(6):
+            game.start_guess_timer()
+            clock.advance(15)
+        self.assertEqual(game.get_game_state(), GameState.LOST)
+
+
 class TestHangmanGame(unittest.TestCase):
     """Tests for core game logic."""
     def setUp(self):
@@ -186,6 +609,859 @@ class TestHangmanGame(unittest.TestCase):
         self.assertEqual(self.game.get_lives(), 0)
 
 
+class TestAsyncGame(unittest.TestCase):
+    """Tests for the asyncio game engine."""
+    def test_async_timer_times_out_on_loop(self):
+        """Deadline should cost a life without any extra threads."""
+        async def scenario():
+            game = AsyncHangmanGame(GameLevel.BASIC)
+            game.answer = "PYTHON"
+            threads = threading.active_count()
+            game.timer.start_timer(0.05)
+            await asyncio.wait_for(game.wait_for_change(), 1)
+            self.assertEqual(threading.active_count(), threads)
+            return game
+        game = asyncio.run(scenario())
+        self.assertEqual(game.get_lives(), 5)
+        self.assertFalse(game.timer.is_running())
+    def test_async_guess_cancels_timer(self):
+        """A guess should stop the pending deadline."""
+        async def scenario():
+            game = AsyncHangmanGame(GameLevel.BASIC)
+            game.answer = "PYTHON"
+            game.start_guess_timer()
+            self.assertTrue(game.timer.is_running())
+            self.assertGreater(game.get_timer_remaining(), 0)
+            success, _ = game.make_guess('P')
+            self.assertTrue(success)
+            self.assertFalse(game.timer.is_running())
+            return game
+        game = asyncio.run(scenario())
+        self.assertEqual(game.get_display_word(), "P_____")
+    def test_async_game_takes_no_lock(self):
+        """Async games live on one thread, so they don't make or take locks."""
+        with patch("game.threading.Lock", side_effect=AssertionError):
+            game = AsyncHangmanGame(GameLevel.BASIC)
+        game.answer = "PYTHON"
+        self.assertEqual(game.make_guess('P')[0], True)
+        game._on_timeout()  # pylint: disable=protected-access
+        self.assertEqual(game.get_lives(), MAX_LIVES - 1)
+    def test_async_timer_stop_before_start(self):
+        """Stopping an unstarted async timer should be harmless."""
+        timer = AsyncGameTimer()
+        timer.stop_timer()
+        self.assertFalse(timer.is_running())
+        self.assertEqual(timer.get_time_left(), 0)
+
+
+class TestWordDeck(unittest.TestCase):
+    """Tests for deck-based answer selection."""
+    def test_deals_every_index_once(self):
+        """A full pass should be a permutation, then reshuffle."""
+        deck = WordDeck(50, random.Random(1))
+        first = [deck.draw() for _ in range(50)]
+        self.assertEqual(sorted(first), list(range(50)))
+        self.assertEqual(len(deck), 0)
+        second = [deck.draw() for _ in range(50)]
+        self.assertEqual(sorted(second), list(range(50)))
+        self.assertEqual(deck.reshuffles, 1)
+    def test_large_deck_is_lazy(self):
+        """Drawing from a huge deck should only store the swapped slots."""
+        deck = WordDeck(10 ** 6, random.Random(2))
+        drawn = {deck.draw() for _ in range(1000)}
+        self.assertEqual(len(drawn), 1000)
+        self.assertLessEqual(len(deck._swaps), 1000)
+    def test_empty_deck(self):
+        """An empty deck can't deal."""
+        with self.assertRaises(IndexError):
+            WordDeck(0).draw()
+    def test_seeded_selectors_repeat(self):
+        """The same seed should give the same answers."""
+        first = WordSelector(seed=5)
+        second = WordSelector(seed=5)
+        for _ in range(10):
+            self.assertEqual(first.pick_word(), second.pick_word())
+            self.assertEqual(first.pick_phrase(), second.pick_phrase())
+    def test_game_uses_selector(self):
+        """Games sharing a selector should not repeat answers."""
+        selector = WordSelector(seed=3)
+        game = HangmanGame(GameLevel.BASIC, selector=selector)
+        answers = [game.get_answer()]
+        for _ in range(selector.dictionary.word_count() - 1):
+            game.new_game()
+            answers.append(game.get_answer())
+        game.quit_game()
+        self.assertEqual(len(set(answers)), len(answers))
+        self.assertIs(game.dictionary, selector.dictionary)
+    def test_session_player_decks(self):
+        """Each player should get their own no-repeat deck."""
+        manager = SessionManager(clock=ManualClock(), seed=9)
+        count = manager.dictionary.word_count()
+        indexes = [manager.get_session(manager.create_session(player="ann")).answer_index
+                   for _ in range(count)]
+        self.assertEqual(sorted(indexes), list(range(count)))
+        other = SessionManager(clock=ManualClock(), seed=9)
+        self.assertEqual(
+            [other.get_session(other.create_session(player="ann")).answer_index
+             for _ in range(count)], indexes)
+        manager.forget_player("ann")
+        self.assertNotIn("ann", manager._selectors)
+
+
+class TestDifficultyIndex(unittest.TestCase):
+    """Tests for the precomputed difficulty bands."""
+    def setUp(self):
+        """Build an index over the built-in lists."""
+        self.dictionary = WordDictionary()
+        self.index = DifficultyIndex(build_for_dictionary(self.dictionary))
+    def test_bands_cover_every_entry(self):
+        """Bands should split all entries, sorted easiest first."""
+        words = []
+        for band in range(self.index.bands):
+            words.extend(self.index.band_entries(band))
+        self.assertEqual(sorted(words), list(range(self.dictionary.word_count())))
+        scores = [self.index.score_at(i) for i in range(self.index.count())]
+        self.assertEqual(scores, sorted(scores))
+        self.assertEqual(self.index.count(1), self.dictionary.phrase_count())
+    def test_load_with_dictionary(self):
+        """A saved index should be memory-mapped alongside the dictionary."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "words.hmd")
+            with open(path, "wb") as out:
+                out.write(self.index.buffer)
+            dictionary = WordDictionary(difficulty_path=path)
+            self.assertIs(get_difficulty(dictionary), dictionary.difficulty)
+            self.assertEqual(dictionary.difficulty.band_entries(2),
+                             self.index.band_entries(2))
+            dictionary.difficulty.close()
+    def test_banded_levels_pick_from_band(self):
+        """Easy/medium/hard games should only get words from their band."""
+        difficulty = get_difficulty(get_shared_dictionary())
+        for level in (GameLevel.EASY, GameLevel.MEDIUM, GameLevel.HARD):
+            band = set(difficulty.band_entries(level.band))
+            game = HangmanGame(level)
+            for _ in range(20):
+                self.assertIn(game.answer_index, band)
+                self.assertEqual(game.get_answer(),
+                                 game.dictionary.get_word(game.answer_index))
+                game.new_game()
+            restored = HangmanGame.restore(game.snapshot())
+            self.assertEqual(restored.level, level)
+            self.assertEqual(restored.get_answer(), game.get_answer())
+            game.quit_game()
+            restored.quit_game()
+    def test_selector_deals_whole_band(self):
+        """A selector should deal a band without repeats."""
+        selector = WordSelector(seed=4)
+        difficulty = get_difficulty(selector.dictionary)
+        size = difficulty.band_size(0)
+        picks = [selector.pick_index(GameLevel.EASY) for _ in range(size)]
+        self.assertEqual(sorted(picks), sorted(difficulty.band_entries(0)))
+    def test_scoring_scales_linearly(self):
+        """Scoring a big list should take well under a second."""
+        rng = random.Random(3)
+        words = ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 10)))
+                 for _ in range(20000)]
+        started = time.perf_counter()
+        scores = score_entries(words)
+        self.assertEqual(len(scores), len(words))
+        self.assertLess(time.perf_counter() - started, 5.0)
+        # Common letters score as easier than rare ones of the same length
+        easy, hard = score_entries(["EEEE", "EEEE", "EEEA", "QZXJ"])[2:]
+        self.assertLess(easy, hard)
+    def test_no_index_means_unbanded_picks(self):
+        """Without an index the banded levels should pick from every word."""
+        source = WordDictionary()
+        corpus = CompiledCorpus(build_corpus(source.basic_words, source.phrases))
+        dictionary = WordDictionary(corpus=corpus)
+        self.assertIsNone(get_difficulty(dictionary))
+        index, word = dictionary.pick_in_band(2)
+        self.assertEqual(dictionary.get_word(index), word)
+        self.assertIsNone(dictionary.difficulty)
+        game = HangmanGame(GameLevel.HARD, selector=WordSelector(dictionary, seed=1))
+        self.assertGreaterEqual(game.answer_index, 0)
+        game.quit_game()
+    def test_mismatched_index_rejected(self):
+        """An index built for another word list shouldn't load."""
+        other = DifficultyIndex(build_difficulty([["ONE", "TWO"], ["A PHRASE"]]))
+        with self.assertRaises(ValueError):
+            WordDictionary(difficulty=other)
+        # Same entry counts, different words
+        source = WordDictionary()
+        words = list(source.basic_words)
+        words[0] = "PYTHONS"
+        corpus = CompiledCorpus(build_corpus(words, source.phrases, keep_order=True))
+        with self.assertRaises(ValueError):
+            WordDictionary(corpus=corpus, difficulty=source.difficulty)
+        # The same words compiled into a corpus still match
+        corpus = CompiledCorpus(build_corpus(source.basic_words, source.phrases,
+                                             keep_order=True))
+        WordDictionary(corpus=corpus, difficulty=source.difficulty)
+    def test_index_needs_one_band_per_level(self):
+        """An index with the wrong band count can't serve easy/medium/hard."""
+        source = WordDictionary()
+        two_bands = DifficultyIndex(build_for_dictionary(source, bands=2))
+        with self.assertRaises(ValueError):
+            WordDictionary(difficulty=two_bands)
+    @patch('builtins.input', return_value='5')
+    def test_ui_hard_choice(self, mock_input):
+        """The menu should offer the banded levels."""
+        self.assertEqual(HangmanUI().get_difficulty(), GameLevel.HARD)
+
+
+class TestSessionManager(unittest.TestCase):
+    """Tests for the headless multi-session manager."""
+    def setUp(self):
+        """Manager with a short guess timer and its own scheduler."""
+        self.clock = ManualClock()
+        self.manager = SessionManager(clock=self.clock,
+                                      guess_seconds=0.05, idle_timeout=60)
+        self.sid = self.manager.create_session(GameLevel.BASIC)
+        # Pin the answer to PYTHON for predictable testing
+        self.manager.get_session(self.sid).answer_index = \
+            self.manager.dictionary.basic_words.index("PYTHON")
+    def test_new_session_state(self):
+        """New sessions start with full lives and a hidden answer."""
+        state = self.manager.get_state(self.sid)
+        self.assertEqual(state["display"], "______")
+        self.assertEqual(state["lives"], 6)
+        self.assertEqual(state["state"], GameState.PLAYING)
+        self.assertIsNone(state["answer"])
+        self.assertIn(self.sid, self.manager)
+    def test_guesses_match_hangman_game(self):
+        """Guess results should follow the normal game rules."""
+        success, msg = self.manager.make_guess(self.sid, 'p')
+        self.assertTrue(success)
+        success, msg = self.manager.make_guess(self.sid, 'P')
+        self.assertIn('already', msg.lower())
+        success, msg = self.manager.make_guess(self.sid, 'Z')
+        self.assertFalse(success)
+        state = self.manager.get_state(self.sid)
+        self.assertEqual(state["display"], "P_____")
+        self.assertEqual(state["wrong"], ['Z'])
+        self.assertEqual(state["lives"], 5)
+        for letter in "YTHON":
+            self.manager.make_guess(self.sid, letter)
+        self.assertEqual(self.manager.get_state(self.sid)["state"], GameState.WON)
+    def test_guess_timeout_costs_life(self):
+        """Deadlines should fire through the shared scheduler."""
+        self.manager.start_guess_timer(self.sid)
+        self.clock.advance(0.2)
+        self.assertEqual(self.manager.get_state(self.sid)["lives"], 5)
+    def test_guess_cancels_deadline(self):
+        """Guessing in time should clear the deadline."""
+        self.manager.start_guess_timer(self.sid)
+        self.manager.make_guess(self.sid, 'P')
+        self.clock.advance(0.2)
+        self.assertEqual(self.manager.get_state(self.sid)["lives"], 6)
+    def test_expire_and_collect_garbage(self):
+        """Idle sessions should be collected, expired ones removed."""
+        other = self.manager.create_session(GameLevel.INTERMEDIATE)
+        self.assertTrue(self.manager.expire(other))
+        self.assertFalse(self.manager.expire(other))
+        self.assertEqual(self.manager.collect_garbage(), 0)
+        later = self.clock.now() + 61
+        self.assertEqual(self.manager.collect_garbage(later), 1)
+        self.assertEqual(len(self.manager), 0)
+    def test_sessions_are_compact(self):
+        """Session records shouldn't carry a per-instance dict."""
+        session = self.manager.get_session(self.sid)
+        self.assertFalse(hasattr(session, "__dict__"))
+
+
+class TestNetworkServer(unittest.TestCase):
+    """Tests for the asyncio JSON-lines server."""
+    def setUp(self):
+        """Server over a manager on a virtual clock."""
+        self.clock = ManualClock()
+        self.server = HangmanServer(SessionManager(clock=self.clock))
+    def test_game_operations(self):
+        """new/guess/state/quit should drive a session."""
+        reply = self.server.handle_request({"op": "new", "id": "a"})
+        self.assertTrue(reply["ok"])
+        self.assertEqual(reply["id"], "a")
+        self.assertEqual(reply["time_left"], GUESS_SECONDS)
+        session = reply["session"]
+        self.server.manager.get_session(session).answer_index = 0
+        answer = self.server.manager.dictionary.get_word(0)
+        reply = self.server.handle_request(
+            {"op": "guess", "session": session, "letter": answer[0]})
+        self.assertTrue(reply["correct"])
+        self.assertEqual(reply["display"][0], answer[0])
+        self.clock.advance(GUESS_SECONDS)
+        reply = self.server.handle_request({"op": "state", "session": session})
+        self.assertEqual(reply["lives"], MAX_LIVES - 1)
+        reply = self.server.handle_request({"op": "quit", "session": session})
+        self.assertEqual(reply["state"], "quit")
+        self.assertEqual(reply["answer"], answer)
+    def test_bad_requests(self):
+        """Errors should come back as replies, not exceptions."""
+        self.assertFalse(self.server.handle_request({"op": "dance"})["ok"])
+        self.assertFalse(self.server.handle_request({"op": "state", "session": 99})["ok"])
+        self.assertFalse(self.server.handle_request({"op": "new", "level": "expert"})["ok"])
+        self.assertFalse(self.server.handle_request(
+            {"op": "guess", "session": 1, "letter": 5})["ok"])
+        self.assertIn(b"Bad JSON", self.server.handle_line(b"{nope"))
+    def test_pipelined_requests_over_tcp(self):
+        """Requests sent together should be answered in order."""
+        async def scenario():
+            host, port = await self.server.start("127.0.0.1", 0)
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b'{"op": "new", "id": 1}\n'
+                         b'{"op": "state", "session": 1, "id": 2}\n'
+                         b'{"op": "guess", "session": 1, "letter": "E", "id": 3}\n')
+            replies = [json.loads(await reader.readline()) for _ in range(3)]
+            writer.close()
+            await self.server.close()
+            return replies
+        replies = asyncio.run(scenario())
+        self.assertEqual([reply["id"] for reply in replies], [1, 2, 3])
+        self.assertTrue(all(reply["ok"] for reply in replies))
+        self.assertEqual(replies[2]["guessed"], "E")
+    def test_load_generator(self):
+        """The load generator should play every game it's asked to."""
+        async def scenario():
+            server = HangmanServer(guess_seconds=0)
+            host, port = await server.start("127.0.0.1", 0)
+            summary = await run_load(host, port, connections=5, games=3, depth=3)
+            await server.close()
+            return summary
+        summary = asyncio.run(scenario())
+        self.assertEqual(summary["failed_connections"], 0)
+        self.assertEqual(summary["games"], 15)
+        self.assertEqual(summary["errors"], 0)
+        self.assertGreater(summary["latency_p99"], 0)
+
+
+class TestCandidateSolver(unittest.TestCase):
+    """Tests for the pattern-indexed solver."""
+    def setUp(self):
+        """Solver over a small known word list."""
+        self.solver = CandidateSolver(
+            ["PYTHON", "PISTON", "PARSON", "JAVA", "BASH", "UNIT TEST", "UNIT BEST"])
+    def test_all_candidates_for_blank_pattern(self):
+        """A blank pattern matches every entry of that length."""
+        self.assertEqual(self.solver.candidates("______"),
+                         ["PYTHON", "PISTON", "PARSON"])
+        self.assertEqual(self.solver.candidates("_____"), [])
+    def test_large_bucket_bitsets(self):
+        """Bitsets for big buckets should still mark exactly the right entries."""
+        words = ["".join(ALPHABET[(i * 7 + pos * 3) % 26] for pos in range(5))
+                 for i in range(300)]
+        solver = CandidateSolver(words)
+        pattern = words[250][:2] + "___"
+        expected = sorted({w for w in words if w[:2] == pattern[:2]
+                           and not set(w[2:]) & set(pattern[:2])})
+        self.assertEqual(sorted(set(solver.candidates(pattern))), expected)
+    def test_revealed_letters_filter(self):
+        """Revealed letters must match and can't hide in blanks."""
+        self.assertEqual(self.solver.candidates("P___ON"), ["PYTHON", "PISTON", "PARSON"])
+        self.assertEqual(self.solver.candidates("P_S_ON"), ["PISTON"])
+        # A revealed 'A' would show in position 1 of JAVA too
+        self.assertEqual(self.solver.candidates("_A__"), ["BASH"])
+    def test_wrong_guesses_filter(self):
+        """Entries containing a wrong letter are ruled out."""
+        self.assertEqual(self.solver.candidates("______", ["S"]), ["PYTHON"])
+        self.assertEqual(self.solver.count_candidates("______", ["S", "Y"]), 0)
+    def test_phrase_spaces_must_line_up(self):
+        """Spaces in a phrase pattern must match the entry."""
+        self.assertEqual(self.solver.candidates("___T _EST"), ["UNIT BEST"])
+        self.assertEqual(self.solver.candidates("___T__EST"), [])
+    def test_best_letter(self):
+        """Best letter is the unguessed one shared by most candidates."""
+        self.assertEqual(self.solver.best_letter("P___ON"), "S")
+        self.assertIsNone(self.solver.best_letter("ZZZZZZ"))
+    def test_suggest_letter_for_game(self):
+        """Hints for a real game should point at a letter in the answer."""
+        game = HangmanGame(GameLevel.BASIC)
+        game.answer = "PYTHON"
+        game.make_guess('P')
+        game.make_guess('O')
+        self.assertIs(get_solver(game.dictionary), get_solver(game.dictionary))
+        self.assertIn(suggest_letter(game), "YTHN")
+        game.quit_game()
+
+
+class TestSimulation(unittest.TestCase):
+    """Tests for the batch simulation runner."""
+    def test_results_are_aggregated(self):
+        """Every game should be counted once in the totals."""
+        results = simulate(50, GameLevel.BASIC, "frequency", seed=1)
+        self.assertEqual(results["games"], 50)
+        self.assertEqual(sum(results["lives_left"].values()), 50)
+        self.assertGreaterEqual(results["win_rate"], 0.0)
+        self.assertLessEqual(results["win_rate"], 1.0)
+        self.assertGreater(results["average_guesses"], 0)
+    def test_same_seed_same_results(self):
+        """Seeded runs should be reproducible."""
+        first = simulate(30, GameLevel.INTERMEDIATE, "random", seed=7)
+        second = simulate(30, GameLevel.INTERMEDIATE, "random", seed=7)
+        self.assertEqual(first, second)
+    def test_solver_wins_built_in_words(self):
+        """The solver strategy should win every built-in word."""
+        results = simulate(40, GameLevel.BASIC, "solver", seed=3)
+        self.assertEqual(results["win_rate"], 1.0)
+    def test_parallel_matches_serial(self):
+        """Worker count shouldn't change the results."""
+        serial = simulate(1500, GameLevel.BASIC, "frequency", workers=1, seed=2)
+        parallel = simulate(1500, GameLevel.BASIC, "frequency", workers=2, seed=2)
+        self.assertEqual(serial, parallel)
+
+
+class TestBatchMode(unittest.TestCase):
+    """Tests for the streaming JSONL batch mode."""
+    def test_play_scripted_answer(self):
+        """A script with an answer should replay exactly."""
+        result = play_line('{"id": 7, "answer": "test", "guesses": "TESX"}', 1)
+        self.assertEqual(result["id"], 7)
+        self.assertEqual(result["answer"], "TEST")
+        self.assertEqual(result["state"], "won")
+        self.assertEqual(result["guesses"], 3)
+        self.assertEqual(result["lives"], MAX_LIVES)
+    def test_rejected_and_bad_lines(self):
+        """Invalid guesses and lines should be reported, not raised."""
+        result = play_line('{"answer": "TEST", "guesses": ["T", "T", "1", 5]}')
+        self.assertEqual(result["guesses"], 1)
+        self.assertEqual(result["rejected"], 3)
+        self.assertEqual(result["state"], "playing")
+        self.assertIn("error", play_line("not json"))
+        self.assertIn("error", play_line('{"level": "expert"}'))
+    def test_picked_answers_do_not_repeat(self):
+        """Scripts without an answer should be dealt from a deck."""
+        # Creating the game deals one card, so the rest of the deck is
+        # one short of the phrase count
+        count = get_shared_dictionary().phrase_count() - 1
+        # Start from a fresh deck rather than whatever other tests dealt
+        with patch("batch._selector", None), patch.dict("batch._games", clear=True):
+            answers = [play_line('{"level": "intermediate"}')["answer"]
+                       for _ in range(count)]
+        self.assertEqual(len(set(answers)), count)
+    def test_stream_results(self):
+        """Every non-blank input line should give one result line."""
+        source = ['{"answer": "CODE", "guesses": "CODE"}\n', "\n",
+                  '{"level": "intermediate", "guesses": "ETAOINSHRDLCUMWFGYPB"}\n']
+        output = io.StringIO()
+        self.assertEqual(run_batch(source, output), 2)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result["line"] for result in results], [1, 3])
+        self.assertEqual(results[0]["state"], "won")
+        self.assertNotEqual(results[1]["state"], "playing")
+    def test_parallel_matches_serial(self):
+        """Worker processes should give the same results as one process."""
+        source = [json.dumps({"answer": word, "guesses": "ETAOINSHRDLCUMWFGYP"}) + "\n"
+                  for word in ("PYTHON", "JAVA", "ALGORITHM", "DATABASE") * 5]
+        serial = io.StringIO()
+        parallel = io.StringIO()
+        run_batch(source, serial)
+        self.assertEqual(run_batch(source, parallel, workers=2, chunk_size=3), 20)
+        self.assertEqual(sorted(serial.getvalue().splitlines()),
+                         sorted(parallel.getvalue().splitlines()))
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Tests for the benchmark suite plumbing."""
+    def test_quick_run_reports_each_benchmark(self):
+        """A tiny run should produce numbers for every requested benchmark."""
+        report = benchmark.run_benchmarks(["make_guess", "is_valid_word"],
+                                          scale=0.001, repeat=1)
+        self.assertEqual(sorted(report["results"]), ["is_valid_word", "make_guess"])
+        for result in report["results"].values():
+            self.assertGreater(result["ops_per_sec"], 0)
+            self.assertIn("net_blocks_per_op", result)
+    def test_compare_flags_slowdowns(self):
+        """Only drops beyond the tolerance count as regressions."""
+        baseline = {"results": {"a": {"ops_per_sec": 100.0},
+                                "b": {"ops_per_sec": 100.0}}}
+        current = {"results": {"a": {"ops_per_sec": 85.0},
+                               "b": {"ops_per_sec": 50.0},
+                               "c": {"ops_per_sec": 1.0}}}
+        regressions = benchmark.compare(current, baseline, tolerance=0.2)
+        self.assertEqual([r[0] for r in regressions], ["b"])
+
+
+class TestLoadTest(unittest.TestCase):
+    """Tests for the concurrent load-test harness."""
+    def test_every_engine_finishes_its_games(self):
+        """Each engine should play every game and see some timeouts."""
+        for engine in loadtest.ENGINES:
+            with self.subTest(engine=engine):
+                summary = loadtest.run_load_test(engine, players=20, games=2, think=0.001,
+                                                 timeout_rate=0.3, guess_seconds=0.01,
+                                                 threads=2, seed=1)
+                self.assertEqual(summary["games"], 40)
+                self.assertGreater(summary["guesses"], 0)
+                self.assertGreater(summary["timeouts"], 0)
+                self.assertEqual(summary["lost_timeouts"], 0)
+                self.assertGreater(summary["make_guess_p99"], 0)
+                self.assertGreaterEqual(summary["peak_threads"], 1)
+    def test_lost_timeout_does_not_hang(self):
+        """A timeout that never lands is counted and the player moves on."""
+        class NeverTimesOut:
+            """Player whose timer never fires; the game ends on move two."""
+            def __init__(self):
+                self.moves = 0
+            def new_game(self):
+                self.moves = 0
+            def playing(self):
+                return self.moves < 2
+            def start_timer(self):
+                self.moves += 1
+            def timer_pending(self):
+                return True
+            def close(self):
+                pass
+        driver = loadtest._Driver(  # pylint: disable=protected-access
+            [NeverTimesOut()], games=1, think=0, timeout_rate=1.0, seed=0,
+            wait_limit=0.02)
+        driver.thread.start()
+        driver.thread.join(5)
+        self.assertFalse(driver.thread.is_alive())
+        self.assertEqual(driver.finished, 1)
+        self.assertEqual(driver.lost_timeouts, 2)
+    def test_metrics_left_as_they_were(self):
+        """The harness turns metrics on only for the run."""
+        loadtest.run_load_test("sessions", players=2, games=1, think=0,
+                               timeout_rate=0, threads=1)
+        self.assertFalse(metrics.enabled)
+    def test_merge_histograms(self):
+        """Merged histograms should hold every observation."""
+        first, second = metrics.Histogram(), metrics.Histogram()
+        first.observe(0.001)
+        second.observe(0.002)
+        second.observe(0.5)
+        merged = loadtest.merge_histograms([first, second])
+        self.assertEqual(merged.count, 3)
+        self.assertEqual(sum(merged.counts), 3)
+        self.assertEqual(merged.quantile(1.0), second.quantile(1.0))
+
+
+class TestMemoryProfile(unittest.TestCase):
+    """Tests for the memory profiler and shared game state."""
+    def test_games_share_answer_layout(self):
+        """Games with the same answer share it until they diverge."""
+        first = HangmanGame(GameLevel.BASIC)
+        second = HangmanGame(GameLevel.BASIC)
+        first.answer = "PYTHON"
+        second.answer = "".join(["PY", "THON"])
+        self.assertIs(first.answer, second.answer)
+        self.assertIs(first.get_display_word(), second.get_display_word())
+        first.make_guess("P")
+        self.assertEqual(first.get_display_word(), "P_____")
+        self.assertEqual(second.get_display_word(), "______")
+        first.guessed_letters = set()
+        self.assertEqual(first.get_display_word(), "______")
+    def test_games_have_no_instance_dict(self):
+        """Games and timers use __slots__ to stay small."""
+        game = HangmanGame(GameLevel.BASIC)
+        self.assertFalse(hasattr(game, "__dict__"))
+        self.assertFalse(hasattr(game.timer, "__dict__"))
+    def test_profile_reports_components(self):
+        """A small profile should charge bytes to the game's parts."""
+        result = memprofile.profile_games(200, GameLevel.BASIC, timers=True)
+        self.assertEqual(result["count"], 200)
+        self.assertIn("game state", result["components"])
+        self.assertIn("timer", result["components"])
+        self.assertGreater(result["bytes_per_item"], result["game_object_bytes"])
+        self.assertFalse(memprofile.tracemalloc.is_tracing())
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the opt-in metrics layer."""
+    def setUp(self):
+        """Start each test with empty, enabled metrics."""
+        metrics.reset()
+        metrics.enable()
+    def tearDown(self):
+        """Switch metrics back off for other tests."""
+        metrics.disable()
+        metrics.reset()
+    def test_game_counters_and_latency(self):
+        """Guesses, wins and guess latency should be recorded."""
+        game = HangmanGame(GameLevel.BASIC)
+        game.new_game(answer="AB")
+        game.make_guess('A')
+        game.make_guess('B')
+        data = metrics.snapshot()
+        self.assertEqual(data["counters"]["guesses_total"], 2)
+        self.assertEqual(data["counters"]["wins_total"], 1)
+        self.assertEqual(data["histograms"]["make_guess_seconds"]["count"], 2)
+        self.assertIn("round_setup_seconds", data["histograms"])
+        game.quit_game()
+    def test_timeouts_and_timer_lag(self):
+        """Timer fires should count timeouts and their lag."""
+        clock = ManualClock()
+        game = HangmanGame(GameLevel.BASIC, clock=clock)
+        game.timer.start_timer(0.05)
+        clock.advance(0.2)
+        data = metrics.snapshot()
+        self.assertEqual(data["counters"]["timeouts_total"], 1)
+        self.assertEqual(data["histograms"]["timer_fire_lag_seconds"]["count"], 1)
+        game.quit_game()
+    def test_disabled_records_nothing(self):
+        """Nothing should be collected while metrics are off."""
+        metrics.disable()
+        game = HangmanGame(GameLevel.BASIC)
+        game.make_guess('A')
+        get_shared_dictionary().is_valid_word('python')
+        self.assertEqual(metrics.snapshot(), {"counters": {}, "histograms": {}})
+        game.quit_game()
+    def test_prometheus_dump(self):
+        """The text dump should be written in Prometheus format."""
+        get_shared_dictionary().is_valid_word('python')
+        metrics.observe("make_guess_seconds", 0.00001)
+        handle, path = tempfile.mkstemp(suffix=".prom")
+        os.close(handle)
+        try:
+            metrics.write_prometheus(path)
+            with open(path, encoding="utf-8") as source:
+                text = source.read()
+        finally:
+            os.remove(path)
+        self.assertIn("hangman_dictionary_lookups_total 1", text)
+        self.assertIn('hangman_make_guess_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("hangman_make_guess_seconds_count 1", text)
+
+
+class TestEventJournal(unittest.TestCase):
+    """Tests for the binary event journal and replay."""
+    def setUp(self):
+        """Journal into a temporary file."""
+        handle, self.path = tempfile.mkstemp(suffix=".journal")
+        os.close(handle)
+        os.remove(self.path)
+        self.journal = journal.EventJournal(self.path, fsync_interval=60)
+    def tearDown(self):
+        """Close and delete the journal."""
+        self.journal.close()
+        os.remove(self.path)
+    def test_game_events_are_recorded(self):
+        """Round start, guesses, timeouts and results all get logged."""
+        clock = ManualClock()
+        game = HangmanGame(GameLevel.BASIC, clock=clock, journal=self.journal)
+        game.new_game(answer="AB")
+        game.start_guess_timer()
+        clock.advance(15)
+        game.make_guess('A')
+        game.make_guess('B')
+        self.journal.flush()
+        events = [event for event in journal.read_events(self.path)
+                  if event.game_id == game.game_id]
+        types = [event.type for event in events]
+        self.assertEqual(types, [journal.ROUND_START, journal.ROUND_START,
+                                 journal.TIMEOUT, journal.GUESS, journal.GUESS,
+                                 journal.RESULT])
+        self.assertEqual(events[1].data, ("basic", -1, "AB"))
+        self.assertEqual(events[-1].data, ("won", 5, 2))
+    def test_replay_rebuilds_state_and_stats(self):
+        """Replaying should give back each game's outcome."""
+        won = HangmanGame(GameLevel.BASIC, journal=self.journal)
+        won.new_game(answer="HI")
+        won.make_guess('H')
+        won.make_guess('I')
+        quitter = HangmanGame(GameLevel.INTERMEDIATE, journal=self.journal)
+        quitter.make_guess('E')
+        quitter.quit_game()
+        self.journal.flush()
+        games = journal.rebuild_games(self.path)
+        self.assertEqual(games[won.game_id]["state"], "won")
+        self.assertEqual(games[won.game_id]["guessed"], "HI")
+        self.assertEqual(games[quitter.game_id]["state"], "quit")
+        self.assertEqual(games[quitter.game_id]["answer_index"],
+                         quitter.answer_index)
+        stats = journal.replay_stats(self.path)
+        self.assertEqual(stats["games"], 3)
+        self.assertEqual(stats["guesses"], 3)
+        self.assertEqual(stats["quits"], 1)
+        self.assertEqual(stats["results"], {"won": 1})
+    def test_torn_tail_is_ignored(self):
+        """A half-written record at the end shouldn't break replay."""
+        game = HangmanGame(GameLevel.BASIC, journal=self.journal)
+        game.make_guess('E')
+        self.journal.flush()
+        with open(self.path, "ab") as out:
+            out.write(b"\x02\x00\x03")
+        self.assertEqual(len(list(journal.read_events(self.path))), 3)
+        # Records split across read chunks should still decode
+        self.assertEqual(len(list(journal.read_events(self.path, chunk_size=7))), 3)
+
+
+class TestStatsStore(unittest.TestCase):
+    """Tests for the SQLite statistics store."""
+    def setUp(self):
+        """Each test gets its own database file."""
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.store = StatsStore(os.path.join(self.tempdir.name, "stats.db"),
+                                flush_interval=60)
+    def tearDown(self):
+        self.store.close()
+        self.tempdir.cleanup()
+    def test_record_is_batched(self):
+        """Recording should only queue the row until a flush."""
+        self.store.record("ann", "basic", "PYTHON", 8, 12.0, "won")
+        self.assertEqual(self.store.pending(), 1)
+        self.assertEqual(self.store.written, 0)
+        self.store.flush()
+        self.assertEqual(self.store.pending(), 0)
+        self.assertEqual(self.store.written, 1)
+    def test_failed_write_keeps_rows_and_writer(self):
+        """A locked database shouldn't lose rows or stop the writer."""
+        database = self.store._db  # pylint: disable=protected-access
+        failed = threading.Event()
+        def locked(*args):
+            failed.set()
+            raise sqlite3.OperationalError("database is locked")
+        broken = MagicMock()
+        broken.executemany.side_effect = locked
+        self.store.record("ann", "basic", "PYTHON", 8, 12.0, "won")
+        self.store._db = broken  # pylint: disable=protected-access
+        with self.assertLogs("stats_store", "WARNING"):
+            self.store._wake.set()  # pylint: disable=protected-access
+            self.assertTrue(failed.wait(5))
+            deadline = time.monotonic() + 5
+            while not self.store.write_errors and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.store.write_errors, 1)
+        self.assertEqual(self.store.pending(), 1)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.store.flush()
+        self.assertEqual(self.store.pending(), 1)
+        # Once the database is back the writer thread picks the rows up
+        self.store._db = database  # pylint: disable=protected-access
+        self.store.record("bob", "basic", "JAVA", 9, 20.0, "lost")
+        self.store._wake.set()  # pylint: disable=protected-access
+        deadline = time.monotonic() + 5
+        while self.store.written < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.store.written, 2)
+        self.assertEqual([row["player"] for row in self.store.top_players()],
+                         ["ann", "bob"])
+    def test_leaderboard_and_word_rates(self):
+        """Queries should rank players and words correctly."""
+        for result in ("won", "won", "lost"):
+            self.store.record("ann", "basic", "PYTHON", 7, 10.0, result)
+        self.store.record("bob", "basic", "JAVA", 9, 20.0, "won")
+        self.store.record("cat", "intermediate", "DATA STRUCTURES", 12, 30.0, "lost")
+        top = self.store.top_players(2)
+        self.assertEqual([row["player"] for row in top], ["ann", "bob"])
+        self.assertEqual(top[0]["wins"], 2)
+        self.assertEqual(self.store.top_players(level=GameLevel.INTERMEDIATE)[0]["wins"], 0)
+        rates = self.store.word_win_rates()
+        self.assertEqual([row["answer"] for row in rates],
+                         ["DATA STRUCTURES", "PYTHON", "JAVA"])
+        self.assertAlmostEqual(rates[1]["win_rate"], 2 / 3)
+        self.assertEqual(self.store.player_stats("bob")["games"], 1)
+    def test_many_rows_and_reopen(self):
+        """Big bursts should be written and survive reopening."""
+        for number in range(5000):
+            self.store.record(f"p{number % 50}", "basic", "CODE", 5, 1.0, "won")
+        self.store.close()
+        self.store = StatsStore(self.store.path)
+        self.assertEqual(self.store.player_stats("p7")["games"], 100)
+    def test_leaderboards_read_indexed_totals(self):
+        """Top-N queries should walk an index, not group and sort games."""
+        self.store.record("ann", "basic", "PYTHON", 7, 10.0, "won")
+        self.store.flush()
+        plan = " ".join(row[-1] for row in self.store._db.execute(  # pylint: disable=protected-access
+            "EXPLAIN QUERY PLAN SELECT player FROM player_totals WHERE level = ?"
+            " ORDER BY wins DESC, games, player LIMIT 10", ("basic",)))
+        self.assertIn("player_rank", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        self.assertEqual(self.store.top_players(level="basic")[0]["average_guesses"], 7)
+    def test_totals_rebuilt_for_old_database(self):
+        """A database with only game history gets its totals filled in."""
+        self.store.record("ann", "basic", "PYTHON", 7, 10.0, "won")
+        self.store.record("bob", "basic", "PYTHON", 9, 10.0, "lost")
+        self.store.flush()
+        with self.store._db:  # pylint: disable=protected-access
+            self.store._db.execute("DELETE FROM player_totals")  # pylint: disable=protected-access
+            self.store._db.execute("DELETE FROM answer_totals")  # pylint: disable=protected-access
+        self.store.close()
+        self.store = StatsStore(self.store.path)
+        self.assertEqual([row["player"] for row in self.store.top_players()], ["ann", "bob"])
+        self.assertAlmostEqual(self.store.word_win_rates()[0]["win_rate"], 0.5)
+    def test_ui_records_finished_game(self):
+        """The UI should record games when given a store."""
+        script = io.StringIO("1\nquit\nn\n")
+        ui = HangmanUI(fast=True, input_stream=script, output_stream=io.StringIO(),
+                       stats=self.store, player="dee")
+        ui.run_game()
+        stats = self.store.player_stats("dee")
+        self.assertEqual(stats["games"], 1)
+        self.assertEqual(stats["wins"], 0)
+
+
+class TestSnapshots(unittest.TestCase):
+    """Tests for packing games and sessions into fixed-size records."""
+    def setUp(self):
+        """Game with some guesses made and a timer running."""
+        self.clock = ManualClock()
+        self.game = HangmanGame(GameLevel.BASIC, clock=self.clock)
+        index = self.game.dictionary.basic_words.index("PYTHON")
+        self.game.new_game(answer="PYTHON")
+        self.game.answer_index = index
+        self.game.make_guess('P')
+        self.game.make_guess('Z')
+        self.game.start_guess_timer()
+        self.clock.advance(5)
+    def test_snapshot_is_fixed_size(self):
+        """Every snapshot has the same small size."""
+        self.assertEqual(len(self.game.snapshot()), SNAPSHOT.size)
+    def test_restore_round_trip(self):
+        """A restored game continues exactly where the old one was."""
+        copy = HangmanGame.restore(self.game.snapshot(), clock=self.clock)
+        self.assertEqual(copy.get_answer(), "PYTHON")
+        self.assertEqual(copy.get_display_word(), "P_____")
+        self.assertEqual(copy.get_wrong_guesses(), ['Z'])
+        self.assertEqual(copy.get_lives(), 5)
+        self.assertEqual(copy.get_timer_remaining(), 10)
+        self.clock.advance(10)
+        self.assertEqual(copy.get_lives(), 4)
+    def test_restore_skips_throwaway_round(self):
+        """Restoring shouldn't pick an answer first, and keeps journal/selector."""
+        selector = WordSelector(seed=1)
+        with tempfile.TemporaryDirectory() as folder:
+            events = journal.EventJournal(os.path.join(folder, "games.journal"))
+            with patch.object(WordSelector, "pick_word", side_effect=AssertionError), \
+                    patch.object(WordDictionary, "pick_word", side_effect=AssertionError):
+                copy = HangmanGame.restore(self.game.snapshot(), clock=self.clock,
+                                           journal=events, selector=selector)
+            self.assertIs(copy.selector, selector)
+            self.assertIs(copy.journal, events)
+            self.assertEqual(copy.get_display_word(), "P_____")
+            copy.make_guess('Y')
+            copy.quit_game()
+            events.close()
+            game = journal.rebuild_games(events.path)[copy.game_id]
+            self.assertEqual((game["answer_index"], game["guessed"], game["state"]),
+                             (copy.answer_index, "Y", "quit"))
+    def test_custom_answer_rejected(self):
+        """Custom answers have no index, so they can't be packed."""
+        self.game.new_game(answer="SECRET")
+        with self.assertRaises(ValueError):
+            self.game.snapshot()
+    def test_bulk_dump_and_load(self):
+        """Many games go into and out of one buffer."""
+        games = [self.game, HangmanGame(GameLevel.INTERMEDIATE, clock=self.clock)]
+        buffer = dump_games(games)
+        restored = load_games(buffer, clock=self.clock)
+        self.assertEqual([g.get_answer() for g in restored],
+                         [g.get_answer() for g in games])
+        self.assertEqual(restored[1].level, GameLevel.INTERMEDIATE)
+    def test_session_dump_and_load(self):
+        """Session managers can hand sessions to each other."""
+        source = SessionManager(clock=self.clock)
+        sid = source.create_session(GameLevel.BASIC)
+        source.make_guess(sid, 'E')
+        source.start_guess_timer(sid)
+        target = SessionManager(clock=self.clock)
+        self.assertEqual(target.load_sessions(source.dump_sessions()), 1)
+        self.assertEqual(target.get_state(sid), source.get_state(sid))
+        self.clock.advance(15)
+        self.assertEqual(target.get_state(sid)["lives"],
+                         source.get_state(sid)["lives"])
+        self.assertNotEqual(target.create_session(), sid)
+
+
 class TestHangmanUI(unittest.TestCase):
     """Tests for user interface components."""
     def setUp(self):
@@ -216,6 +1492,53 @@ class TestHangmanUI(unittest.TestCase):
         """Should display failed guess correctly."""
         self.ui.show_guess_result(False, "Wrong letter!")
         mock_print.assert_called()
+    @patch('ui.time.sleep')
+    def test_scripted_fast_game(self, mock_sleep):
+        """Fast mode should play a whole scripted game without pausing."""
+        script = io.StringIO("1\n" + "\n".join(ALPHABET) + "\nn\n")
+        output = io.StringIO()
+        ui = HangmanUI(fast=True, input_stream=script, output_stream=output)
+        ui.run_game()
+        mock_sleep.assert_not_called()
+        self.assertNotEqual(ui.game.get_game_state(), GameState.PLAYING)
+        self.assertIn("Goodbye!", output.getvalue())
+    @patch('ui.time.sleep')
+    def test_play_again_deals_without_repeats(self, mock_sleep):
+        """One player's rounds should come from one deck, so no repeats."""
+        count = get_shared_dictionary().word_count()
+        # Quit each round straight away and play again
+        script = io.StringIO("1\nquit\ny\n" * count + "1\nquit\nn\n")
+        ui = HangmanUI(fast=True, input_stream=script, output_stream=io.StringIO(),
+                       selector=WordSelector(seed=2))
+        answers = []
+        record = ui.show_game_end
+        def show_game_end(game):
+            answers.append(game.answer_index)
+            record(game)
+        ui.show_game_end = show_game_end
+        ui.run_game()
+        self.assertIs(ui.game.selector, ui.selector)
+        self.assertEqual(sorted(answers[:count]), list(range(count)))
+    def test_status_frame_single_write(self):
+        """Each status frame should go out in one write."""
+        output = MagicMock()
+        ui = HangmanUI(fast=True, output_stream=output)
+        game = HangmanGame(GameLevel.BASIC)
+        game.answer = "TEST"
+        game.make_guess("T")
+        game.make_guess("Z")
+        ui.show_game_status(game)
+        self.assertEqual(output.write.call_count, 1)
+        frame = output.write.call_args[0][0]
+        self.assertIn("T__T", frame)
+        self.assertIn("Wrong guesses: Z", frame)
+        game.quit_game()
+    def test_scripted_input_eof(self):
+        """Running out of script should behave like EOF at the prompt."""
+        ui = HangmanUI(fast=True, input_stream=io.StringIO(""),
+                       output_stream=io.StringIO())
+        self.assertEqual(ui.get_player_guess(), "quit")
+        self.assertFalse(ui.ask_play_again())
 
 
 class TestGameIntegration(unittest.TestCase):
@@ -275,6 +1598,36 @@ class TestEdgeCases(unittest.TestCase):
         # Both L's should be revealed
         self.assertEqual(game.get_display_word(), "__LL_")
         game.quit_game()
+    def test_phrase_ignores_spaces_for_win(self):
+        """Spaces in a phrase never need to be guessed."""
+        game = HangmanGame(GameLevel.INTERMEDIATE)
+        game.answer = "AB BA"
+        game.make_guess('A')
+        self.assertEqual(game.get_game_state(), GameState.PLAYING)
+        game.make_guess('B')
+        self.assertEqual(game.get_game_state(), GameState.WON)
+        game.quit_game()
+    def test_display_updates_only_on_reveal(self):
+        """Display should be cached between reveals."""
+        game = HangmanGame(GameLevel.INTERMEDIATE)
+        game.answer = "AB BA"
+        first = game.get_display_word()
+        self.assertEqual(first, "__ __")
+        self.assertIs(game.get_display_word(), first)
+        game.make_guess('Z')
+        self.assertIs(game.get_display_word(), first)
+        game.make_guess('A')
+        self.assertEqual(game.get_display_word(), "A_ _A")
+        game.quit_game()
+    def test_wrong_guesses_tracked_separately(self):
+        """Wrong guesses should only list letters missing from the answer."""
+        game = HangmanGame(GameLevel.BASIC)
+        game.answer = "TEST"
+        game.make_guess('T')
+        game.make_guess('Q')
+        self.assertEqual(game.get_guessed_letters(), ['Q', 'T'])
+        self.assertEqual(game.get_wrong_guesses(), ['Q'])
+        game.quit_game()
     def test_case_insensitive_guessing(self):
         """Test that uppercase and lowercase work the same."""
         game = HangmanGame(GameLevel.BASIC)
@@ -290,8 +1643,31 @@ if __name__ == '__main__':
     # Set up test suite
     test_classes = [
         TestWordDictionary,
+        TestCompiledCorpus,
+        TestSharedDictionary,
+        TestLetterMask,
         TestGameTimer,
-        TestHangmanGame,        TestHangmanUI,
+        TestTimerTicks,
+        TestTimerScheduler,
+        TestCallbackDispatcher,
+        TestManualClock,
+        TestHangmanGame,
+        TestAsyncGame,
+        TestWordDeck,
+        TestDifficultyIndex,
+        TestSessionManager,
+        TestNetworkServer,
+        TestCandidateSolver,
+        TestSimulation,
+        TestBatchMode,
+        TestBenchmarks,
+        TestLoadTest,
+        TestMemoryProfile,
+        TestMetrics,
+        TestEventJournal,
+        TestSnapshots,
+        TestStatsStore,
+        TestHangmanUI,
         TestGameIntegration,
         TestEdgeCases
     ]
@@ -3,27 +3,54 @@ Timer Module for Hangman Game
 Author: CDU Software Engineering Student
 
 Handles the 15-second countdown timer for each guess.
-Had to figure out threading to make this work properly.
+Time comes from a clock (see clock.py). The default real clock puts
+every deadline on the shared TimerScheduler thread and runs timeout
+callbacks on the shared CallbackDispatcher pool; a ManualClock makes
+deadlines fire as soon as virtual time is advanced.
+
+Instead of polling get_time_left(), displays can subscribe() to a tick
+stream: a Tick is pushed when the timer starts, stops or runs out, and
+once a second while it runs (the per-second ticks are only scheduled
+while someone is subscribed). latest_tick always holds the newest one
+and can be read without taking the lock.
 """
 
-import time
+import asyncio
 import threading
+from collections import namedtuple
+from functools import partial
+import metrics
+from clock import get_default_clock
+
+Tick = namedtuple("Tick", "seconds_left progress running")
+IDLE_TICK = Tick(0, 100.0, False)
 
 
 class GameTimer:
     """Timer for the hangman guessing rounds."""
-    def __init__(self, timeout_function=None):
+    # One of these per live game, so no per-instance __dict__
+    __slots__ = ("timeout_callback", "clock", "_handle", "_generation", "start_time",
+                 "duration", "active", "lock", "latest_tick", "_subscribers",
+                 "_tick_handle")
+    def __init__(self, timeout_function=None, clock=None):
         """
         Set up the timer.
         timeout_function gets called when time runs out.
+        clock defaults to the shared real-time clock.
         """
         self.timeout_callback = timeout_function
-        self.timer_thread = None
+        self.clock = clock or get_default_clock()
+        self._handle = None
+        self._generation = 0
         self.start_time = 0.0
         self.duration = 0
         self.active = False
         # Need this lock to prevent threading issues
         self.lock = threading.Lock()
+        # Replaced, never mutated, so readers don't need the lock
+        self.latest_tick = IDLE_TICK
+        self._subscribers = ()
+        self._tick_handle = None
     def start_timer(self, seconds=15):
         """Start countdown for given number of seconds."""
         if seconds <= 0:
@@ -31,40 +58,146 @@ class GameTimer:
         with self.lock:
             self._stop_current_timer()
             self.duration = seconds
-            self.start_time = time.time()
+            self.start_time = self.clock.now()
             self.active = True
-            # Start the actual timer thread
-            self.timer_thread = threading.Timer(seconds, self._time_up)
-            self.timer_thread.start()
+            self._handle = self.clock.call_at(
+                self.start_time + seconds,
+                partial(self._time_up, self._generation))
+            if self._subscribers:
+                self._schedule_tick(1)
+            tick = self.latest_tick = Tick(int(seconds), 0.0, True)
+        self._publish(tick)
     def stop_timer(self):
         """Stop the current timer."""
         with self.lock:
+            was_active = self.active
             self._stop_current_timer()
+            if was_active:
+                self.latest_tick = IDLE_TICK
+        if was_active:
+            self._publish(IDLE_TICK)
     def _stop_current_timer(self):
         """Internal method to clean up timer."""
         self.active = False
-        if self.timer_thread and self.timer_thread.is_alive():
-            self.timer_thread.cancel()
-        self.timer_thread = None
+        if self._handle is not None:
+            self.clock.cancel(self._handle)
+            self._handle = None
+        if self._tick_handle is not None:
+            self.clock.cancel(self._tick_handle)
+            self._tick_handle = None
+        # Callbacks already on their way for the old timer will see a
+        # different generation and do nothing
+        self._generation += 1
         self.start_time = 0.0
         self.duration = 0
-    def _time_up(self):
-        """Called when timer expires."""
+    def _time_up(self, generation):
+        """Called by the clock when a deadline expires."""
         with self.lock:
+            # Ignore deadlines that were replaced or stopped meanwhile
+            if generation != self._generation or self._handle is None:
+                return
+            deadline = self.start_time + self.duration
+            self._handle = None
             self.active = False
-            if self.timeout_callback:
-                # Run callback in separate thread to avoid blocking
-                callback_thread = threading.Thread(target=self.timeout_callback)
-                callback_thread.daemon = True
-                callback_thread.start()
+            if self._tick_handle is not None:
+                self.clock.cancel(self._tick_handle)
+                self._tick_handle = None
+            self.latest_tick = IDLE_TICK
+        self._publish(IDLE_TICK)
+        if self.timeout_callback:
+            self.clock.dispatch(partial(self._run_callback, generation, deadline))
+    def _schedule_tick(self, elapsed):
+        """Queue the tick for elapsed whole seconds in (caller holds the lock)."""
+        if elapsed < self.duration:
+            self._tick_handle = self.clock.call_at(
+                self.start_time + elapsed,
+                partial(self._tick, self._generation, elapsed))
+        else:
+            self._tick_handle = None
+    def _tick(self, generation, elapsed):
+        """Clock callback: publish the once-a-second tick."""
+        with self.lock:
+            if generation != self._generation or not self.active:
+                return
+            self._tick_handle = None
+            if self._subscribers:
+                self._schedule_tick(elapsed + 1)
+            tick = self.latest_tick = Tick(
+                int(max(0.0, self.duration - elapsed)),
+                min(100.0, elapsed / self.duration * 100.0), True)
+        self._publish(tick)
+    def _publish(self, tick):
+        """Hand a tick to every subscriber (called outside the lock)."""
+        for callback in self._subscribers:
+            try:
+                callback(tick)
+            except Exception:  # pylint: disable=broad-exception-caught
+                # A broken display shouldn't stop the countdown
+                pass
+    def subscribe(self, callback):
+        """
+        Call callback(tick) on every tick. Returns a function that
+        unsubscribes. Callbacks run on the clock's thread, so they
+        should be quick (e.g. hand the tick to a queue or event loop).
+        """
+        with self.lock:
+            self._subscribers += (callback,)
+            if self.active and self._tick_handle is None:
+                elapsed = int(self.clock.now() - self.start_time) + 1
+                self._schedule_tick(elapsed)
+        def unsubscribe():
+            with self.lock:
+                self._subscribers = tuple(
+                    other for other in self._subscribers if other is not callback)
+                if not self._subscribers and self._tick_handle is not None:
+                    self.clock.cancel(self._tick_handle)
+                    self._tick_handle = None
+        return unsubscribe
+    async def ticks(self):
+        """
+        Async generator of ticks for the running event loop, starting
+        with latest_tick. A slow consumer skips straight to the newest
+        tick instead of queueing old ones.
+        """
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        def wake(tick):  # pylint: disable=unused-argument
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                pass  # loop already closed
+        unsubscribe = self.subscribe(wake)
+        try:
+            yield self.latest_tick
+            while True:
+                await changed.wait()
+                changed.clear()
+                yield self.latest_tick
+        finally:
+            unsubscribe()
+    def _run_callback(self, generation, deadline):
+        """Runs the timeout callback (on a dispatcher worker in real time)."""
+        with self.lock:
+            # A restart, stop or guess since the deadline was queued
+            # means this timeout no longer counts
+            if generation != self._generation:
+                return
+        if metrics.enabled:
+            # How late the callback runs compared to the deadline
+            metrics.observe("timer_fire_lag_seconds",
+                            max(0.0, self.clock.now() - deadline))
+            metrics.inc("timer_fires_total")
+        self.timeout_callback()
     def get_time_left(self):
         """Get seconds remaining (updates in real time)."""
+        return int(self.get_seconds_left())
+    def get_seconds_left(self):
+        """Exact seconds remaining as a float (0 when not running)."""
         with self.lock:
-            if not self.active or self.start_time == 0:
-                return 0
-            elapsed = time.time() - self.start_time
-            remaining = max(0, self.duration - elapsed)
-            return int(remaining)
+            if not self.active:
+                return 0.0
+            elapsed = self.clock.now() - self.start_time
+            return max(0.0, self.duration - elapsed)
     def is_running(self):
         """Check if timer is currently active."""
         with self.lock:
@@ -74,6 +207,6 @@ class GameTimer:
         with self.lock:
             if not self.active or self.duration == 0:
                 return 100.0
-            elapsed = time.time() - self.start_time if self.start_time > 0 else 0
+            elapsed = self.clock.now() - self.start_time
             progress = (elapsed / self.duration) * 100.0
             return min(100.0, max(0.0, progress))
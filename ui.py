@@ -4,104 +4,161 @@ Author: CDU Software Engineering Student
 
 Console-based UI for the hangman game.
 Handles all the display and user input.
+Each screen is built as one string and written in a single call.
+Fast mode drops the pauses and can read guesses from a file or pipe.
 """
 
 import time
 import sys
+from deck import WordSelector
 from game import GameLevel, GameState, HangmanGame
 
+# Menu choice -> level
+LEVEL_CHOICES = {
+    "1": GameLevel.BASIC,
+    "2": GameLevel.INTERMEDIATE,
+    "3": GameLevel.EASY,
+    "4": GameLevel.MEDIUM,
+    "5": GameLevel.HARD,
+}
+
 
 class HangmanUI:
     """Handles display and user interaction."""
-    def __init__(self):
+    def __init__(self, fast=False, input_stream=None, output_stream=None,
+                 stats=None, player="player", selector=None):
+        """
+        Set up the UI.
+        fast skips the pauses between screens. input_stream and
+        output_stream replace input()/print() (e.g. a script file and
+        sys.stdout) so sessions can be driven through pipes.
+        stats, if given, is a StatsStore that every finished game is
+        recorded to under the player's name.
+        selector deals the player's answers (see deck.py), so nothing
+        repeats across play-again rounds; one is made if not given.
+        """
         self.game = None
+        self.selector = selector or WordSelector()
+        self.stats = stats
+        self.player = player
+        self.fast = fast
+        self.input_stream = input_stream
+        self.output_stream = output_stream
+    def _write(self, text):
+        """Output one whole frame at once."""
+        if self.output_stream is None:
+            print(text)
+        else:
+            self.output_stream.write(text + "\n")
+    def _read(self, prompt):
+        """Read one line of player input."""
+        if self.input_stream is None:
+            return input(prompt)
+        if self.output_stream is not None:
+            self.output_stream.write(prompt)
+        line = self.input_stream.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+    def _pause(self):
+        """Give the player a moment to read (skipped in fast mode)."""
+        if not self.fast:
+            time.sleep(1)
     def show_welcome(self):
         """Display welcome screen and rules."""
-        print("\n" + "=" * 60)
-        print("🎯 HANGMAN GAME 🎯")
-        print("=" * 60)
-        print("\n📋 RULES:")
-        print("• Guess letters to find the hidden word or phrase")
-        print("• You have 15 seconds for each guess")
-        print("• Wrong guesses cost you a life (you start with 6)")
-        print("• Find the word before lives run out!")
-        print("\n🎮 LEVELS:")
-        print("1. Basic - Programming terms")
-        print("2. Intermediate - Technical phrases")
-        print("\n" + "=" * 60)
+        self._write("\n".join([
+            "\n" + "=" * 60,
+            "🎯 HANGMAN GAME 🎯",
+            "=" * 60,
+            "\n📋 RULES:",
+            "• Guess letters to find the hidden word or phrase",
+            "• You have 15 seconds for each guess",
+            "• Wrong guesses cost you a life (you start with 6)",
+            "• Find the word before lives run out!",
+            "\n🎮 LEVELS:",
+            "1. Basic - Programming terms",
+            "2. Intermediate - Technical phrases",
+            "3-5. Easy / Medium / Hard - Words ranked by difficulty",
+            "\n" + "=" * 60,
+        ]))
     def get_difficulty(self):
         """Get player's choice of difficulty level."""
         while True:
             try:
-                choice = input("\nSelect difficulty (1=Basic, 2=Intermediate): ").strip()
-                if choice == "1":
-                    print("✅ Basic level selected!")
-                    return GameLevel.BASIC
-                elif choice == "2":
-                    print("✅ Intermediate level selected!")
-                    return GameLevel.INTERMEDIATE
-                else:
-                    print("❌ Please enter 1 or 2")
+                choice = self._read("\nSelect difficulty (1=Basic, 2=Intermediate, "
+                                    "3=Easy, 4=Medium, 5=Hard): ").strip()
+                level = LEVEL_CHOICES.get(choice)
+                if level is not None:
+                    self._write(f"✅ {level.value.capitalize()} level selected!")
+                    return level
+                self._write("❌ Please enter a number from 1 to 5")
             except (EOFError, KeyboardInterrupt):
-                print("\n👋 Goodbye!")
+                self._write("\n👋 Goodbye!")
                 sys.exit(0)
-    def show_game_status(self, game):
-        """Display current game state."""
-        print("\n" + "-" * 50)
-        print(f"💖 Lives: {game.get_lives()}")
-        print(f"🎯 Word: {game.get_display_word()}")
+    def render_game_status(self, game):
+        """Build the status frame shown before each guess."""
+        lines = [
+            "\n" + "-" * 50,
+            f"💖 Lives: {game.get_lives()}",
+            f"🎯 Word: {game.get_display_word()}",
+        ]
         guessed = game.get_guessed_letters()
         wrong = game.get_wrong_guesses()
         if guessed:
             correct = [letter for letter in guessed if letter not in wrong]
             if correct:
-                print(f"✅ Correct guesses: {', '.join(correct)}")
+                lines.append(f"✅ Correct guesses: {', '.join(correct)}")
             if wrong:
-                print(f"❌ Wrong guesses: {', '.join(wrong)}")
+                lines.append(f"❌ Wrong guesses: {', '.join(wrong)}")
         else:
-            print("📝 No guesses yet")
+            lines.append("📝 No guesses yet")
         # Show timer if active
         time_left = game.get_timer_remaining()
         if time_left > 0:
-            print(f"⏰ Time left: {time_left} seconds")
-        print("-" * 50)
+            lines.append(f"⏰ Time left: {time_left} seconds")
+        lines.append("-" * 50)
+        return "\n".join(lines)
+    def show_game_status(self, game):
+        """Display current game state."""
+        self._write(self.render_game_status(game))
     def get_player_guess(self):
         """Get letter guess from player."""
         try:
-            return input("\n🎯 Enter your guess (or 'quit' to exit): ").strip()
+            return self._read("\n🎯 Enter your guess (or 'quit' to exit): ").strip()
         except (EOFError, KeyboardInterrupt):
             return "quit"
     def show_guess_result(self, success, message):
         """Display the result of a guess."""
         if success:
-            print(f"✅ {message}")
+            self._write(f"✅ {message}")
         else:
-            print(f"❌ {message}")
+            self._write(f"❌ {message}")
     def show_game_end(self, game):
         """Display end game screen."""
-        print("\n" + "=" * 60)
+        lines = ["\n" + "=" * 60]
         state = game.get_game_state()
         if state == GameState.WON:
-            print("🎉 CONGRATULATIONS! YOU WON! 🎉")
-            print(f"✅ The word was: {game.get_answer()}")
+            lines.append("🎉 CONGRATULATIONS! YOU WON! 🎉")
+            lines.append(f"✅ The word was: {game.get_answer()}")
         elif state == GameState.LOST:
-            print("💀 GAME OVER 💀")
-            print(f"💡 The answer was: {game.get_answer()}")
+            lines.append("💀 GAME OVER 💀")
+            lines.append(f"💡 The answer was: {game.get_answer()}")
         elif state == GameState.QUIT:
-            print("👋 Thanks for playing!")
-            print(f"💡 The answer was: {game.get_answer()}")
-        print("=" * 60)
+            lines.append("👋 Thanks for playing!")
+            lines.append(f"💡 The answer was: {game.get_answer()}")
+        lines.append("=" * 60)
+        self._write("\n".join(lines))
     def ask_play_again(self):
         """Ask if player wants another game."""
         while True:
             try:
-                choice = input("\n🔄 Play again? (y/n): ").strip().lower()
+                choice = self._read("\n🔄 Play again? (y/n): ").strip().lower()
                 if choice in ['y', 'yes']:
                     return True
                 elif choice in ['n', 'no']:
                     return False
                 else:
-                    print("❌ Please enter 'y' or 'n'")
+                    self._write("❌ Please enter 'y' or 'n'")
             except (EOFError, KeyboardInterrupt):
                 return False
     def run_game(self):
@@ -110,9 +167,10 @@ class HangmanUI:
         while True:
             # Get difficulty and start new game
             level = self.get_difficulty()
-            self.game = HangmanGame(level)
-            print(f"\n🚀 Starting {level.value} level game...")
-            time.sleep(1)
+            self.game = HangmanGame(level, selector=self.selector)
+            started = time.monotonic()
+            self._write(f"\n🚀 Starting {level.value} level game...")
+            self._pause()
             # Main game loop
             while self.game.get_game_state() == GameState.PLAYING:
                 self.show_game_status(self.game)
@@ -124,14 +182,18 @@ class HangmanUI:
                 success, message = self.game.make_guess(guess)
                 self.show_guess_result(success, message)
                 # Brief pause for user to read result
-                time.sleep(1)
+                self._pause()
             # Show end game
             self.show_game_end(self.game)
+            if self.stats is not None:
+                self.stats.record_game(self.game, self.player,
+                                       time.monotonic() - started)
             # Ask to play again
             if not self.ask_play_again():
                 break
-        print("\n🎮 Thanks for playing Hangman!")
-        print("👋 Goodbye!")
+        self._write("\n🎮 Thanks for playing Hangman!\n👋 Goodbye!")
+        if self.output_stream is not None:
+            self.output_stream.flush()
 
 
 def main():
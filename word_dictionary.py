@@ -8,50 +8,161 @@ Handles word storage, validation and random selection.
 """
 
 import random
+import sys
+import threading
+import metrics
+from corpus import CompiledCorpus
+from difficulty import (BANDS, PHRASES, WORDS, DifficultyIndex, build_for_dictionary,
+                        fingerprint, get_difficulty)
 
 
 class WordDictionary:
     """
     Manages words and phrases for different game difficulties.
     Keeps basic words separate from intermediate phrases.
+    Entries are stored uppercase in tuples and never change after
+    loading, so one instance can be shared by every game.
     """
-    def __init__(self):
-        """Set up word lists for both game modes."""
+    def __init__(self, corpus_path=None, difficulty_path=None, corpus=None,
+                 difficulty=None):
+        """
+        Set up word lists for both game modes.
+        With corpus_path the lists come from a compiled corpus file
+        (see corpus.py) that is memory-mapped instead of loaded.
+        difficulty_path is a precomputed difficulty index for these
+        lists (see difficulty.py) used by the easy/medium/hard levels;
+        without one those levels pick from every word. The small
+        built-in lists get theirs scored here at load time.
+        corpus and difficulty take already-open objects instead, e.g.
+        over shared memory (see shared_dictionary.py).
+        """
+        self.corpus = corpus
+        self._index = None
+        self.difficulty = difficulty
+        if difficulty_path is not None:
+            self.difficulty = DifficultyIndex.open(difficulty_path)
+        if corpus_path is not None:
+            self.corpus = CompiledCorpus.open(corpus_path)
+        if self.corpus is not None:
+            self.basic_words = self.corpus.words
+            self.phrases = self.corpus.phrases
+            self._check_difficulty()
+            return
         # Basic level words - mostly programming related
-        self.basic_words = [
+        self.basic_words = _uppercase([
             "python", "java", "coding", "debug", "loops", "array",
             "string", "method", "class", "object", "variable", "function",
             "compiler", "syntax", "boolean", "integer", "database", "server",
             "client", "network", "protocol", "framework", "library", "module"
-        ]
+        ])
         # Intermediate phrases - technical concepts
-        self.phrases = [
+        self.phrases = _uppercase([
             "object oriented programming", "test driven development",
             "software engineering", "agile methodology", "version control",
             "continuous integration", "design patterns", "data structures",
             "machine learning", "artificial intelligence", "web development",
             "mobile applications", "cloud computing", "cyber security"
-        ]
+        ])
+        # Hashed index for O(1) is_valid_word checks
+        self._index = frozenset(self.basic_words + self.phrases)
+        if self.difficulty is None:
+            self.difficulty = DifficultyIndex(build_for_dictionary(self))
+        self._check_difficulty()
+    def _check_difficulty(self):
+        """Make sure a loaded difficulty index was built for these lists."""
+        index = self.difficulty
+        if index is None:
+            return
+        if index.bands != BANDS:
+            # Levels map to fixed bands (see game.DIFFICULTY_BANDS)
+            raise ValueError(f"Difficulty index has {index.bands} bands, "
+                             f"games need {BANDS}")
+        counts = [len(self.basic_words), len(self.phrases)]
+        for section in (WORDS, PHRASES):
+            if section < len(index.sections) and index.count(section) != counts[section]:
+                raise ValueError(
+                    f"Difficulty index has {index.count(section)} entries in "
+                    f"section {section}, dictionary has {counts[section]}")
+        if index.fingerprint != fingerprint(
+                [self.basic_words, self.phrases][:len(index.sections)]):
+            raise ValueError("Difficulty index was built for a different word list")
+    def pick_word(self):
+        """Random basic word and its index as (index, word)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        if not self.basic_words:
+            return -1, "PYTHON"  # fallback
+        index = random.randrange(len(self.basic_words))
+        return index, self.basic_words[index]
+    def pick_phrase(self):
+        """Random phrase and its index as (index, phrase)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        if not self.phrases:
+            return -1, "UNIT TESTING"  # fallback
+        index = random.randrange(len(self.phrases))
+        return index, self.phrases[index]
+    def pick_in_band(self, band):
+        """Random basic word from a difficulty band as (index, word)."""
+        if metrics.enabled:
+            metrics.inc("dictionary_picks_total")
+        difficulty = get_difficulty(self)
+        # No index loaded: banded levels pick from every word
+        index = difficulty.pick(band) if difficulty is not None else -1
+        if index < 0:
+            return self.pick_word()
+        return index, self.basic_words[index]
     def get_random_word(self):
         """Pick a random word for basic level."""
-        if not self.basic_words:
-            return "PYTHON"  # fallback
-        return random.choice(self.basic_words).upper()
+        return self.pick_word()[1]
     def get_random_phrase(self):
         """Pick a random phrase for intermediate level."""
-        if not self.phrases:
-            return "UNIT TESTING"  # fallback
-        return random.choice(self.phrases).upper()
-
+        return self.pick_phrase()[1]
+    def get_word(self, index):
+        """Basic word at a given index (uppercase)."""
+        return self.basic_words[index]
+    def get_phrase(self, index):
+        """Phrase at a given index (uppercase)."""
+        return self.phrases[index]
     def is_valid_word(self, word):
         """Check if word/phrase exists in our dictionary."""
+        if metrics.enabled:
+            metrics.inc("dictionary_lookups_total")
         if not word:
             return False
-        word_clean = word.lower().strip()
-        return (word_clean in self.basic_words or word_clean in self.phrases)
+        word_clean = " ".join(word.split()).upper()
+        if self._index is not None:
+            return word_clean in self._index
+        # Compiled corpora are binary searched instead of hashed
+        return word_clean in self.basic_words or word_clean in self.phrases
     def word_count(self):
         """How many basic words we have."""
         return len(self.basic_words)
     def phrase_count(self):
         """How many phrases we have."""
         return len(self.phrases)
+
+
+def _uppercase(entries):
+    """Precompute the uppercase form of every entry once."""
+    return tuple(sys.intern(entry.upper()) for entry in entries)
+
+
+_shared_dictionary = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_dictionary():
+    """The process-wide dictionary, loaded on first use."""
+    global _shared_dictionary  # pylint: disable=global-statement
+    with _shared_lock:
+        if _shared_dictionary is None:
+            _shared_dictionary = WordDictionary()
+        return _shared_dictionary
+
+
+def use_shared_dictionary(dictionary):
+    """Make dictionary the process-wide one for games created from now on."""
+    global _shared_dictionary  # pylint: disable=global-statement
+    with _shared_lock:
+        _shared_dictionary = dictionary